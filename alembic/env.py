@@ -13,6 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 # Import database configuration and models
 from app.db.database import Base, SQLALCHEMY_DATABASE_URL
 from app.db.models import User, XAccount
+from app.trend_detector import models as trend_models  # noqa: F401 — registers td_* tables
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,47 @@
+"""td_signals / td_candidates created_at indexes (keyset listing pages)
+
+Revision ID: 1c6d8e2b4a90
+Revises: f3a8c1d59e72
+Create Date: 2026-10-18 03:40:12.518306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1c6d8e2b4a90'
+down_revision: Union[str, Sequence[str], None] = 'f3a8c1d59e72'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = (
+    ('ix_td_signals_created_at', 'td_signals', ['created_at']),
+    ('ix_td_signals_platform_created_at', 'td_signals', ['platform', 'created_at']),
+    ('ix_td_candidates_created_at', 'td_candidates', ['created_at']),
+)
+
+
+def _has_index(bind, table: str, name: str) -> bool:
+    return any(i['name'] == name for i in sa.inspect(bind).get_indexes(table))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    # td_* tables are created by Base.metadata.create_all on app startup (with these indexes);
+    # this only adds them to tables created before
+    for name, table, columns in INDEXES:
+        if sa.inspect(bind).has_table(table) and not _has_index(bind, table, name):
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    for name, table, _ in reversed(INDEXES):
+        if sa.inspect(bind).has_table(table) and _has_index(bind, table, name):
+            op.drop_index(name, table_name=table)
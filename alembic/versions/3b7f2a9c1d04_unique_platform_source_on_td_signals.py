@@ -0,0 +1,39 @@
+"""Unique (platform, source_id) index on td_signals
+
+Revision ID: 3b7f2a9c1d04
+Revises: e153d985cf12
+Create Date: 2026-10-17 09:12:41.530112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7f2a9c1d04'
+down_revision: Union[str, Sequence[str], None] = 'e153d985cf12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # td_* tables are created by Base.metadata.create_all on app startup
+    if not sa.inspect(op.get_bind()).has_table('td_signals'):
+        return
+
+    # Older ingestion could store the same post twice within one batch — keep the first copy
+    op.execute(
+        "DELETE FROM td_signals WHERE id NOT IN ("
+        "SELECT MIN(id) FROM td_signals GROUP BY platform, source_id)"
+    )
+    op.create_index('ux_td_signals_platform_source', 'td_signals', ['platform', 'source_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not sa.inspect(op.get_bind()).has_table('td_signals'):
+        return
+    op.drop_index('ux_td_signals_platform_source', table_name='td_signals')
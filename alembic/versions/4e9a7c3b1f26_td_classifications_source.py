@@ -0,0 +1,45 @@
+"""td_classifications source column (llm / cache / fallback)
+
+Revision ID: 4e9a7c3b1f26
+Revises: 1c6d8e2b4a90
+Create Date: 2026-10-18 05:02:31.804417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e9a7c3b1f26'
+down_revision: Union[str, Sequence[str], None] = '1c6d8e2b4a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_column(bind, table: str, column: str) -> bool:
+    return any(c['name'] == column for c in sa.inspect(bind).get_columns(table))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    # td_* tables are created by Base.metadata.create_all on app startup; rows classified
+    # before this column existed stay NULL and are not used to warm the classification cache
+    if not sa.inspect(bind).has_table('td_classifications'):
+        return
+
+    if not _has_column(bind, 'td_classifications', 'source'):
+        op.add_column('td_classifications', sa.Column('source', sa.String(length=20), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table('td_classifications'):
+        return
+
+    if _has_column(bind, 'td_classifications', 'source'):
+        with op.batch_alter_table('td_classifications') as batch_op:
+            batch_op.drop_column('source')
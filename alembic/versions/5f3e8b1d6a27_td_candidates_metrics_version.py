@@ -0,0 +1,58 @@
+"""td_candidates metrics_version / scored_version / validated_version dirty tracking
+
+Revision ID: 5f3e8b1d6a27
+Revises: d2a9f4c7e813
+Create Date: 2026-10-17 18:12:44.301758
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f3e8b1d6a27'
+down_revision: Union[str, Sequence[str], None] = 'd2a9f4c7e813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+COLUMNS = (
+    ('metrics_version', '0'),
+    ('scored_version', '-1'),      # -1 → every existing candidate is scored once more
+    ('validated_version', '-1'),
+)
+
+
+def _columns(bind, table: str) -> set:
+    return {c['name'] for c in sa.inspect(bind).get_columns(table)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    # td_* tables are created by Base.metadata.create_all on app startup
+    if not sa.inspect(bind).has_table('td_candidates'):
+        return
+
+    existing = _columns(bind, 'td_candidates')
+    for name, default in COLUMNS:
+        if name not in existing:
+            op.add_column(
+                'td_candidates',
+                sa.Column(name, sa.Integer(), nullable=name != 'metrics_version', server_default=default),
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table('td_candidates'):
+        return
+
+    existing = _columns(bind, 'td_candidates')
+    with op.batch_alter_table('td_candidates') as batch_op:
+        for name, _ in reversed(COLUMNS):
+            if name in existing:
+                batch_op.drop_column(name)
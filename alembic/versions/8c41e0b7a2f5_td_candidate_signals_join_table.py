@@ -0,0 +1,90 @@
+"""td_candidate_signals join table, backfilled from td_candidates.source_signal_ids
+
+Revision ID: 8c41e0b7a2f5
+Revises: 3b7f2a9c1d04
+Create Date: 2026-10-17 14:03:27.918406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41e0b7a2f5'
+down_revision: Union[str, Sequence[str], None] = '3b7f2a9c1d04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_column(bind, table: str, column: str) -> bool:
+    return any(c['name'] == column for c in sa.inspect(bind).get_columns(table))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    # td_* tables are created by Base.metadata.create_all on app startup
+    if not inspector.has_table('td_candidates'):
+        return
+
+    if not inspector.has_table('td_candidate_signals'):
+        op.create_table(
+            'td_candidate_signals',
+            sa.Column('candidate_id', sa.Integer(), nullable=False),
+            sa.Column('signal_id', sa.Integer(), nullable=False),
+            sa.Column('platform', sa.String(length=50), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('candidate_id', 'signal_id'),
+        )
+        op.create_index('ix_td_candidate_signals_signal_id', 'td_candidate_signals', ['signal_id'], unique=True)
+
+    if not _has_column(bind, 'td_candidates', 'source_signal_ids'):
+        return
+
+    # Backfill: split the comma-separated ids of every candidate into membership rows.
+    # A signal listed under several candidates (possible with the old string merge) keeps its first.
+    rows = bind.execute(sa.text(
+        "SELECT id, source_signal_ids FROM td_candidates "
+        "WHERE source_signal_ids IS NOT NULL AND source_signal_ids != '' ORDER BY id"
+    )).fetchall()
+    seen = set()
+    memberships = []
+    for cand_id, ids_str in rows:
+        for sid in ids_str.split(','):
+            sid = sid.strip()
+            if sid.isdigit() and int(sid) not in seen:
+                seen.add(int(sid))
+                memberships.append({'candidate_id': cand_id, 'signal_id': int(sid)})
+
+    if memberships:
+        bind.execute(sa.text(
+            "INSERT OR IGNORE INTO td_candidate_signals (candidate_id, signal_id, platform, created_at) "
+            "SELECT :candidate_id, :signal_id, "
+            "(SELECT platform FROM td_signals WHERE id = :signal_id), CURRENT_TIMESTAMP"
+        ), memberships)
+
+    with op.batch_alter_table('td_candidates') as batch_op:
+        batch_op.drop_column('source_signal_ids')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table('td_candidate_signals'):
+        return
+
+    if inspector.has_table('td_candidates') and not _has_column(bind, 'td_candidates', 'source_signal_ids'):
+        with op.batch_alter_table('td_candidates') as batch_op:
+            batch_op.add_column(sa.Column('source_signal_ids', sa.String(length=500), nullable=True))
+        op.execute(
+            "UPDATE td_candidates SET source_signal_ids = ("
+            "SELECT group_concat(signal_id, ',') FROM td_candidate_signals "
+            "WHERE td_candidate_signals.candidate_id = td_candidates.id)"
+        )
+
+    op.drop_index('ix_td_candidate_signals_signal_id', table_name='td_candidate_signals')
+    op.drop_table('td_candidate_signals')
@@ -0,0 +1,53 @@
+"""td_pipeline_runs per-run pipeline metrics
+
+Revision ID: a7c3e9d24b18
+Revises: 5f3e8b1d6a27
+Create Date: 2026-10-17 21:07:52.614390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9d24b18'
+down_revision: Union[str, Sequence[str], None] = '5f3e8b1d6a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if sa.inspect(op.get_bind()).has_table('td_pipeline_runs'):
+        return
+    op.create_table(
+        'td_pipeline_runs',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('platform', sa.String(length=50), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('duration_s', sa.Float(), nullable=True),
+        sa.Column('raw_signals', sa.Integer(), nullable=True),
+        sa.Column('new_signals', sa.Integer(), nullable=True),
+        sa.Column('candidates', sa.Integer(), nullable=True),
+        sa.Column('hot', sa.Integer(), nullable=True),
+        sa.Column('classified', sa.Integer(), nullable=True),
+        sa.Column('first_hot_after_s', sa.Float(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('stages', sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_td_pipeline_runs_id', 'td_pipeline_runs', ['id'], unique=False)
+    op.create_index('ix_td_pipeline_runs_platform', 'td_pipeline_runs', ['platform'], unique=False)
+    op.create_index('ix_td_pipeline_runs_started_at', 'td_pipeline_runs', ['started_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not sa.inspect(op.get_bind()).has_table('td_pipeline_runs'):
+        return
+    op.drop_index('ix_td_pipeline_runs_started_at', table_name='td_pipeline_runs')
+    op.drop_index('ix_td_pipeline_runs_platform', table_name='td_pipeline_runs')
+    op.drop_index('ix_td_pipeline_runs_id', table_name='td_pipeline_runs')
+    op.drop_table('td_pipeline_runs')
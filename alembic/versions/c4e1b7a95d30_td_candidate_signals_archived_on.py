@@ -0,0 +1,42 @@
+"""td_candidate_signals archived_on partition of archived signals
+
+Revision ID: c4e1b7a95d30
+Revises: a7c3e9d24b18
+Create Date: 2026-10-17 22:31:09.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e1b7a95d30'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e9d24b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_column(bind, table: str, column: str) -> bool:
+    return any(c['name'] == column for c in sa.inspect(bind).get_columns(table))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    # td_* tables are created by Base.metadata.create_all on app startup
+    if not sa.inspect(bind).has_table('td_candidate_signals'):
+        return
+    if not _has_column(bind, 'td_candidate_signals', 'archived_on'):
+        op.add_column('td_candidate_signals', sa.Column('archived_on', sa.String(length=10), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table('td_candidate_signals'):
+        return
+    if _has_column(bind, 'td_candidate_signals', 'archived_on'):
+        with op.batch_alter_table('td_candidate_signals') as batch_op:
+            batch_op.drop_column('archived_on')
@@ -0,0 +1,41 @@
+"""td_media_analysis Vision result cache
+
+Revision ID: d2a9f4c7e813
+Revises: 8c41e0b7a2f5
+Create Date: 2026-10-17 16:41:05.227931
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a9f4c7e813'
+down_revision: Union[str, Sequence[str], None] = '8c41e0b7a2f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if sa.inspect(op.get_bind()).has_table('td_media_analysis'):
+        return
+    op.create_table(
+        'td_media_analysis',
+        sa.Column('url_hash', sa.String(length=64), nullable=False),
+        sa.Column('media_url', sa.String(length=2000), nullable=False),
+        sa.Column('media_text', sa.Text(), nullable=False),
+        sa.Column('analyzed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('url_hash'),
+    )
+    op.create_index('ix_td_media_analysis_analyzed_at', 'td_media_analysis', ['analyzed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not sa.inspect(op.get_bind()).has_table('td_media_analysis'):
+        return
+    op.drop_index('ix_td_media_analysis_analyzed_at', table_name='td_media_analysis')
+    op.drop_table('td_media_analysis')
@@ -0,0 +1,60 @@
+"""td_stats maintained counters + td_candidates (status, updated_at) index
+
+Revision ID: e9b2d6f41c87
+Revises: c4e1b7a95d30
+Create Date: 2026-10-17 23:48:15.204417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9b2d6f41c87'
+down_revision: Union[str, Sequence[str], None] = 'c4e1b7a95d30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_index(bind, table: str, name: str) -> bool:
+    return any(i['name'] == name for i in sa.inspect(bind).get_indexes(table))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    # td_* tables are created by Base.metadata.create_all on app startup; the counter
+    # triggers are installed (and td_stats seeded from the data tables) by its
+    # after_create hook in app/trend_detector/models.py
+    if not sa.inspect(bind).has_table('td_candidates'):
+        return
+
+    if not sa.inspect(bind).has_table('td_stats'):
+        op.create_table(
+            'td_stats',
+            sa.Column('metric', sa.String(length=50), nullable=False),
+            sa.Column('key', sa.String(length=200), nullable=False),
+            sa.Column('value', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('metric', 'key'),
+        )
+    if not _has_index(bind, 'td_candidates', 'ix_td_candidates_status_updated_at'):
+        op.create_index('ix_td_candidates_status_updated_at', 'td_candidates', ['status', 'updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table('td_candidates'):
+        return
+
+    triggers = bind.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'td_stats_%'"
+    ).scalars().all()
+    for name in triggers:
+        op.execute(f'DROP TRIGGER IF EXISTS {name}')
+    if sa.inspect(bind).has_table('td_stats'):
+        op.drop_table('td_stats')
+    if _has_index(bind, 'td_candidates', 'ix_td_candidates_status_updated_at'):
+        op.drop_index('ix_td_candidates_status_updated_at', table_name='td_candidates')
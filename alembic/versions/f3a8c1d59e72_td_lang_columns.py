@@ -0,0 +1,58 @@
+"""td_signals / td_candidates lang column (ingest-time language tag)
+
+Revision ID: f3a8c1d59e72
+Revises: e9b2d6f41c87
+Create Date: 2026-10-18 01:12:40.385127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8c1d59e72'
+down_revision: Union[str, Sequence[str], None] = 'e9b2d6f41c87'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _has_column(bind, table: str, column: str) -> bool:
+    return any(c['name'] == column for c in sa.inspect(bind).get_columns(table))
+
+
+def _has_index(bind, table: str, name: str) -> bool:
+    return any(i['name'] == name for i in sa.inspect(bind).get_indexes(table))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    # td_* tables are created by Base.metadata.create_all on app startup; existing rows are
+    # tagged by the scheduler's one-shot language backfill (app/trend_detector/pipeline/language.py)
+    if not sa.inspect(bind).has_table('td_candidates'):
+        return
+
+    if not _has_column(bind, 'td_signals', 'lang'):
+        op.add_column('td_signals', sa.Column('lang', sa.String(length=8), nullable=True))
+    if not _has_column(bind, 'td_candidates', 'lang'):
+        op.add_column('td_candidates', sa.Column('lang', sa.String(length=8), nullable=True))
+    if not _has_index(bind, 'td_candidates', 'ix_td_candidates_lang'):
+        op.create_index('ix_td_candidates_lang', 'td_candidates', ['lang'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table('td_candidates'):
+        return
+
+    if _has_index(bind, 'td_candidates', 'ix_td_candidates_lang'):
+        op.drop_index('ix_td_candidates_lang', table_name='td_candidates')
+    if _has_column(bind, 'td_candidates', 'lang'):
+        with op.batch_alter_table('td_candidates') as batch_op:
+            batch_op.drop_column('lang')
+    if _has_column(bind, 'td_signals', 'lang'):
+        with op.batch_alter_table('td_signals') as batch_op:
+            batch_op.drop_column('lang')
@@ -11,19 +11,27 @@ import json
 import requests as http_requests
 from typing import Dict, Any, Optional, List
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, timezone
 
-from app.trend_detector.models import Signal, Candidate, Classification, Watchlist, XValidation
+from app.trend_detector.models import Signal, Candidate, CandidateSignal, Classification, XValidation
+from app.trend_detector.retention.archive import SignalArchive
+from app.trend_detector.stats import TrendStats
+from app.trend_detector.listing import with_related
+from app.trend_detector.search import TrendSearch, match_expression
 from app.core.config import settings
+from app.utils.text import LANG_FARSI, collapse_whitespace, fold_arabic
 
-# Farsi-specific characters not used in Arabic
-_FARSI_CHARS = re.compile(r'[\u06AF\u0686\u067E\u0698\u06A9]')  # گ چ پ ژ ک
+# Title cleaners — compiled once
+_TCO_URL = re.compile(r'https?://t\.co/\S+')
+_URL = re.compile(r'https?://\S+')
+_NUMBERING = re.compile(r'^\d+\.\s*')
+_LEADING_EMOJI = re.compile(r'^[\U0001F300-\U0001FAD6\U0001F600-\U0001F64F\U0001F680-\U0001F6FF\u2600-\u27BF\U0001F900-\U0001F9FF\U0001FA00-\U0001FA6F\U0001FA70-\U0001FAFF\u200d\ufe0f]+\s*')
+_ENGAGEMENT_SUFFIX = re.compile(r'\s*—\s*.*$')
 
-
-def _is_farsi(text: str) -> bool:
-    """Detect Farsi text by checking for Farsi-specific characters"""
-    return bool(text and _FARSI_CHARS.search(text))
+# Compared after fold_arabic, so "الآن" / "الان" are the same word
+_SEARCH_STOP_WORDS = frozenset(fold_arabic(w) for w in (
+    "وش", "ايش", "شو", "عن", "في", "هل", "ترند", "ترندات", "الترند", "الترندات", "ابحث", "بحث", "الان", "الحين", "اليوم",
+))
 
 
 class TrendAgent:
@@ -103,75 +111,65 @@ class TrendAgent:
 
     # ── Data gathering helpers ─────────────────────────────────
 
-    def _filter_arabic(self, candidates: List[Candidate]) -> List[Candidate]:
-        """Filter out Farsi content, keep Arabic/English only"""
-        return [c for c in candidates if not _is_farsi(c.title) and not _is_farsi(c.content)]
+    def _arabic(self, db: Session):
+        """Candidates query without Farsi content (lang is tagged at ingest; untagged rows stay in)"""
+        return db.query(Candidate).filter(Candidate.lang.is_distinct_from(LANG_FARSI))
 
     def _get_stats(self, db: Session) -> Dict[str, Any]:
-        cutoff_24h = datetime.now(timezone.utc) - timedelta(hours=24)
+        stats = TrendStats.snapshot(db)
         return {
-            "total_signals": db.query(Signal).count(),
-            "total_candidates": db.query(Candidate).count(),
-            "hot": db.query(Candidate).filter(Candidate.status == "hot").count(),
-            "early": db.query(Candidate).filter(Candidate.status == "early").count(),
-            "not_yet": db.query(Candidate).filter(Candidate.status == "not_yet").count(),
-            "watchlist": db.query(Watchlist).filter(Watchlist.is_active == True).count(),
-            "signals_24h": db.query(Signal).filter(Signal.created_at >= cutoff_24h).count(),
-            "validations": db.query(XValidation).count(),
-            "platforms": {
-                row[0]: row[1]
-                for row in db.query(Signal.platform, func.count(Signal.id)).group_by(Signal.platform).all()
-            },
+            "total_signals": stats["total_signals"],
+            "total_candidates": stats["total_candidates"],
+            "hot": stats["by_status"].get("hot", 0),
+            "early": stats["by_status"].get("early", 0),
+            "not_yet": stats["by_status"].get("not_yet", 0),
+            "watchlist": stats["watchlist_active"],
+            "signals_24h": stats["signals_24h"],
+            "validations": stats["total_validations"],
+            "platforms": stats["by_platform"],
         }
 
     def _get_hot_list(self, db: Session) -> List[Dict]:
-        raw = db.query(Candidate).filter(Candidate.status == "hot").order_by(Candidate.score.desc()).limit(40).all()
-        arabic = self._filter_arabic(raw)
-        return [self._candidate_to_dict(c, db) for c in arabic[:20]]
+        arabic = self._arabic(db).filter(Candidate.status == "hot").order_by(Candidate.score.desc()).limit(20).all()
+        return self._candidates_to_dicts(arabic, db)
 
     def _get_early_list(self, db: Session, limit: int = 5) -> List[Dict]:
-        raw = db.query(Candidate).filter(Candidate.status == "early").order_by(Candidate.score.desc()).limit(limit * 3).all()
-        arabic = self._filter_arabic(raw)
-        return [self._candidate_to_dict(c, db) for c in arabic[:limit]]
+        arabic = self._arabic(db).filter(Candidate.status == "early").order_by(Candidate.score.desc()).limit(limit).all()
+        return self._candidates_to_dicts(arabic, db)
 
     def _get_top_arabic(self, db: Session, limit: int = 10) -> List[Dict]:
         """Get top candidates, filtering out Farsi content"""
-        raw = db.query(Candidate).order_by(Candidate.score.desc()).limit(limit * 3).all()
-        arabic = self._filter_arabic(raw)
-        return [self._candidate_to_dict(c, db) for c in arabic[:limit]]
+        arabic = self._arabic(db).order_by(Candidate.score.desc()).limit(limit).all()
+        return self._candidates_to_dicts(arabic, db)
 
     def _search_db(self, db: Session, query: str) -> List[Dict]:
-        if not query:
+        expression = match_expression(query) if query else None
+        if not expression:
             return []
-        term = f"%{query}%"
-        raw = (
-            db.query(Candidate)
-            .filter(
-                (Candidate.title.ilike(term))
-                | (Candidate.content.ilike(term))
-                | (Candidate.keywords.ilike(term))
-            )
+        arabic = (
+            self._arabic(db)
+            .filter(Candidate.id.in_(TrendSearch.matching_ids(expression)))
             .order_by(Candidate.score.desc())
-            .limit(30)
+            .limit(10)
             .all()
         )
-        arabic = self._filter_arabic(raw)
-        return [self._candidate_to_dict(c, db) for c in arabic[:10]]
+        return self._candidates_to_dicts(arabic, db)
 
     def _get_run_info(self, db: Session) -> Dict[str, Any]:
-        latest = db.query(Signal).order_by(Signal.created_at.desc()).first()
+        # Ids are assigned in insert order — the newest signal is a PK lookup, not a sort on created_at
+        latest = db.query(Signal).order_by(Signal.id.desc()).first()
         return {
             "last_signal_time": latest.created_at.isoformat() if latest and latest.created_at else None,
-            "total_validations": db.query(XValidation).count(),
+            "total_validations": TrendStats.snapshot(db)["total_validations"],
         }
 
-    def _candidate_to_dict(self, c: Candidate, db: Session) -> Dict:
-        clf = db.query(Classification).filter(Classification.candidate_id == c.id).first()
-        val = db.query(XValidation).filter(XValidation.candidate_id == c.id).order_by(XValidation.id.desc()).first()
+    def _candidates_to_dicts(self, candidates: List[Candidate], db: Session) -> List[Dict]:
+        """Latest classification + validation for the whole list in one batch each"""
+        return [self._candidate_to_dict(*row) for row in with_related(candidates, db)]
+
+    def _candidate_to_dict(self, c: Candidate, clf: Optional[Classification], val: Optional[XValidation]) -> Dict:
         # Clean title — remove t.co URLs and excess whitespace
-        title = (c.title or "").strip()
-        title = re.sub(r'https?://t\.co/\S+', '', title).strip()
-        title = re.sub(r'\s+', ' ', title)
+        title = collapse_whitespace(_TCO_URL.sub('', c.title or ""))
         return {
             "title": title,
             "score": c.score,
@@ -206,8 +204,7 @@ class TrendAgent:
         for p in prefixes:
             if lower.startswith(p):
                 return lower[len(p):].strip()
-        stop_words = {"وش", "ايش", "شو", "عن", "في", "هل", "ترند", "ترندات", "الترند", "الترندات", "ابحث", "بحث", "الان", "الحين", "اليوم"}
-        words = [w for w in raw.split() if w not in stop_words]
+        words = [w for w in raw.split() if fold_arabic(w) not in _SEARCH_STOP_WORDS]
         return " ".join(words).strip()
 
     # ── Trend detail ─────────────────────────────────────────────
@@ -216,11 +213,11 @@ class TrendAgent:
         """Extract the trend title fragment from user's message for detail lookup"""
         text = message.strip()
         # Remove numbering prefix like "9. 🔥" or "2. 🔄" (handle all emoji)
-        text = re.sub(r'^\d+\.\s*', '', text)
+        text = _NUMBERING.sub('', text)
         # Remove leading emoji (any Unicode emoji character)
-        text = re.sub(r'^[\U0001F300-\U0001FAD6\U0001F600-\U0001F64F\U0001F680-\U0001F6FF\u2600-\u27BF\U0001F900-\U0001F9FF\U0001FA00-\U0001FA6F\U0001FA70-\U0001FAFF\u200d\ufe0f]+\s*', '', text)
+        text = _LEADING_EMOJI.sub('', text)
         # Remove engagement suffix like "— ❤️ 54,470 🔁 20,947" or "— 📊 28,471 تفاعل على X"
-        text = re.sub(r'\s*—\s*.*$', '', text)
+        text = _ENGAGEMENT_SUFFIX.sub('', text)
         # Remove hashtag prefix #
         text = re.sub(r'^#', '', text)
         # Remove common question prefixes/suffixes
@@ -230,9 +227,19 @@ class TrendAgent:
                         "عطني تفاصيل عن", "وش قصة", "ابي تفاصيل", "؟", "?"]:
             text = text.replace(phrase, "")
         # Remove t.co URLs
-        text = re.sub(r'https?://\S+', '', text)
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
+        return collapse_whitespace(_URL.sub('', text))
+
+    def _find_by_text(self, db: Session, phrase: str) -> Optional[Candidate]:
+        """Highest-scoring candidate whose title or content contains the phrase (FTS index)"""
+        expression = match_expression(phrase, phrase=True, columns=["title", "content"])
+        if not expression:
+            return None
+        return (
+            db.query(Candidate)
+            .filter(Candidate.id.in_(TrendSearch.matching_ids(expression)))
+            .order_by(Candidate.score.desc())
+            .first()
+        )
 
     def _get_trend_detail(self, message: str, db: Session) -> Optional[Dict]:
         """Find a specific trend by fuzzy title match and return full details"""
@@ -243,30 +250,14 @@ class TrendAgent:
         candidate = None
 
         # Strategy 1: search full fragment in title or content
-        term = f"%{fragment[:80]}%"
-        candidate = (
-            db.query(Candidate)
-            .filter(
-                (Candidate.title.ilike(term)) | (Candidate.content.ilike(term))
-            )
-            .order_by(Candidate.score.desc())
-            .first()
-        )
+        candidate = self._find_by_text(db, fragment[:80])
 
         # Strategy 2: try progressively shorter word windows
         if not candidate:
             words = fragment.split()
             for length in [5, 4, 3, 2]:
                 if len(words) >= length:
-                    short_term = f"%{' '.join(words[:length])}%"
-                    candidate = (
-                        db.query(Candidate)
-                        .filter(
-                            (Candidate.title.ilike(short_term)) | (Candidate.content.ilike(short_term))
-                        )
-                        .order_by(Candidate.score.desc())
-                        .first()
-                    )
+                    candidate = self._find_by_text(db, ' '.join(words[:length]))
                     if candidate:
                         break
 
@@ -277,14 +268,7 @@ class TrendAgent:
             if sig_words:
                 # Use the longest significant word
                 longest = max(sig_words, key=len)
-                candidate = (
-                    db.query(Candidate)
-                    .filter(
-                        (Candidate.title.ilike(f"%{longest}%")) | (Candidate.content.ilike(f"%{longest}%"))
-                    )
-                    .order_by(Candidate.score.desc())
-                    .first()
-                )
+                candidate = self._find_by_text(db, longest)
 
         if not candidate:
             return None
@@ -295,27 +279,31 @@ class TrendAgent:
 
         # Get source signals for this candidate
         source_signals = []
-        if candidate.source_signal_ids:
-            sig_ids = [int(x.strip()) for x in candidate.source_signal_ids.split(",") if x.strip().isdigit()]
-            if sig_ids:
-                signals = db.query(Signal).filter(Signal.id.in_(sig_ids)).all()
-                for s in signals:
-                    source_signals.append({
-                        "platform": s.platform,
-                        "author": s.author,
-                        "title": (s.title or ""),
-                        "content": (s.content or ""),
-                        "url": s.url,
-                        "published_at": s.published_at.isoformat() if s.published_at else None,
-                        "likes": s.likes,
-                        "reshares": s.reshares,
-                        "comments": s.comments,
-                        "views": s.views,
-                    })
+        signals = (
+            db.query(Signal)
+            .join(CandidateSignal, CandidateSignal.signal_id == Signal.id)
+            .filter(CandidateSignal.candidate_id == candidate.id)
+            .all()
+        )
+        # Older sources may have been moved to the signal archive by the retention job
+        signals += SignalArchive().candidate_signals(candidate.id, db)
+        for s in signals:
+            source_signals.append({
+                "platform": s.platform,
+                "author": s.author,
+                "title": (s.title or ""),
+                "content": (s.content or ""),
+                "url": s.url,
+                "published_at": s.published_at.isoformat() if s.published_at else None,
+                "likes": s.likes,
+                "reshares": s.reshares,
+                "comments": s.comments,
+                "views": s.views,
+            })
 
         # Full title and content (not truncated)
-        full_title = re.sub(r'\s+', ' ', (candidate.title or "")).strip()
-        full_content = re.sub(r'\s+', ' ', (candidate.content or "")).strip()
+        full_title = collapse_whitespace(candidate.title or "")
+        full_content = collapse_whitespace(candidate.content or "")
 
         return {
             "id": candidate.id,
@@ -1,9 +1,11 @@
 """
 Trend Detector REST API
 Pure API endpoints for collecting, searching, filtering, and managing trend signals.
+Listings (search, candidates, signals) page by offset or by the opaque `next_cursor`
+each page returns (keyset — constant cost at any depth); `total` is exact, cached or none.
 
 Endpoints:
-  GET  /api/trends/search         — Full-text search across candidates
+  GET  /api/trends/search         — Full-text search across candidates (FTS5, bm25)
   GET  /api/trends/candidates     — List/filter candidates
   GET  /api/trends/candidates/:id — Get candidate full detail
   GET  /api/trends/hot            — Quick list of HOT trends only
@@ -11,30 +13,76 @@ Endpoints:
   GET  /api/trends/stats          — Aggregated statistics
   GET  /api/trends/categories     — List all classification categories
   GET  /api/trends/watchlist      — Active watchlist entries
+  GET  /api/trends/pipeline/metrics — Per-stage pipeline metrics + recent runs
+  GET  /api/trends/scoring-config — Scoring overrides + effective weights/thresholds (admin)
+  PUT  /api/trends/scoring-config — Upsert a scoring override and re-score history (admin)
+  POST /api/trends/rescore        — Re-score every candidate with current settings (admin)
+  POST /api/trends/retention/run  — Archive aged signals and vacuum now (admin)
+  POST /api/trends/lang/backfill  — Tag signals/candidates stored before language tagging (admin)
   POST /api/trends/run            — Manually trigger collection pipeline
   POST /api/trends/run/all        — Trigger all configured collectors
 """
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
 from typing import Optional
 from datetime import datetime, timedelta, timezone
 
 from app.db.database import get_db
-from app.auth.dependencies import require_current_user
+from app.auth.dependencies import require_current_user, require_admin
 from app.db.models import User
 from app.trend_detector.models import (
-    Signal, Candidate, XValidation, Classification, Watchlist
+    Signal, Candidate, CandidateSignal, XValidation, Classification, Watchlist, ScoringConfig, PipelineRun
 )
 from app.trend_detector.scheduler.scheduler import trend_scheduler
+from app.trend_detector.pipeline.validator import XValidator
+from app.trend_detector.pipeline.scoring import ScoringEngine, METRICS
+from app.trend_detector.config import SCORING_WEIGHTS
+from app.trend_detector.classifier.classifier import Classifier
+from app.trend_detector.http_client import http_client
+from app.trend_detector.db_executor import db_executor
+from app.trend_detector.metrics import pipeline_metrics
+from app.trend_detector.retention.archive import SignalArchive
+from app.trend_detector.stats import TrendStats
+from app.trend_detector.listing import with_related
+from app.trend_detector.search import TrendSearch, match_expression
+from app.trend_detector.pagination import Keyset, listing_totals, total_mode
 
 router = APIRouter(prefix="/api/trends", tags=["Trend Detector"])
 
+signal_archive = SignalArchive()
+
 
 # ─── Helpers ───────────────────────────────────────────────────────────────────
 
-def _serialize_candidate(c: Candidate, classification: Classification = None) -> dict:
-    """Serialize a Candidate to a dict"""
+def _paginate(
+    db: Session, query, keyset: Keyset, limit: int, offset: int, cursor: Optional[str], total: Optional[str],
+    endpoint: str, filters: dict, counter=None,
+) -> tuple:
+    """(Page, total) of a listing query — 400 on a bad cursor / total mode or cursor + offset"""
+    if cursor and offset:
+        raise HTTPException(status_code=400, detail="Use either offset or cursor, not both")
+    try:
+        page = keyset.page(query, limit, cursor=cursor, offset=offset)
+        count = listing_totals.total(db, total_mode(total, cursor), query, endpoint, filters, counter)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return page, count
+
+
+def _stats_counter(metric: str, filters: dict, key_filter: str):
+    """(metric, key) of the td_stats counter equal to the filtered total — unfiltered or only `key_filter` set"""
+    active = {name: value for name, value in filters.items() if value is not None}
+    if not active:
+        return metric, None
+    if list(active) == [key_filter]:
+        return metric, active[key_filter]
+    return None
+
+
+def _serialize_candidate(c: Candidate, classification: Classification = None, validation: XValidation = None) -> dict:
+    """Serialize a Candidate to a dict (no DB access — related rows are passed in)"""
     result = {
         "id": c.id,
         "title": c.title,
@@ -46,6 +94,7 @@ def _serialize_candidate(c: Candidate, classification: Classification = None) ->
         "platform_count": c.platform_count,
         "score": c.score,
         "status": c.status,
+        "lang": c.lang,
         "views_total": c.views_total,
         "likes_total": c.likes_total,
         "reshares_total": c.reshares_total,
@@ -67,6 +116,14 @@ def _serialize_candidate(c: Candidate, classification: Classification = None) ->
         }
     else:
         result["classification"] = None
+    result["latest_validation"] = {
+        "verdict": validation.verdict,
+        "post_count": validation.post_count,
+        "unique_authors": validation.unique_authors,
+        "total_engagement": validation.total_engagement,
+        "post_density_per_hour": validation.post_density_per_hour,
+        "checked_at": validation.checked_at.isoformat() if validation.checked_at else None,
+    } if validation else None
     return result
 
 
@@ -98,30 +155,32 @@ def _serialize_signal(s: Signal) -> dict:
 
 @router.get("/search")
 async def search_trends(
-    q: str = Query(..., min_length=1, description="Search query — matches title, content, keywords"),
+    q: str = Query(..., min_length=1, description="Search query — every word prefix-matches title, content or keywords"),
     status: Optional[str] = Query(None, description="Filter: hot, early, not_yet, pending, expired"),
     category: Optional[str] = Query(None, description="Filter by classification category"),
     platform: Optional[str] = Query(None, description="Filter by source platform"),
     sensitivity: Optional[str] = Query(None, description="Filter: low, medium, high, critical"),
     min_score: Optional[float] = Query(None, description="Minimum score threshold"),
-    sort_by: str = Query("score", description="Sort by: score, date, likes, views, reshares"),
+    lang: Optional[str] = Query(None, description="Filter by language tagged at ingest: ar, fa, other"),
+    sort_by: str = Query("score", description="Sort by: score, relevance, date, likes, views, reshares"),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (keyset paging, instead of offset)"),
+    total: Optional[str] = Query(None, description="Total: exact, cached or none — default exact for offset pages, none with a cursor"),
     current_user: User = Depends(require_current_user),
     db: Session = Depends(get_db),
 ):
     """
     Full-text search across trend candidates.
-    Searches title, content, and keywords. Supports filtering and sorting.
+    Searches title, content, and keywords through the Arabic-normalized FTS5 index
+    (hamza / taa-marbuta / tashkeel variants and the definite article don't matter).
+    Supports filtering and sorting; sort_by=relevance ranks by bm25.
     """
-    search_term = f"%{q}%"
-    query = db.query(Candidate).filter(
-        or_(
-            Candidate.title.ilike(search_term),
-            Candidate.content.ilike(search_term),
-            Candidate.keywords.ilike(search_term),
-        )
-    )
+    expression = match_expression(q)
+    if expression is None:
+        return {"query": q, "total": 0, "offset": offset, "limit": limit, "next_cursor": None, "results": []}
+    matches = TrendSearch.ranked(expression).subquery()
+    query = db.query(Candidate).join(matches, matches.c.candidate_id == Candidate.id)
 
     if status:
         query = query.filter(Candidate.status == status)
@@ -129,6 +188,8 @@ async def search_trends(
         query = query.filter(Candidate.platforms.ilike(f"%{platform}%"))
     if min_score is not None:
         query = query.filter(Candidate.score >= min_score)
+    if lang:
+        query = query.filter(Candidate.lang == lang)
 
     # Category/sensitivity filtering requires join with Classification
     if category or sensitivity:
@@ -139,25 +200,26 @@ async def search_trends(
             classified_ids = classified_ids.filter(Classification.sensitivity == sensitivity)
         query = query.filter(Candidate.id.in_(classified_ids.subquery()))
 
-    # Sorting
+    # Sorting — each sort is keyed on (value, id) so cursors can seek past the last row
     sort_map = {
-        "score": Candidate.score.desc(),
-        "date": Candidate.created_at.desc(),
-        "likes": Candidate.likes_total.desc(),
-        "views": Candidate.views_total.desc(),
-        "reshares": Candidate.reshares_total.desc(),
+        "score": Keyset("score", Candidate.score, Candidate.id),
+        "relevance": Keyset("relevance", matches.c.rank, Candidate.id, descending=False, nullable=False),
+        "date": Keyset("date", Candidate.created_at, Candidate.id),
+        "likes": Keyset("likes", Candidate.likes_total, Candidate.id),
+        "views": Keyset("views", Candidate.views_total, Candidate.id),
+        "reshares": Keyset("reshares", Candidate.reshares_total, Candidate.id),
     }
-    query = query.order_by(sort_map.get(sort_by, Candidate.score.desc()))
-
-    total = query.count()
-    candidates = query.offset(offset).limit(limit).all()
+    filters = {
+        "q": q, "status": status or None, "category": category or None, "platform": platform or None,
+        "sensitivity": sensitivity or None, "min_score": min_score, "lang": lang or None,
+    }
+    page, count = _paginate(
+        db, query, sort_map.get(sort_by, sort_map["score"]), limit, offset, cursor, total, "search", filters,
+    )
 
-    results = []
-    for c in candidates:
-        clf = db.query(Classification).filter(Classification.candidate_id == c.id).first()
-        results.append(_serialize_candidate(c, clf))
+    results = [_serialize_candidate(*row) for row in with_related(page.items, db)]
 
-    return {"query": q, "total": total, "offset": offset, "limit": limit, "results": results}
+    return {"query": q, "total": count, "offset": offset, "limit": limit, "next_cursor": page.next_cursor, "results": results}
 
 
 # ─── List Candidates ───────────────────────────────────────────────────────────
@@ -169,9 +231,12 @@ async def list_candidates(
     platform: Optional[str] = Query(None, description="Filter by source platform"),
     min_score: Optional[float] = Query(None, description="Minimum score"),
     hours: Optional[int] = Query(None, description="Only trends from last N hours"),
+    lang: Optional[str] = Query(None, description="Filter by language tagged at ingest: ar, fa, other"),
     sort_by: str = Query("score", description="Sort: score, date, likes, views"),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (keyset paging, instead of offset)"),
+    total: Optional[str] = Query(None, description="Total: exact, cached or none — default exact for offset pages, none with a cursor"),
     current_user: User = Depends(require_current_user),
     db: Session = Depends(get_db),
 ):
@@ -184,6 +249,8 @@ async def list_candidates(
         query = query.filter(Candidate.platforms.ilike(f"%{platform}%"))
     if min_score is not None:
         query = query.filter(Candidate.score >= min_score)
+    if lang:
+        query = query.filter(Candidate.lang == lang)
     if hours:
         cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
         query = query.filter(Candidate.created_at >= cutoff)
@@ -196,22 +263,23 @@ async def list_candidates(
         query = query.filter(Candidate.id.in_(classified_ids.subquery()))
 
     sort_map = {
-        "score": Candidate.score.desc(),
-        "date": Candidate.created_at.desc(),
-        "likes": Candidate.likes_total.desc(),
-        "views": Candidate.views_total.desc(),
+        "score": Keyset("score", Candidate.score, Candidate.id),
+        "date": Keyset("date", Candidate.created_at, Candidate.id),
+        "likes": Keyset("likes", Candidate.likes_total, Candidate.id),
+        "views": Keyset("views", Candidate.views_total, Candidate.id),
     }
-    query = query.order_by(sort_map.get(sort_by, Candidate.score.desc()))
-
-    total = query.count()
-    candidates = query.offset(offset).limit(limit).all()
+    filters = {
+        "status": status or None, "category": category or None, "platform": platform or None,
+        "min_score": min_score, "hours": hours or None, "lang": lang or None,
+    }
+    page, count = _paginate(
+        db, query, sort_map.get(sort_by, sort_map["score"]), limit, offset, cursor, total, "candidates", filters,
+        counter=_stats_counter("candidates", filters, "status"),
+    )
 
-    results = []
-    for c in candidates:
-        clf = db.query(Classification).filter(Classification.candidate_id == c.id).first()
-        results.append(_serialize_candidate(c, clf))
+    results = [_serialize_candidate(*row) for row in with_related(page.items, db)]
 
-    return {"total": total, "offset": offset, "limit": limit, "candidates": results}
+    return {"total": count, "offset": offset, "limit": limit, "next_cursor": page.next_cursor, "candidates": results}
 
 
 # ─── Quick HOT Trends ─────────────────────────────────────────────────────────
@@ -219,12 +287,15 @@ async def list_candidates(
 @router.get("/hot")
 async def list_hot_trends(
     category: Optional[str] = Query(None),
+    lang: Optional[str] = Query(None, description="Filter by language tagged at ingest: ar, fa, other"),
     limit: int = Query(20, ge=1, le=100),
     current_user: User = Depends(require_current_user),
     db: Session = Depends(get_db),
 ):
     """Quick endpoint: returns only HOT classified trends, sorted by score"""
     query = db.query(Candidate).filter(Candidate.status == "hot")
+    if lang:
+        query = query.filter(Candidate.lang == lang)
 
     if category:
         classified_ids = (
@@ -236,10 +307,7 @@ async def list_hot_trends(
     query = query.order_by(Candidate.score.desc())
     candidates = query.limit(limit).all()
 
-    results = []
-    for c in candidates:
-        clf = db.query(Classification).filter(Classification.candidate_id == c.id).first()
-        results.append(_serialize_candidate(c, clf))
+    results = [_serialize_candidate(*row) for row in with_related(candidates, db)]
 
     return {"count": len(results), "trends": results}
 
@@ -249,6 +317,7 @@ async def list_hot_trends(
 @router.get("/candidates/{candidate_id}")
 async def get_candidate_detail(
     candidate_id: int,
+    include_archived: bool = Query(True, description="Also read source signals moved to the archive"),
     current_user: User = Depends(require_current_user),
     db: Session = Depends(get_db),
 ):
@@ -270,11 +339,14 @@ async def get_candidate_detail(
         .all()
     )
 
-    signal_ids = (candidate.source_signal_ids or "").split(",")
-    signal_ids = [int(sid) for sid in signal_ids if sid.strip().isdigit()]
-    signals = db.query(Signal).filter(Signal.id.in_(signal_ids)).all() if signal_ids else []
+    signals = (
+        db.query(Signal)
+        .join(CandidateSignal, CandidateSignal.signal_id == Signal.id)
+        .filter(CandidateSignal.candidate_id == candidate_id)
+        .all()
+    )
 
-    result = _serialize_candidate(candidate, classification)
+    result = _serialize_candidate(candidate, classification, validations[0] if validations else None)
     result["fingerprint"] = candidate.fingerprint
     result["content"] = candidate.content  # Full content, not truncated
     result["validations"] = [
@@ -291,6 +363,10 @@ async def get_candidate_detail(
         for v in validations
     ]
     result["source_signals"] = [_serialize_signal(s) for s in signals]
+    if include_archived:
+        # Signals the retention job moved out of td_signals — read from their partitions on demand
+        archived = await asyncio.to_thread(signal_archive.candidate_signals, candidate_id, db)
+        result["source_signals"] += [{**_serialize_signal(s), "archived": True} for s in archived]
     return result
 
 
@@ -304,10 +380,12 @@ async def list_signals(
     hours: Optional[int] = Query(None, description="Only signals from last N hours"),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (keyset paging, instead of offset)"),
+    total: Optional[str] = Query(None, description="Total: exact, cached or none — default exact for offset pages, none with a cursor"),
     current_user: User = Depends(require_current_user),
     db: Session = Depends(get_db),
 ):
-    """List raw collected signals with filters"""
+    """List raw collected signals with filters, newest first"""
     query = db.query(Signal)
     if platform:
         query = query.filter(Signal.platform == platform)
@@ -319,11 +397,16 @@ async def list_signals(
         cutoff = datetime.now(timezone.utc) - timedelta(hours=hours)
         query = query.filter(Signal.created_at >= cutoff)
 
-    query = query.order_by(Signal.created_at.desc())
-    total = query.count()
-    signals = query.offset(offset).limit(limit).all()
+    filters = {"platform": platform or None, "has_media": has_media, "processed": processed, "hours": hours or None}
+    page, count = _paginate(
+        db, query, Keyset("date", Signal.created_at, Signal.id), limit, offset, cursor, total, "signals", filters,
+        counter=_stats_counter("signals", filters, "platform"),
+    )
 
-    return {"total": total, "offset": offset, "limit": limit, "signals": [_serialize_signal(s) for s in signals]}
+    return {
+        "total": count, "offset": offset, "limit": limit, "next_cursor": page.next_cursor,
+        "signals": [_serialize_signal(s) for s in page.items],
+    }
 
 
 # ─── Statistics ────────────────────────────────────────────────────────────────
@@ -333,46 +416,32 @@ async def get_trend_stats(
     current_user: User = Depends(require_current_user),
     db: Session = Depends(get_db),
 ):
-    """Aggregated trend detector statistics"""
-    total_signals = db.query(Signal).count()
-    total_candidates = db.query(Candidate).count()
-
-    status_counts = {}
-    for s in ["hot", "early", "not_yet", "pending", "expired"]:
-        status_counts[s] = db.query(Candidate).filter(Candidate.status == s).count()
-
-    # Signals per platform
-    platform_counts = {}
-    for row in db.query(Signal.platform, func.count(Signal.id)).group_by(Signal.platform).all():
-        platform_counts[row[0]] = row[1]
+    """Aggregated trend detector statistics (maintained counters — no table scans)"""
+    stats = TrendStats.snapshot(db)
 
-    # Category distribution (from classifications)
-    category_counts = {}
-    for row in db.query(Classification.category, func.count(Classification.id)).group_by(Classification.category).all():
-        category_counts[row[0]] = row[1]
-
-    watchlist_active = db.query(Watchlist).filter(Watchlist.is_active == True).count()
-    total_classifications = db.query(Classification).count()
-
-    # Last 24h activity
+    # HOT candidates touched in the last 24h — index range on (status, updated_at)
     cutoff_24h = datetime.now(timezone.utc) - timedelta(hours=24)
-    signals_24h = db.query(Signal).filter(Signal.created_at >= cutoff_24h).count()
     hot_24h = db.query(Candidate).filter(
         Candidate.status == "hot", Candidate.updated_at >= cutoff_24h
     ).count()
 
     return {
-        "total_signals": total_signals,
-        "total_candidates": total_candidates,
-        "total_classifications": total_classifications,
-        "watchlist_active": watchlist_active,
-        "by_status": status_counts,
-        "by_platform": platform_counts,
-        "by_category": category_counts,
+        "total_signals": stats["total_signals"],
+        "total_candidates": stats["total_candidates"],
+        "total_classifications": stats["total_classifications"],
+        "watchlist_active": stats["watchlist_active"],
+        "by_status": {s: stats["by_status"].get(s, 0) for s in ["hot", "early", "not_yet", "pending", "expired"]},
+        "by_platform": stats["by_platform"],
+        "by_category": stats["by_category"],
         "last_24h": {
-            "signals_collected": signals_24h,
+            "signals_collected": stats["signals_24h"],
             "hot_trends": hot_24h,
         },
+        "caches": {
+            "x_search": XValidator.search_cache.stats(),
+            "classification": Classifier.result_cache.stats(),
+        },
+        "http_client": http_client.stats(),
     }
 
 
@@ -384,16 +453,11 @@ async def list_categories(
     db: Session = Depends(get_db),
 ):
     """List all classification categories with counts"""
-    rows = (
-        db.query(Classification.category, func.count(Classification.id))
-        .group_by(Classification.category)
-        .order_by(func.count(Classification.id).desc())
-        .all()
-    )
+    by_category = TrendStats.snapshot(db)["by_category"]
     return {
         "categories": [
-            {"name": row[0], "count": row[1]}
-            for row in rows
+            {"name": name, "count": count}
+            for name, count in sorted(by_category.items(), key=lambda item: item[1], reverse=True)
         ]
     }
 
@@ -407,15 +471,15 @@ async def list_watchlist(
     db: Session = Depends(get_db),
 ):
     """List watchlist entries (EARLY signals being monitored)"""
-    query = db.query(Watchlist)
+    # Entries and their candidates in one join
+    query = db.query(Watchlist, Candidate).outerjoin(Candidate, Candidate.id == Watchlist.candidate_id)
     if active_only:
         query = query.filter(Watchlist.is_active == True)
     query = query.order_by(Watchlist.next_check_at.asc())
     entries = query.all()
 
     results = []
-    for w in entries:
-        candidate = db.query(Candidate).filter(Candidate.id == w.candidate_id).first()
+    for w, candidate in entries:
         results.append({
             "id": w.id,
             "candidate_id": w.candidate_id,
@@ -432,6 +496,146 @@ async def list_watchlist(
     return {"count": len(results), "watchlist": results}
 
 
+# ─── Pipeline Metrics ──────────────────────────────────────────────────────────
+
+@router.get("/pipeline/metrics")
+async def get_pipeline_metrics(
+    platform: Optional[str] = Query(None, description="Filter: reddit, google_trends, x, tiktok, watchlist"),
+    runs: int = Query(20, ge=0, le=200, description="Recent persisted runs to include"),
+    current_user: User = Depends(require_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Per-stage pipeline metrics: rolling duration percentiles / histograms, items,
+    upstream calls, errors and cache hit rates per platform (since process start),
+    plus the most recent td_pipeline_runs records.
+    """
+    query = db.query(PipelineRun)
+    if platform:
+        query = query.filter(PipelineRun.platform == platform)
+    recent = query.order_by(PipelineRun.started_at.desc(), PipelineRun.id.desc()).limit(runs).all() if runs else []
+
+    return {
+        "platforms": pipeline_metrics.snapshot(platform),
+        "recent_runs": [
+            {
+                "id": r.id,
+                "platform": r.platform,
+                "started_at": r.started_at.isoformat() if r.started_at else None,
+                "duration_s": r.duration_s,
+                "raw_signals": r.raw_signals,
+                "new_signals": r.new_signals,
+                "candidates": r.candidates,
+                "hot": r.hot,
+                "classified": r.classified,
+                "first_hot_after_s": r.first_hot_after_s,
+                "error": r.error,
+                "stages": r.stages or {},
+            }
+            for r in recent
+        ],
+    }
+
+
+# ─── Scoring Config (admin) ────────────────────────────────────────────────────
+
+@router.get("/scoring-config")
+async def get_scoring_config(
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    """Stored scoring overrides and the effective settings the engine scores with"""
+    rows = db.query(ScoringConfig).order_by(ScoringConfig.metric).all()
+    snapshot = ScoringEngine().snapshot(db)
+    return {
+        "overrides": [
+            {
+                "metric": r.metric,
+                "platform": r.platform,
+                "weight": r.weight,
+                "threshold": r.threshold,
+                "is_active": r.is_active,
+                "updated_at": r.updated_at.isoformat() if r.updated_at else None,
+            }
+            for r in rows
+        ],
+        "effective": {"weights": snapshot.weights, "thresholds": snapshot.thresholds},
+    }
+
+
+@router.put("/scoring-config")
+async def set_scoring_config(
+    metric: str = Query(..., description="Weight name (views, cross_platform, ...) or, with platform, a threshold metric"),
+    platform: Optional[str] = Query(None, description="Set a threshold for this platform instead of a global weight"),
+    weight: Optional[float] = Query(None, description="Points awarded (global weights)"),
+    threshold: Optional[float] = Query(None, description="Value that must be exceeded (platform thresholds)"),
+    is_active: bool = Query(True),
+    rescore: bool = Query(True, description="Re-score every stored candidate with the new settings"),
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    """Create or update a scoring override; takes effect on the next scoring pass"""
+    if platform:
+        allowed = METRICS + ("trending_source",)
+        if metric not in allowed:
+            raise HTTPException(status_code=400, detail=f"Platform metric must be one of: {', '.join(allowed)}")
+        key = f"{platform}:{metric}"
+    else:
+        if metric not in SCORING_WEIGHTS:
+            raise HTTPException(status_code=400, detail=f"Weight must be one of: {', '.join(SCORING_WEIGHTS)}")
+        key = metric
+
+    row = db.query(ScoringConfig).filter(ScoringConfig.metric == key).first()
+    if row is None:
+        if platform and metric != "trending_source" and threshold is None:
+            raise HTTPException(status_code=400, detail="threshold is required for a new platform override")
+        if not platform and weight is None:
+            raise HTTPException(status_code=400, detail="weight is required for a new weight override")
+        row = ScoringConfig(metric=key, platform=platform)
+        db.add(row)
+    if weight is not None:
+        row.weight = weight
+    if threshold is not None:
+        row.threshold = threshold
+    row.is_active = is_active
+    db.commit()
+
+    # Full-table rescore — on the DB thread, not the event loop
+    return {
+        "metric": key,
+        "rescore": await db_executor.run(ScoringEngine().rescore_all, db) if rescore else None,
+    }
+
+
+@router.post("/rescore")
+async def rescore_candidates(
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_db),
+):
+    """Re-score every stored candidate with the current scoring settings"""
+    return await db_executor.run(ScoringEngine().rescore_all, db)
+
+
+# ─── Retention ─────────────────────────────────────────────────────────────────
+
+@router.post("/retention/run")
+async def run_retention(
+    current_user: User = Depends(require_admin),
+):
+    """Run one retention pass now: strip old raw payloads, archive aged signals, vacuum"""
+    return await trend_scheduler.run_retention_once()
+
+
+# ─── Language Backfill ─────────────────────────────────────────────────────────
+
+@router.post("/lang/backfill")
+async def run_lang_backfill(
+    current_user: User = Depends(require_admin),
+):
+    """Tag signals / candidates stored before ingest-time language tagging (also runs on start)"""
+    return await trend_scheduler.run_lang_backfill_once()
+
+
 # ─── Pipeline Triggers ─────────────────────────────────────────────────────────
 
 @router.post("/run")
@@ -97,6 +97,31 @@ class RedisClient:
             print(f"Redis error checking blacklist: {e}")
             return False
     
+    @classmethod
+    def get_cached(cls, key: str) -> Optional[str]:
+        """Get a cached value (None if missing, expired or Redis unavailable)"""
+        try:
+            client = cls.get_client()
+            if client:
+                return client.get(key)
+            return None
+        except Exception as e:
+            print(f"Redis error getting cached value: {e}")
+            return None
+    
+    @classmethod
+    def set_cached(cls, key: str, value: str, expires: int) -> bool:
+        """Store a cached value with expiry in seconds"""
+        try:
+            client = cls.get_client()
+            if client:
+                client.setex(key, expires, value)
+                return True
+            return False
+        except Exception as e:
+            print(f"Redis error setting cached value: {e}")
+            return False
+    
     @classmethod
     def test_connection(cls) -> bool:
         """Test Redis connection"""
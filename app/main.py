@@ -37,6 +37,7 @@ from app.agents.agent_manager import agent_manager
 from app.services import x_bridge
 from app.services.memory_service import memory_service
 from app.trend_detector.scheduler.scheduler import trend_scheduler
+from app.trend_detector.http_client import http_client
 from app.scheduler.tick import scheduler_tick
 
 app = FastAPI(title="كنق الاتمته - Chatbot API", version="1.0.0")
@@ -83,6 +84,11 @@ async def startup_event():
     except Exception as e:
         print(f"Warning: Scheduler tick failed: {str(e)}")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    trend_scheduler.stop()
+    await http_client.close()
+
 # Include auth routes
 app.include_router(auth_router)
 
@@ -11,6 +11,8 @@ import re
 from datetime import datetime
 import logging
 
+from app.utils.text import fold_arabic
+
 logger = logging.getLogger(__name__)
 
 
@@ -104,6 +106,22 @@ class IntentService:
     def __init__(self):
         self.intent_patterns = self._initialize_patterns()
         self.platform_keywords = self._initialize_platform_keywords()
+        # Matched against fold_arabic(text) so hamza / taa-marbuta / tashkeel variants
+        # ("أضف" / "اضف") hit the same pattern; compiled once, with the whole-word variant
+        self._compiled_patterns = {
+            intent_type: [
+                (
+                    re.compile(fold_arabic(pattern, lowercase=False), re.IGNORECASE),
+                    re.compile(f"\\b{fold_arabic(pattern, lowercase=False)}\\b", re.IGNORECASE),
+                )
+                for pattern in patterns
+            ]
+            for intent_type, patterns in self.intent_patterns.items()
+        }
+        self._folded_platform_keywords = {
+            platform: [fold_arabic(keyword) for keyword in keywords]
+            for platform, keywords in self.platform_keywords.items()
+        }
     
     def _initialize_patterns(self) -> Dict[IntentType, List[str]]:
         """تهيئة أنماط التعرف على النوايا"""
@@ -471,22 +489,22 @@ class IntentService:
         Returns:
             IntentResult: نتيجة التعرف على النية
         """
-        text_lower = text.lower()
+        text_folded = fold_arabic(text)
         
         # البحث عن النية
         detected_intent = IntentType.UNKNOWN
         max_confidence = 0.0
         
-        for intent_type, patterns in self.intent_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text_lower, re.IGNORECASE):
-                    confidence = self._calculate_confidence(text_lower, pattern)
+        for intent_type, patterns in self._compiled_patterns.items():
+            for pattern, word_pattern in patterns:
+                if pattern.search(text_folded):
+                    confidence = self._calculate_confidence(text_folded, word_pattern)
                     if confidence > max_confidence:
                         max_confidence = confidence
                         detected_intent = intent_type
         
         # استخراج المنصة
-        platform = self._detect_platform(text_lower)
+        platform = self._detect_platform(text_folded)
         
         # استخراج الكيانات
         entities = self._extract_entities(text, detected_intent)
@@ -501,19 +519,17 @@ class IntentService:
             raw_text=text
         )
     
-    def _calculate_confidence(self, text: str, pattern: str) -> float:
-        """حساب مستوى الثقة في التعرف على النية"""
+    def _calculate_confidence(self, text: str, word_pattern: re.Pattern) -> float:
+        """حساب مستوى الثقة في التعرف على النية (النمط نفسه مطابق مسبقاً)"""
         # إذا كان النمط موجود بالضبط، ثقة عالية
-        if re.search(f"\\b{pattern}\\b", text, re.IGNORECASE):
+        if word_pattern.search(text):
             return 0.95
         # إذا كان موجود كجزء من الكلمة
-        elif re.search(pattern, text, re.IGNORECASE):
-            return 0.75
-        return 0.5
+        return 0.75
     
     def _detect_platform(self, text: str) -> Optional[Platform]:
-        """التعرف على المنصة من النص"""
-        for platform, keywords in self.platform_keywords.items():
+        """التعرف على المنصة من النص (بعد fold_arabic)"""
+        for platform, keywords in self._folded_platform_keywords.items():
             for keyword in keywords:
                 if keyword in text:
                     return platform
@@ -651,11 +667,12 @@ class IntentService:
             قائمة بالاقتراحات
         """
         suggestions = []
-        text_lower = partial_text.lower()
+        text_folded = fold_arabic(partial_text)
         
         for intent_type, patterns in self.intent_patterns.items():
             for pattern in patterns:
-                if pattern in text_lower or text_lower in pattern:
+                folded_pattern = fold_arabic(pattern)
+                if folded_pattern in text_folded or text_folded in folded_pattern:
                     suggestions.append({
                         "intent": intent_type.value,
                         "example": pattern,
@@ -0,0 +1,2 @@
+# Offline benchmarks for the trend detector pipeline
+# Run with: python -m app.trend_detector.benchmarks.<name>
@@ -0,0 +1,119 @@
+"""
+Benchmark: Classifier throughput for a burst of HOT candidates against a local
+stub of the OpenAI chat-completions API (no network, no API key needed).
+
+The stub answers after a fixed per-request latency plus a per-item cost, so it
+models both round-trip overhead and generation time. Compares the old serial
+path (concurrency 1, one candidate per prompt) with concurrent and packed runs.
+
+Usage:
+    python -m app.trend_detector.benchmarks.classifier_throughput [candidates]
+"""
+import asyncio
+import json
+import re
+import sys
+import time
+
+from aiohttp import web
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.trend_detector.classifier.classifier as classifier_module
+from app.trend_detector.classifier.classifier import Classifier
+from app.trend_detector.http_client import http_client
+from app.trend_detector.models import Base, Candidate, Classification
+
+
+PORT = 8765
+REQUEST_LATENCY = 0.40    # seconds per chat-completions round trip
+ITEM_LATENCY = 0.05       # extra seconds per classified item (generation)
+RUNS = [                  # (label, concurrency, batch size)
+    ("serial", 1, 1),
+    ("concurrent", 4, 1),
+    ("concurrent+packed", 4, 5),
+]
+
+stub_stats = {"requests": 0}
+
+
+def _answer(item_id=None) -> dict:
+    result = {
+        "category": "رياضة",
+        "subcategory": None,
+        "sensitivity": "low",
+        "risk_notes": None,
+        "keywords": ["دوري", "نهائي"],
+        "entities": {"names": [], "places": [], "teams": [], "brands": []},
+        "summary_ar": "ملخص",
+        "summary_en": "Summary",
+    }
+    if item_id is not None:
+        result["id"] = item_id
+    return result
+
+
+async def _chat_completions(request: web.Request) -> web.Response:
+    stub_stats["requests"] += 1
+    body = await request.json()
+    prompt = body["messages"][-1]["content"]
+    ids = re.findall(r"### العنصر (\d+)", prompt)
+    await asyncio.sleep(REQUEST_LATENCY + ITEM_LATENCY * max(1, len(ids)))
+    content = {"items": [_answer(int(i)) for i in ids]} if ids else _answer()
+    return web.json_response({"choices": [{"message": {"content": json.dumps(content, ensure_ascii=False)}}]})
+
+
+def _session_factory(count: int):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    db = Session()
+    db.add_all(Candidate(title=f"نهائي الدوري {i}", keywords="دوري,نهائي", platforms="x") for i in range(count))
+    db.commit()
+    return db
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    app = web.Application()
+    app.router.add_post("/v1/chat/completions", _chat_completions)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", PORT).start()
+
+    classifier_module.OPENAI_API_KEY = "stub"
+    classifier_module.OPENAI_BASE_URL = f"http://127.0.0.1:{PORT}/v1"
+
+    print(f"{count} HOT candidates, stub latency {REQUEST_LATENCY * 1000:.0f} ms/request + {ITEM_LATENCY * 1000:.0f} ms/item")
+    print(f"{'run':>18} | {'requests':>8} | {'seconds':>7} | {'candidates/s':>12}")
+    print("-" * 56)
+    try:
+        for label, concurrency, batch_size in RUNS:
+            db = _session_factory(count)
+            classifier = Classifier()
+            Classifier.result_cache.clear()   # measure LLM calls, not cache reuse across runs
+            classifier.CONCURRENCY, classifier.BATCH_SIZE = concurrency, batch_size
+            candidates = db.query(Candidate).all()
+
+            stub_stats["requests"] = 0
+            start = time.perf_counter()
+            await classifier.classify(candidates, db)
+            elapsed = time.perf_counter() - start
+
+            assert db.query(Classification).count() == count
+            print(f"{label:>18} | {stub_stats['requests']:>8} | {elapsed:>7.2f} | {count / elapsed:>12.1f}")
+
+            # A second pass is served entirely by the prefetch query
+            stub_stats["requests"] = 0
+            await classifier.classify(candidates, db)
+            assert stub_stats["requests"] == 0
+            db.close()
+    finally:
+        await http_client.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
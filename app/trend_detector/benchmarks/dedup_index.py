@@ -0,0 +1,106 @@
+"""
+Benchmark: per-signal match cost of the Deduplicator's CandidateIndex
+as the active candidate set grows (1k → 300k), compared with the old
+brute-force word-overlap scan.
+
+Half of the probes are planted near-duplicates (one word of an existing
+candidate replaced); recall is the share of those whose source candidate
+comes back as a match. The index's shortlist is exact, so the script exits
+non-zero on any recall below 100%.
+
+Usage:
+    python -m app.trend_detector.benchmarks.dedup_index
+"""
+import bisect
+import itertools
+import random
+import sys
+import time
+
+from app.trend_detector.pipeline.candidate_index import CandidateIndex
+from app.trend_detector.pipeline.deduplicator import Deduplicator
+
+
+SIZES = [1_000, 10_000, 100_000, 300_000]
+PROBES = 500               # signals matched per size
+BRUTE_FORCE_MAX = 10_000   # brute force is too slow to run beyond this
+THRESHOLD = 0.6
+
+
+def _vocabulary(size: int = 50_000) -> list:
+    rng = random.Random(7)
+    letters = "ابتثجحخدذرزسشصضطظعغفقكلمنهوي"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(3, 8))) for _ in range(size)]
+
+
+def _zipf_cdf(size: int, s: float = 1.05) -> list:
+    # Word frequencies follow Zipf's law: a few very common words, a long tail of rare ones
+    return list(itertools.accumulate(1.0 / (rank ** s) for rank in range(1, size + 1)))
+
+
+def _title(rng: random.Random, vocab: list, cdf: list) -> str:
+    total = cdf[-1]
+    words = [vocab[bisect.bisect_left(cdf, rng.random() * total)] for _ in range(rng.randint(6, 14))]
+    return " ".join(words)
+
+
+def main():
+    dedup = Deduplicator()
+    vocab = _vocabulary()
+    cdf = _zipf_cdf(len(vocab))
+
+    print(f"{'candidates':>10} | {'index µs/signal':>15} | {'brute µs/signal':>15} | {'recall':>6}")
+    print("-" * 56)
+    missed = []
+    for size in SIZES:
+        rng = random.Random(size)
+        titles = [_title(rng, vocab, cdf) for _ in range(size)]
+
+        index = CandidateIndex()
+        for i, title in enumerate(titles):
+            index.add(i, dedup._tokens(title))
+
+        # Half near-duplicates of existing candidates, half unseen titles
+        probes = []
+        planted = {}
+        for i in range(PROBES):
+            if i % 2:
+                source = rng.randrange(size)
+                words = titles[source].split()
+                words[rng.randrange(len(words))] = rng.choice(vocab)
+                probes.append(" ".join(words))
+                if dedup._word_overlap_ratio(probes[-1], titles[source]) >= THRESHOLD:
+                    planted[i] = source
+            else:
+                probes.append(_title(rng, vocab, cdf))
+
+        found = 0
+        start = time.perf_counter()
+        for i, title in enumerate(probes):
+            result = index.matches(dedup._tokens(title), THRESHOLD)
+            if i in planted and any(key == planted[i] for key, _ in result):
+                found += 1
+        index_us = (time.perf_counter() - start) / PROBES * 1e6
+        recall = found / len(planted) if planted else 1.0
+
+        brute = "—"
+        if size <= BRUTE_FORCE_MAX:
+            sample = probes[:50]
+            start = time.perf_counter()
+            for title in sample:
+                best = 0.0
+                for other in titles:
+                    best = max(best, dedup._word_overlap_ratio(title, other))
+            brute = f"{(time.perf_counter() - start) / len(sample) * 1e6:,.0f}"
+
+        print(f"{size:>10,} | {index_us:>15,.1f} | {brute:>15} | {recall:>6.1%}")
+        if found < len(planted):
+            missed.append(size)
+
+    if missed:
+        print(f"FAIL — near-duplicates missed at {', '.join(f'{size:,}' for size in missed)} candidates")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: match quality and batch latency of the Deduplicator strategies
+("jaccard", "minhash", "vector").
+
+Quality — pairwise precision / recall / F1 over data/signal_corpus.jsonl, a small
+hand-labelled sample of Arabic + English titles grouped by story. A pair is
+predicted "same story" when either title matches the other at the threshold.
+
+Latency — one collection cycle (BATCH_SIZE signals) matched against 1k / 10k
+synthetic active candidates: per-signal index lookups for jaccard / minhash,
+a single match_batch() call for vector.
+
+Usage:
+    python -m app.trend_detector.benchmarks.dedup_strategies
+"""
+import itertools
+import json
+import random
+import time
+from pathlib import Path
+
+from app.trend_detector.pipeline.candidate_index import CandidateIndex
+from app.trend_detector.pipeline.deduplicator import Deduplicator
+from app.trend_detector.pipeline.minhash_lsh import MinHashIndex
+from app.trend_detector.pipeline.vector_similarity import VectorIndex
+
+
+CORPUS = Path(__file__).parent / "data" / "signal_corpus.jsonl"
+THRESHOLDS = {
+    "jaccard": [0.4, 0.5, 0.6],
+    "minhash": [0.4, 0.5, 0.6, 0.75],
+    "vector": [0.3, 0.4, 0.5, 0.6, 0.75],
+}
+SIZES = [1_000, 10_000]
+BATCH_SIZE = 200
+
+
+def _load_corpus() -> list:
+    with open(CORPUS, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _build(strategy: str, threshold: float):
+    dedup = Deduplicator(strategy)
+    if strategy == "minhash":
+        # LSH bands are tuned to the threshold at construction time
+        return dedup, MinHashIndex(threshold=threshold)
+    return dedup, VectorIndex() if strategy == "vector" else CandidateIndex()
+
+
+def _predicted_pairs(strategy: str, threshold: float, titles: list) -> set:
+    dedup, index = _build(strategy, threshold)
+    for i, title in enumerate(titles):
+        index.add(i, dedup._features(title))
+
+    if strategy == "vector":
+        results = index.match_batch(titles, threshold)
+    else:
+        results = [index.matches(dedup._features(t), threshold) for t in titles]
+
+    pairs = set()
+    for i, matches in enumerate(results):
+        for key, _score in matches:
+            if isinstance(key, int) and key != i:
+                pairs.add((min(i, key), max(i, key)))
+    return pairs
+
+
+def quality():
+    corpus = _load_corpus()
+    titles = [row["title"] for row in corpus]
+    truth = {
+        (i, j) for i, j in itertools.combinations(range(len(corpus)), 2)
+        if corpus[i]["story"] == corpus[j]["story"]
+    }
+    print(f"Corpus: {len(corpus)} titles, {len(truth)} same-story pairs\n")
+    print(f"{'strategy':>8} | {'threshold':>9} | {'precision':>9} | {'recall':>6} | {'F1':>5}")
+    print("-" * 51)
+    for strategy, thresholds in THRESHOLDS.items():
+        for threshold in thresholds:
+            predicted = _predicted_pairs(strategy, threshold, titles)
+            tp = len(predicted & truth)
+            precision = tp / len(predicted) if predicted else 1.0
+            recall = tp / len(truth)
+            f1 = 2 * precision * recall / (precision + recall) if tp else 0.0
+            print(f"{strategy:>8} | {threshold:>9.2f} | {precision:>9.1%} | {recall:>6.1%} | {f1:>5.2f}")
+
+
+def latency():
+    corpus = [row["title"] for row in _load_corpus()]
+    words = sorted({w for title in corpus for w in title.split()})
+
+    print(f"\n{'candidates':>10} | {'strategy':>8} | {'ms/batch':>9} | {'µs/signal':>9}")
+    print("-" * 47)
+    for size in SIZES:
+        rng = random.Random(size)
+        candidates = [" ".join(rng.sample(words, rng.randint(5, 10))) for _ in range(size)]
+        batch = [" ".join(rng.sample(words, rng.randint(5, 10))) for _ in range(BATCH_SIZE)]
+
+        for strategy in THRESHOLDS:
+            threshold = 0.6 if strategy == "jaccard" else 0.75
+            dedup, index = _build(strategy, threshold)
+            for i, title in enumerate(candidates):
+                index.add(i, dedup._features(title))
+
+            start = time.perf_counter()
+            if strategy == "vector":
+                index.match_batch(batch, threshold)
+            else:
+                for title in batch:
+                    index.matches(dedup._features(title), threshold)
+            elapsed = time.perf_counter() - start
+            print(f"{size:>10,} | {strategy:>8} | {elapsed * 1e3:>9.1f} | {elapsed / BATCH_SIZE * 1e6:>9.0f}")
+
+
+def main():
+    quality()
+    latency()
+
+
+if __name__ == "__main__":
+    main()
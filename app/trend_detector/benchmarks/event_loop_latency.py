@@ -0,0 +1,148 @@
+"""
+Benchmark: chat latency while a 1,000-signal pipeline run writes to the DB.
+
+A websocket echo endpoint stands in for /ws/chat on the same event loop as the
+pipeline; a client on its own thread sends a message every 10 ms and records
+the round trip. Three phases: idle, a pipeline run with DB work inline on the
+loop (DB_EXECUTOR_WORKERS=0, the old behaviour), and a run with DB work on the
+DB executor thread. X validation and OpenAI are left unconfigured (score-only
+verdicts / fallback classification), so the run is pure DB work.
+
+Usage:
+    python -m app.trend_detector.benchmarks.event_loop_latency
+"""
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from typing import List
+
+import aiohttp
+from aiohttp import web
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.trend_detector.pipeline.validator as validator_module
+from app.trend_detector.benchmarks.streaming_pipeline import SyntheticXCollector
+from app.trend_detector.classifier.classifier import Classifier
+from app.trend_detector.db_executor import db_executor
+from app.trend_detector.media.vision_analyzer import VisionAnalyzer
+from app.trend_detector.models import Base
+from app.trend_detector.pipeline.deduplicator import Deduplicator
+from app.trend_detector.pipeline.normalizer import Normalizer
+from app.trend_detector.pipeline.scoring import ScoringEngine
+from app.trend_detector.pipeline.validator import XValidator
+from app.trend_detector.scheduler.streaming import StreamingPipeline
+
+
+PORT = 8767
+PROBE_INTERVAL = 0.01   # seconds between chat messages
+IDLE_SECONDS = 2.0
+
+
+async def _chat(request: web.Request) -> web.WebSocketResponse:
+    ws = web.WebSocketResponse()
+    await ws.prepare(request)
+    async for msg in ws:
+        await ws.send_str(msg.data)
+    return ws
+
+
+class ChatProbe:
+    """Websocket client on its own thread/loop — measures round trips to the server loop"""
+
+    def __init__(self):
+        self.samples: List[float] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._run()), daemon=True)
+
+    async def _run(self):
+        async with aiohttp.ClientSession() as session:
+            async with session.ws_connect(f"http://127.0.0.1:{PORT}/ws") as ws:
+                while not self._stop.is_set():
+                    start = time.perf_counter()
+                    await ws.send_str("ping")
+                    await ws.receive()
+                    self.samples.append((time.perf_counter() - start) * 1000)
+                    await asyncio.sleep(PROBE_INTERVAL)
+
+    def start(self):
+        self._thread.start()
+
+    def take(self) -> List[float]:
+        """Samples since the previous call"""
+        samples, self.samples = self.samples, []
+        return samples
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def _percentiles(samples: List[float]) -> str:
+    ordered = sorted(samples) or [0.0]
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return f"{len(ordered):>5} | {pick(0.5):>6.1f} | {pick(0.99):>6.1f} | {ordered[-1]:>7.1f}"
+
+
+def _setup(seed: int):
+    """Pipeline on a fresh SQLite file + a 1,000-signal collector (built before measuring)"""
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    pipeline = StreamingPipeline(
+        VisionAnalyzer(), Normalizer(), Deduplicator(), ScoringEngine(), XValidator(), Classifier(),
+        session_factory=sessionmaker(bind=engine, autoflush=False),
+    )
+    # 10 pages × 100 posts, all arriving within 0.5 s
+    collector = SyntheticXCollector(seed=seed, pages=10, per_page=100, stagger=0.05)
+    return engine, pipeline, collector
+
+
+async def _measured_run(probe: "ChatProbe", seed: int):
+    engine, pipeline, collector = _setup(seed)
+    probe.take()
+    start = time.perf_counter()
+    await pipeline.run(collector)
+    elapsed = time.perf_counter() - start
+    samples = probe.take()
+    engine.dispose()
+    return samples, elapsed
+
+
+async def main():
+    app = web.Application()
+    app.router.add_get("/ws", _chat)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", PORT).start()
+
+    validator_module.X_API_SERVER_URL = ""   # score-only verdicts
+
+    probe = ChatProbe()
+    probe.start()
+    rows = []
+    try:
+        await asyncio.sleep(IDLE_SECONDS)
+        rows.append(("idle", probe.take(), None))
+
+        db_executor.workers = 0
+        rows.append(("inline DB", *await _measured_run(probe, seed=1)))
+
+        db_executor.workers = 1
+        rows.append(("DB executor", *await _measured_run(probe, seed=2)))
+    finally:
+        probe.stop()
+        db_executor.shutdown()
+        await runner.cleanup()
+
+    print("\nChat round trip (ms) during a 1,000-signal pipeline run")
+    print(f"{'phase':>12} | {'msgs':>5} | {'p50':>6} | {'p99':>6} | {'max':>7} | run")
+    print("-" * 58)
+    for label, samples, elapsed in rows:
+        print(f"{label:>12} | {_percentiles(samples)} | {f'{elapsed:.2f}s' if elapsed else '-'}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,125 @@
+"""
+Benchmark: GET /api/trends/signals at increasing depth over N synthetic signals —
+OFFSET pages (+ the COUNT every page used to run) vs keyset cursor pages, unfiltered
+and filtered by platform. Pages are served by the route itself, so the numbers include
+serialization.
+
+Before: every page ran COUNT(*) over the filtered table and OFFSET walked every row
+before the page. Cursor pages should cost the same at every depth, and totals of these
+filter sets come from the td_stats counters. Walking all pages by cursor must return
+exactly the rows the offset pages return — the script exits non-zero if it doesn't.
+
+Needs the app settings (.env) like the API itself, since it imports the routes.
+
+Usage:
+    python -m app.trend_detector.benchmarks.listing_pagination [signals]
+"""
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.api import trend_routes
+from app.trend_detector.models import Base, Signal
+
+
+PAGE = 50
+DEPTHS = (0, 1_000, 10_000, 40_000, 150_000)
+PLATFORMS = ["x", "reddit", "tiktok", "google_trends"]
+REPEATS = 3
+RAW_DATA = {"text": "نص المنشور " * 60, "public_metrics": {"like_count": 10, "retweet_count": 2}}   # ~1.3KB per row, like collector payloads
+
+
+def _seed(db, n: int):
+    rng = random.Random(25)
+    start = datetime(2026, 1, 1)
+    for first in range(0, n, 10_000):
+        db.execute(Signal.__table__.insert(), [
+            {
+                "platform": rng.choice(PLATFORMS), "source_id": str(i), "title": f"إشارة {i}",
+                "content": "تفاصيل " * 40, "raw_data": RAW_DATA,
+                # Many signals share a timestamp (collector batches) — ties are broken by id
+                "created_at": start + timedelta(seconds=rng.randint(0, n // 4)),
+            }
+            for i in range(first, min(first + 10_000, n))
+        ])
+        db.commit()
+
+
+def _signals(db, **params):
+    args = dict(platform=None, has_media=None, processed=None, hours=None, limit=PAGE, offset=0, cursor=None, total=None)
+    args.update(params)
+    return asyncio.run(trend_routes.list_signals(current_user=None, db=db, **args))
+
+
+def _time(fn) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def _cursor_at(db, depth: int, **params):
+    """Cursor that starts the page at `depth` (taken from the page just before it)"""
+    if not depth:
+        return None
+    return _signals(db, offset=depth - PAGE, total="none", **params)["next_cursor"]
+
+
+def _walk(db, **params):
+    ids, cursor = [], None
+    while True:
+        page = _signals(db, cursor=cursor, limit=200, **params)
+        ids += [s["id"] for s in page["signals"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            return ids
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+
+    started = time.perf_counter()
+    _seed(db, n)
+    print(f"Seeded {n:,} signals in {time.perf_counter() - started:.1f}s")
+
+    for params in ({}, {"platform": "x"}):
+        walked = _walk(db, **params)
+        expected = [row.id for row in db.query(Signal.id).filter(
+            *([Signal.platform == params["platform"]] if params else [])
+        ).order_by(Signal.created_at.desc(), Signal.id.desc())]
+        if walked != expected:
+            print(f"FAIL — cursor walk {params or 'unfiltered'} returned {len(walked)} rows, expected {len(expected)} in order")
+            sys.exit(1)
+
+    print(f"\n{'filter':>10} | {'depth':>7} | {'COUNT(*) ms':>11} | {'offset page ms':>14} | {'cursor page ms':>14} | {'td_stats total ms':>17}")
+    print("-" * 90)
+    for params in ({}, {"platform": "x"}):
+        query = db.query(Signal).filter(*([Signal.platform == params["platform"]] if params else []))
+        rows = query.count()
+        counting = _time(query.count)      # what every page used to run on top of OFFSET
+        for depth in DEPTHS:
+            if depth + PAGE > rows:
+                continue
+            cursor = _cursor_at(db, depth, **params)
+            offset = _time(lambda: _signals(db, offset=depth, total="none", **params))
+            keyset = _time(lambda: _signals(db, cursor=cursor, **params))
+            with_total = _time(lambda: _signals(db, cursor=cursor, total="exact", **params)) - keyset
+            print(
+                f"{params.get('platform', 'none'):>10} | {depth:>7,} | {counting:>11.1f} | {offset:>14.1f} | "
+                f"{keyset:>14.1f} | {max(with_total, 0.0):>17.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
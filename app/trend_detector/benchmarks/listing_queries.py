@@ -0,0 +1,120 @@
+"""
+Benchmark / regression check: SQL statements per page of the trend listing endpoints
+(search, candidates, hot, watchlist) and TrendAgent's list helpers, at page sizes
+10 and 100 over an in-memory SQLite database where every candidate has a
+classification and several X validations.
+
+Before the shared listing query layer a 100-row page cost 101+ queries (one
+classification / candidate lookup per row). Every listing must now cost the same
+number of queries at both page sizes — the script exits non-zero if one doesn't.
+
+Needs the app settings (.env) like the API itself, since it imports the routes.
+
+Usage:
+    python -m app.trend_detector.benchmarks.listing_queries
+"""
+import asyncio
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.agents.trend_agent import TrendAgent
+from app.api import trend_routes
+from app.trend_detector.models import Base, Candidate, Classification, Watchlist, XValidation
+
+
+CANDIDATES = 300
+PAGE_SIZES = (10, 100)
+
+
+def _seed(db):
+    rng = random.Random(5)
+    now = datetime.now(timezone.utc)
+    candidates = [
+        Candidate(
+            title=f"خبر {i} عن المباراة", content="تفاصيل", keywords="مباراة", fingerprint=f"fp{i}",
+            platforms="x", score=rng.uniform(0, 12), status="hot" if i % 2 else "early",
+            likes_total=rng.randint(0, 10_000), created_at=now - timedelta(minutes=i),
+        )
+        for i in range(CANDIDATES)
+    ]
+    db.add_all(candidates)
+    db.flush()
+    for c in candidates:
+        db.add(Classification(candidate_id=c.id, category=rng.choice(["رياضة", "سياسي", "تقنية"])))
+        for check in range(3):
+            db.add(XValidation(candidate_id=c.id, verdict="EARLY", post_count=check, raw_data={"posts": []}))
+        if c.status == "early":
+            db.add(Watchlist(candidate_id=c.id, next_check_at=now + timedelta(minutes=c.id)))
+    db.commit()
+
+
+def _listings(db, limit: int):
+    """name → coroutine factory for one page of `limit` rows"""
+    common = dict(current_user=None, db=db)
+    agent = TrendAgent.__new__(TrendAgent)   # list helpers only need the session
+    return {
+        "GET /search": lambda: trend_routes.search_trends(
+            q="مباراة", status=None, category=None, platform=None, sensitivity=None, min_score=None, lang=None,
+            sort_by="score", limit=limit, offset=0, cursor=None, total=None, **common),
+        "GET /candidates": lambda: trend_routes.list_candidates(
+            status=None, category=None, platform=None, min_score=None, hours=None, lang=None,
+            sort_by="score", limit=limit, offset=0, cursor=None, total=None, **common),
+        "GET /hot": lambda: trend_routes.list_hot_trends(category=None, lang=None, limit=limit, **common),
+        # The watchlist is not paged — size it through the number of active entries instead
+        "GET /watchlist": lambda: trend_routes.list_watchlist(active_only=True, **common),
+        "TrendAgent._get_top_arabic": lambda: _sync(agent._get_top_arabic, db, limit),
+    }
+
+
+async def _sync(fn, *args):
+    return fn(*args)
+
+
+def main():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    _seed(db)
+
+    statements = {"n": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(*args, **kwargs):
+        statements["n"] += 1
+
+    counts = {}
+    for limit in PAGE_SIZES:
+        # Watchlist size follows the page size: keep `limit` entries active
+        active = db.query(Watchlist).order_by(Watchlist.id).all()
+        for i, entry in enumerate(active):
+            entry.is_active = i < limit
+        db.commit()
+
+        for name, page in _listings(db, limit).items():
+            db.expire_all()
+            statements["n"] = 0
+            asyncio.run(page())
+            counts.setdefault(name, []).append(statements["n"])
+
+    print(f"\nSQL statements per page ({CANDIDATES} candidates, 3 validations each)")
+    print(f"{'listing':>28} | " + " | ".join(f"{size:>4} rows" for size in PAGE_SIZES))
+    print("-" * 52)
+    failed = []
+    for name, per_size in counts.items():
+        print(f"{name:>28} | " + " | ".join(f"{n:>9}" for n in per_size))
+        if len(set(per_size)) != 1:
+            failed.append(name)
+
+    if failed:
+        print(f"\nFAIL — query count grows with page size: {', '.join(failed)}")
+        sys.exit(1)
+    print("\nOK — constant query count per page")
+
+
+if __name__ == "__main__":
+    main()
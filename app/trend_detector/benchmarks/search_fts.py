@@ -0,0 +1,111 @@
+"""
+Benchmark: trend search over N synthetic Arabic candidates — the old leading-wildcard
+ILIKE scan vs the FTS5 index (td_candidates_fts), both returning the top 50 by score
+the way GET /api/trends/search does, plus bm25-ranked ("relevance") FTS queries.
+
+Text is drawn Zipf-style from a generated vocabulary (a few frequent words, a long
+tail of rare ones) with a handful of real words mixed in, so queries range from
+selective to very common. Candidates are inserted through the ORM so the index is
+filled by the same mapper events as in production.
+
+Usage:
+    python -m app.trend_detector.benchmarks.search_fts [candidates]
+"""
+import itertools
+import random
+import sys
+import time
+
+from sqlalchemy import create_engine, func, or_, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.trend_detector.models import Base, Candidate
+from app.trend_detector.search import TrendSearch, match_expression
+
+
+REAL_WORDS = [
+    "الهلال", "النصر", "مباراة", "الرياض", "وزارة", "التعليم", "إعلان", "صفقة", "مدرسة", "الدوري",
+    "الذكاء", "الاصطناعي", "مهرجان", "موسم",
+]
+VOCABULARY_SIZE = 20_000
+LETTERS = "ابتثجحخدذرزسشصضطظعغفقكلمنهوي"
+QUERIES = ["الهلال", "مباراة الدوري", "اعلان صفقه", "الذكاء الاصطناعي", "مدرسه", "مهرجان موسم الرياض"]
+REPEATS = 5
+
+
+def _seed(db, n: int):
+    rng = random.Random(22)
+    vocabulary = ["".join(rng.choices(LETTERS, k=rng.randint(3, 7))) for _ in range(VOCABULARY_SIZE)]
+    # Real words sit between the head and the tail so the queries are selective
+    for i, word in enumerate(REAL_WORDS):
+        vocabulary[40 + i * 25] = word
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(VOCABULARY_SIZE)))
+
+    def words(k: int) -> str:
+        return " ".join(rng.choices(vocabulary, cum_weights=cum_weights, k=k))
+
+    for start in range(0, n, 5000):
+        db.add_all(
+            Candidate(
+                title=words(8), content=words(20), keywords=words(3),
+                fingerprint=f"fp{i}", score=rng.uniform(0, 12),
+            )
+            for i in range(start, min(start + 5000, n))
+        )
+        db.commit()
+
+
+def _ilike_filter(q: str):
+    term = f"%{q}%"
+    return or_(Candidate.title.ilike(term), Candidate.content.ilike(term), Candidate.keywords.ilike(term))
+
+
+def _ilike(db, q: str):
+    return db.query(Candidate.id).filter(_ilike_filter(q)).order_by(Candidate.score.desc()).limit(50).all()
+
+
+def _fts(db, q: str):
+    matches = TrendSearch.ranked(match_expression(q)).subquery()
+    return (
+        db.query(Candidate.id).join(matches, matches.c.candidate_id == Candidate.id)
+        .order_by(Candidate.score.desc()).limit(50).all()
+    )
+
+
+def _fts_relevance(db, q: str):
+    return db.execute(TrendSearch.ranked(match_expression(q)).order_by("rank").limit(50)).all()
+
+
+def _time(fn, db, q: str) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        fn(db, q)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+
+    started = time.perf_counter()
+    _seed(db, n)
+    print(f"Seeded + indexed {n:,} candidates in {time.perf_counter() - started:.1f}s")
+
+    print(f"\n{'query':>22} | {'ILIKE hits':>10} | {'FTS hits':>8} | {'ILIKE ms':>9} | {'FTS ms':>8} | {'FTS bm25 ms':>11}")
+    print("-" * 84)
+    for q in QUERIES:
+        ilike_hits = db.scalar(select(func.count()).where(_ilike_filter(q)))
+        hits = db.scalar(select(func.count()).select_from(TrendSearch.matching_ids(match_expression(q)).subquery()))
+        print(
+            f"{q:>22} | {ilike_hits:>10} | {hits:>8} | {_time(_ilike, db, q):>9.1f} | "
+            f"{_time(_fts, db, q):>8.1f} | {_time(_fts_relevance, db, q):>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark: time-to-first-HOT and cycle time of the streaming pipeline vs the
+old stop-and-wait order (whole collection first, then each stage once).
+
+A synthetic X collector returns 6 sub-requests that finish 0.4 s apart; a local
+stub of the X search API answers each validation search after 0.3 s, with enough
+authors and engagement to make high-score candidates HOT. Runs on a temporary
+SQLite file; Vision and OpenAI are left unconfigured (pass-through / fallback).
+
+Usage:
+    python -m app.trend_detector.benchmarks.streaming_pipeline
+"""
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from aiohttp import web
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.trend_detector.pipeline.validator as validator_module
+from app.trend_detector.classifier.classifier import Classifier
+from app.trend_detector.collectors.base import BaseCollector
+from app.trend_detector.concurrency import RateBudget
+from app.trend_detector.http_client import http_client
+from app.trend_detector.media.vision_analyzer import VisionAnalyzer
+from app.trend_detector.models import Base
+from app.trend_detector.pipeline.deduplicator import Deduplicator
+from app.trend_detector.pipeline.normalizer import Normalizer
+from app.trend_detector.pipeline.scoring import ScoringEngine
+from app.trend_detector.pipeline.validator import XValidator
+from app.trend_detector.scheduler.streaming import StreamingPipeline
+
+
+PORT = 8766
+SUBREQUESTS = 6
+SUBREQUEST_STAGGER = 0.4   # seconds between sub-request completions
+SIGNALS_PER_SUBREQUEST = 40
+SEARCH_LATENCY = 0.3       # seconds per stub X search
+
+
+class SyntheticXCollector(BaseCollector):
+    """Sub-requests that finish one after another, half of their posts viral"""
+
+    platform = "x"
+
+    def __init__(self, seed: int, pages: int = SUBREQUESTS, per_page: int = SIGNALS_PER_SUBREQUEST,
+                 stagger: float = SUBREQUEST_STAGGER):
+        self.rng = random.Random(seed)
+        self.pages = pages
+        self.per_page = per_page
+        self.stagger = stagger
+        self.MAX_CONCURRENT_REQUESTS = pages
+        letters = "ابتثجحخدذرزسشصضطظعغفقكلمنهوي"
+        self.vocab = ["".join(self.rng.choice(letters) for _ in range(6)) for _ in range(5000)]
+
+    async def _page(self, n: int):
+        await asyncio.sleep(self.stagger * (n + 1))
+        signals = []
+        for i in range(self.per_page):
+            viral = i % 2 == 0
+            signals.append(self._make_signal(
+                source_id=f"{n}-{i}",
+                title=" ".join(self.rng.sample(self.vocab, 8)),
+                views=50_000 if viral else 10, likes=5_000 if viral else 1,
+                reshares=1_000 if viral else 0, comments=500 if viral else 0,
+            ))
+        return signals
+
+    async def collect_stream(self):
+        async for _, batch in self._fan_out_stream([(f"page {n}", self._page(n)) for n in range(self.pages)]):
+            yield batch
+
+
+class StopAndWait(BaseCollector):
+    """Hands the whole cycle over as one batch, like the pre-streaming scheduler"""
+
+    platform = "x"
+
+    def __init__(self, inner: BaseCollector):
+        self.inner = inner
+
+    async def collect_stream(self):
+        yield await self.inner.collect()
+
+
+async def _search(request: web.Request) -> web.Response:
+    await asyncio.sleep(SEARCH_LATENCY)
+    now = datetime.now(timezone.utc).strftime("%a %b %d %H:%M:%S %z %Y")
+    return web.json_response({"tweets": [
+        {"tweet_id": str(i), "screen_name": f"user{i}", "favorite_count": 2_000, "created_at": now}
+        for i in range(10)
+    ]})
+
+
+async def _run(label: str, collector: BaseCollector, batch_size: int):
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+
+    XValidator.search_cache.clear()
+    pipeline = StreamingPipeline(
+        VisionAnalyzer(), Normalizer(), Deduplicator(), ScoringEngine(), XValidator(), Classifier(),
+        session_factory=sessionmaker(bind=engine, autoflush=False),
+        batch_size=batch_size,
+    )
+    start = time.perf_counter()
+    summary = await pipeline.run(collector)
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+    return label, summary, elapsed
+
+
+async def main():
+    app = web.Application()
+    app.router.add_post("/api/search", _search)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", PORT).start()
+
+    validator_module.X_API_SERVER_URL = f"http://127.0.0.1:{PORT}"
+    XValidator.rate_budget = RateBudget(10_000)
+
+    try:
+        results = [
+            await _run("stop-and-wait", StopAndWait(SyntheticXCollector(seed=1)), batch_size=10_000),
+            await _run("streaming", SyntheticXCollector(seed=2), batch_size=50),
+        ]
+    finally:
+        await http_client.close()
+        await runner.cleanup()
+
+    print(f"\n{SUBREQUESTS} sub-requests × {SIGNALS_PER_SUBREQUEST} signals, {SUBREQUEST_STAGGER}s apart; X search {SEARCH_LATENCY}s")
+    print(f"{'run':>14} | {'signals':>7} | {'HOT':>4} | {'first HOT':>9} | {'cycle':>6}")
+    print("-" * 54)
+    for label, summary, elapsed in results:
+        print(
+            f"{label:>14} | {summary['raw_signals']:>7} | {summary['hot']:>4} | "
+            f"{summary['first_hot_after_s']:>8}s | {elapsed:>5.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,120 @@
+"""
+Microbenchmark: Arabic text normalization — the previous regex paths vs app/utils/text
+(str.translate over precompiled tables + LRU cache).
+
+  normalize_arabic   old: tashkeel regex + fold table + punctuation regex
+  fingerprint_text   old: Deduplicator._normalize_text (two re.sub per call)
+  tokenize           old: normalize + split, recomputed for every comparison
+
+Each is timed on unique titles with a cold cache (translate speed alone) and on a
+stream where the same hot titles recur, as they do across dedup, classification and
+search. Outputs are compared first — the script exits non-zero on any difference.
+
+Usage:
+    python -m app.trend_detector.benchmarks.text_normalization [titles]
+"""
+import random
+import re
+import sys
+import time
+
+from app.utils import text as text_utils
+
+
+# ─── Previous implementations ──────────────────────────────────────────────────
+
+_TASHKEEL = re.compile(r'[\u0610-\u061A\u064B-\u065F\u0670\u06D6-\u06ED\u0640]')  # harakat + tatweel
+_ARABIC_FOLD = str.maketrans({
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ى": "ي", "ئ": "ي", "ؤ": "و", "ة": "ه",
+})
+_NON_WORD = re.compile(r'[^\w\s]')
+
+
+def regex_normalize_arabic(text: str) -> str:
+    if not text:
+        return ""
+    text = _TASHKEEL.sub("", text.lower()).translate(_ARABIC_FOLD)
+    return " ".join(_NON_WORD.sub("", text).split())
+
+
+def regex_fingerprint_text(text: str) -> str:
+    if not text:
+        return ""
+    text = text.lower().strip()
+    text = re.sub(r'[^\w\s]', '', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text
+
+
+def regex_tokenize(text: str) -> tuple:
+    return tuple(regex_normalize_arabic(text).split())
+
+
+# ─── Workload ─────────────────────────────────────────────────────────────────
+
+WORDS = [
+    "عاجل", "الهلال", "النصر", "مباراة", "الرياض", "وزارة", "التعليم", "إعلان", "صفقة", "مدرسة",
+    "الدوري", "الذكاء", "الاصطناعي", "مهرجان", "موسم", "أمطار", "غزيرة", "الأسهم", "ارتفاع", "قرار",
+    "جديد", "رسمياً", "الحُكومة", "السّعودية", "مُباراة", "الـــيوم", "breaking", "news", "Saudi",
+]
+DECORATIONS = ["", "!", "؟", " 🔥", " #ترند", ": ", " — ", " (فيديو)", "...", " https://t.co/abc"]
+HOT_SHARE = 0.8        # share of lookups that hit the recurring hot titles
+HOT_TITLES = 200
+
+
+def _titles(n: int, rng: random.Random):
+    return [
+        " ".join(rng.choices(WORDS, k=rng.randint(4, 14))) + rng.choice(DECORATIONS) + f" {i}"
+        for i in range(n)
+    ]
+
+
+def _time(fn, items) -> float:
+    started = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - started) / len(items) * 1e6
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    rng = random.Random(23)
+    unique = _titles(n, rng)
+    hot = unique[:HOT_TITLES]
+    stream = [rng.choice(hot) if rng.random() < HOT_SHARE else rng.choice(unique) for _ in range(n)]
+
+    pairs = [
+        ("normalize_arabic", regex_normalize_arabic, text_utils.normalize_arabic),
+        ("fingerprint_text", regex_fingerprint_text, text_utils.fingerprint_text),
+        ("tokenize", regex_tokenize, text_utils.tokenize),
+    ]
+
+    mismatches = [
+        (name, title) for name, old, new in pairs for title in unique
+        if old(title) != new.__wrapped__(title)
+    ]
+    if mismatches:
+        name, title = mismatches[0]
+        print(f"FAIL — {len(mismatches)} outputs differ from the regex path, first: {name}({title!r})")
+        sys.exit(1)
+
+    print(f"\n{n:,} titles, {HOT_SHARE:.0%} of the stream from {HOT_TITLES} hot titles — µs per call")
+    print(f"{'function':>18} | {'regex':>7} | {'translate':>9} | {'+ LRU (stream)':>14} | {'regex (stream)':>14}")
+    print("-" * 75)
+    for name, old, new in pairs:
+        new.cache_clear()
+        uncached = _time(new.__wrapped__, unique)
+        new.cache_clear()
+        cached = _time(new, stream)
+        print(f"{name:>18} | {_time(old, unique):>7.2f} | {uncached:>9.2f} | {cached:>14.2f} | {_time(old, stream):>14.2f}")
+
+    hit_rates = {
+        name: info["hits"] / max(1, info["hits"] + info["misses"])
+        for name, info in text_utils.cache_info().items() if info["hits"] + info["misses"]
+    }
+    print("\nLRU hit rate on the stream: " + ", ".join(f"{name} {rate:.0%}" for name, rate in hit_rates.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+TTL Cache
+Two-tier result cache for expensive external lookups:
+  - in-process LRU (OrderedDict) with per-entry expiry
+  - optional Redis tier (shared across workers/restarts) through RedisClient
+
+Values must be JSON-serializable when the Redis tier is enabled. Hit/miss
+counters are kept per tier and reported by stats(); every get() is also counted
+against the pipeline stage running it (metrics.record_cache).
+"""
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.db.redis_client import RedisClient
+from app.trend_detector.metrics import record_cache
+
+
+class TTLCache:
+    """LRU + TTL cache with an optional Redis second tier"""
+
+    def __init__(self, namespace: str, ttl_seconds: int, max_entries: int = 1024, use_redis: bool = False):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.use_redis = use_redis
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()   # key → (expires_at, value)
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value or None (expired entries count as misses)"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                record_cache(True)
+                return value
+            del self._entries[key]
+
+        if self.use_redis:
+            raw = RedisClient.get_cached(self._redis_key(key))
+            if raw is not None:
+                value = json.loads(raw)
+                self._store_local(key, value)
+                self.redis_hits += 1
+                record_cache(True)
+                return value
+
+        self.misses += 1
+        record_cache(False)
+        return None
+
+    def peek(self, key: str) -> Optional[Any]:
+        """Live in-process value or None, without touching the hit/miss counters"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any):
+        self._store_local(key, value)
+        if self.use_redis:
+            RedisClient.set_cached(self._redis_key(key), json.dumps(value, ensure_ascii=False), self.ttl_seconds)
+
+    def _store_local(self, key: str, value: Any):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.redis_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.redis_hits) / lookups, 3) if lookups else 0.0,
+        }
@@ -0,0 +1,147 @@
+"""
+Classification Cache
+Reuses the classification of a story that resurfaces as a new Candidate
+(new fingerprint after expiry, slightly different title from another platform).
+
+Entries are keyed by the title's normalized token signature — the Deduplicator's
+normalization plus Arabic letter folding — and held in a TTLCache (LRU + expiry).
+A CandidateIndex over the live signatures finds near-duplicates whose title-token
+Jaccard reaches CLASSIFICATION_CACHE_SIMILARITY.
+
+Warmed once per process from the LLM classifications made within the TTL (never
+keyword-fallback ones), so a restart does not re-pay for stories classified just
+before it. recent() is the DB query (run on the DB executor); the cache itself
+is only used on the event loop.
+"""
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.trend_detector.cache import TTLCache
+from app.trend_detector.config import (
+    CLASSIFICATION_CACHE_TTL,
+    CLASSIFICATION_CACHE_MAX_ENTRIES,
+    CLASSIFICATION_CACHE_SIMILARITY,
+)
+from app.trend_detector.models import Candidate, Classification
+from app.trend_detector.pipeline.candidate_index import CandidateIndex
+from app.utils.text import tokenize
+
+
+class ClassificationCache:
+    """Classification results by title signature, with near-duplicate lookup"""
+
+    # Shorter titles ("الهلال", "breaking news") name a topic, not a story
+    MIN_TOKENS = 3
+
+    def __init__(
+        self,
+        ttl_seconds: int = CLASSIFICATION_CACHE_TTL,
+        max_entries: int = CLASSIFICATION_CACHE_MAX_ENTRIES,
+        similarity: float = CLASSIFICATION_CACHE_SIMILARITY,
+    ):
+        self.results = TTLCache("td:classification", ttl_seconds=ttl_seconds, max_entries=max_entries)
+        self.index = CandidateIndex()   # signature key → title tokens
+        self.similarity = similarity
+        self.is_loaded = False
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.misses = 0
+
+    def signature(self, title: str) -> FrozenSet[str]:
+        return frozenset(tokenize(title))
+
+    @staticmethod
+    def _key(tokens: FrozenSet[str]) -> str:
+        return " ".join(sorted(tokens))
+
+    @staticmethod
+    def to_result(classification: Classification) -> dict:
+        """A Classification row in the shape the LLM returns"""
+        try:
+            entities = json.loads(classification.entities) if classification.entities else {}
+        except json.JSONDecodeError:
+            entities = {}
+        return {
+            "category": classification.category,
+            "subcategory": classification.subcategory,
+            "sensitivity": classification.sensitivity,
+            "risk_notes": classification.risk_notes,
+            "keywords": [k for k in (classification.extracted_keywords or "").split(",") if k],
+            "entities": entities,
+            "summary_ar": classification.summary_ar,
+            "summary_en": classification.summary_en,
+        }
+
+    def recent(self, db: Session) -> List[Tuple[str, dict]]:
+        """(title, result) of the newest LLM classifications made within the TTL, oldest first"""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.results.ttl_seconds)
+        rows = (
+            db.query(Candidate.title, Classification)
+            .join(Classification, Classification.candidate_id == Candidate.id)
+            # Like put(): only LLM results (and copies of them) are reused, never the keyword fallback
+            .filter(Classification.classified_at >= cutoff, Classification.source.in_(("llm", "cache")))
+            .order_by(Classification.classified_at.desc())
+            .limit(self.results.max_entries)
+            .all()
+        )
+        # Oldest first, so the most recent classifications end up last in the LRU
+        return [(title, self.to_result(classification)) for title, classification in reversed(rows)]
+
+    def warm(self, entries: List[Tuple[str, dict]]):
+        """Fill from recent() once per process"""
+        for title, result in entries:
+            self.put(title, result)
+        self.is_loaded = True
+        print(f"[ClassificationCache] Loaded {len(self.results)} recent classifications")
+
+    def get(self, title: str) -> Optional[dict]:
+        """Cached result for this title or a near-duplicate of it, else None"""
+        tokens = self.signature(title)
+        if len(tokens) < self.MIN_TOKENS:
+            return None
+
+        result = self.results.peek(self._key(tokens))
+        if result is not None:
+            self.exact_hits += 1
+            return result
+
+        for key, _ in self.index.matches(tokens, self.similarity):
+            result = self.results.peek(key)
+            if result is None:
+                self.index.remove(key)   # expired or evicted
+                continue
+            self.near_hits += 1
+            return result
+
+        self.misses += 1
+        return None
+
+    def put(self, title: str, result: dict):
+        tokens = self.signature(title)
+        if len(tokens) < self.MIN_TOKENS or not result:
+            return
+        key = self._key(tokens)
+        self.results.set(key, {k: v for k, v in result.items() if k != "id"})
+        self.index.add(key, tokens)
+
+        # Drop index entries whose results were evicted by the LRU
+        if len(self.index) > 2 * self.results.max_entries:
+            for stale in [k for k in self.index.keys() if self.results.peek(k) is None]:
+                self.index.remove(stale)
+
+    def clear(self):
+        self.results.clear()
+        self.index.clear()
+
+    def stats(self) -> Dict:
+        lookups = self.exact_hits + self.near_hits + self.misses
+        return {
+            "entries": len(self.results),
+            "hits": self.exact_hits,
+            "near_hits": self.near_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.exact_hits + self.near_hits) / lookups, 3) if lookups else 0.0,
+        }
@@ -1,9 +1,14 @@
 """
 Classifier Service
 LLM-based classification + entity/keyword enrichment for HOT candidates.
+
+Existing classifications are prefetched in one query; the rest go to the LLM
+CLASSIFIER_CONCURRENCY requests at a time, optionally CLASSIFIER_BATCH_SIZE
+candidates packed per prompt. A story seen within CLASSIFICATION_CACHE_TTL
+(same or near-duplicate title) copies its earlier classification instead.
 """
 import json
-from typing import List
+from typing import Dict, List
 from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 
@@ -11,9 +16,16 @@ from app.trend_detector.models import Candidate, Classification
 from app.trend_detector.config import (
     OPENAI_API_KEY,
     OPENAI_MODEL,
+    OPENAI_BASE_URL,
     CLASSIFIER_CATEGORIES,
     SENSITIVITY_LEVELS,
+    CLASSIFIER_CONCURRENCY,
+    CLASSIFIER_BATCH_SIZE,
 )
+from app.trend_detector.classifier.classification_cache import ClassificationCache
+from app.trend_detector.concurrency import bounded_gather
+from app.trend_detector.db_executor import db_executor
+from app.trend_detector.http_client import http_client
 
 
 class Classifier:
@@ -37,6 +49,21 @@ class Classifier:
 التصنيفات المتاحة: """ + ", ".join(CLASSIFIER_CATEGORIES) + """
 مستويات الحساسية: """ + ", ".join(SENSITIVITY_LEVELS)
 
+    # Same schema, several numbered items per request
+    BATCH_SYSTEM_PROMPT = SYSTEM_PROMPT.replace(
+        "مهمتك تصنيف المحتوى التالي وتحليله.",
+        "مهمتك تصنيف كل عنصر من العناصر المرقمة التالية وتحليله بشكل مستقل.",
+    ).replace(
+        "أجب بصيغة JSON فقط بدون أي نص إضافي:\n{",
+        "أجب بصيغة JSON فقط بدون أي نص إضافي، بالشكل {\"items\": [...]} وعنصر لكل رقم:\n{\n    \"id\": \"رقم العنصر\",",
+    )
+
+    CONCURRENCY = CLASSIFIER_CONCURRENCY
+    BATCH_SIZE = CLASSIFIER_BATCH_SIZE
+
+    # Shared by the pipeline run and the watchlist re-check
+    result_cache = ClassificationCache()
+
     def is_configured(self) -> bool:
         return bool(OPENAI_API_KEY)
 
@@ -58,10 +85,15 @@ class Classifier:
 
         return "\n".join(parts)
 
-    async def _classify_with_openai(self, prompt: str) -> dict:
-        """Call OpenAI API for classification"""
-        import aiohttp
+    def _build_batch_prompt(self, candidates: List[Candidate]) -> str:
+        """One user message holding several candidates, numbered by candidate id"""
+        return "\n\n".join(
+            f"### العنصر {candidate.id}\n{self._build_user_prompt(candidate)}"
+            for candidate in candidates
+        )
 
+    async def _classify_with_openai(self, prompt: str, system_prompt: str = None, max_tokens: int = 800) -> dict:
+        """Call OpenAI API for classification"""
         headers = {
             "Authorization": f"Bearer {OPENAI_API_KEY}",
             "Content-Type": "application/json",
@@ -69,44 +101,88 @@ class Classifier:
         payload = {
             "model": OPENAI_MODEL,
             "messages": [
-                {"role": "system", "content": self.SYSTEM_PROMPT},
+                {"role": "system", "content": system_prompt or self.SYSTEM_PROMPT},
                 {"role": "user", "content": prompt},
             ],
             "temperature": 0.3,
-            "max_tokens": 800,
+            "max_tokens": max_tokens,
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=payload,
-            ) as resp:
-                if resp.status != 200:
-                    error = await resp.text()
-                    print(f"[Classifier] OpenAI error {resp.status}: {error}")
-                    return {}
-
-                data = await resp.json()
-
-                # Safely extract content from response
-                try:
-                    content = data["choices"][0]["message"]["content"]
-                except (KeyError, IndexError, TypeError):
-                    print(f"[Classifier] Unexpected OpenAI response structure: {str(data)[:300]}")
-                    return {}
-
-                # Parse JSON from response
-                try:
-                    # Handle potential markdown code blocks
-                    if "```" in content:
-                        content = content.split("```")[1]
-                        if content.startswith("json"):
-                            content = content[4:]
-                    return json.loads(content.strip())
-                except json.JSONDecodeError:
-                    print(f"[Classifier] Failed to parse LLM response: {content[:200]}")
-                    return {}
+        async with http_client.session().post(
+            f"{OPENAI_BASE_URL}/chat/completions",
+            headers=headers,
+            json=payload,
+        ) as resp:
+            if resp.status != 200:
+                error = await resp.text()
+                print(f"[Classifier] OpenAI error {resp.status}: {error}")
+                return {}
+
+            data = await resp.json()
+
+            # Safely extract content from response
+            try:
+                content = data["choices"][0]["message"]["content"]
+            except (KeyError, IndexError, TypeError):
+                print(f"[Classifier] Unexpected OpenAI response structure: {str(data)[:300]}")
+                return {}
+
+            # Parse JSON from response
+            try:
+                # Handle potential markdown code blocks
+                if "```" in content:
+                    content = content.split("```")[1]
+                    if content.startswith("json"):
+                        content = content[4:]
+                return json.loads(content.strip())
+            except json.JSONDecodeError:
+                print(f"[Classifier] Failed to parse LLM response: {content[:200]}")
+                return {}
+
+    async def _classify_one(self, candidate: Candidate) -> dict:
+        try:
+            return await self._classify_with_openai(self._build_user_prompt(candidate))
+        except Exception as e:
+            print(f"[Classifier] OpenAI request failed for candidate {candidate.id}: {e}")
+            return {}
+
+    async def _classify_group(self, candidates: List[Candidate]) -> Dict[int, dict]:
+        """
+        LLM results for a group of candidates, keyed by candidate id.
+        Groups of several go out as one packed prompt; items the model dropped
+        or mangled are retried one by one, in turn — a group holds one of the
+        CONCURRENCY slots of classify(), so it never has more than one request out.
+        """
+        if len(candidates) == 1:
+            return {candidates[0].id: await self._classify_one(candidates[0])}
+
+        results: Dict[int, dict] = {}
+        try:
+            data = await self._classify_with_openai(
+                self._build_batch_prompt(candidates),
+                system_prompt=self.BATCH_SYSTEM_PROMPT,
+                max_tokens=600 * len(candidates),
+            )
+        except Exception as e:
+            print(f"[Classifier] Packed OpenAI request failed: {e}")
+            data = {}
+
+        items = data.get("items", []) if isinstance(data, dict) else []
+        wanted = {candidate.id for candidate in candidates}
+        for item in items:
+            try:
+                cand_id = int(str(item.get("id", "")).strip())
+            except (AttributeError, ValueError):
+                continue
+            if cand_id in wanted:
+                results[cand_id] = item
+
+        missing = [candidate for candidate in candidates if candidate.id not in results]
+        if missing:
+            print(f"[Classifier] Packed response missed {len(missing)}/{len(candidates)} items, retrying singly")
+            for candidate in missing:
+                results[candidate.id] = await self._classify_one(candidate)
+        return results
 
     def _fallback_classify(self, candidate: Candidate) -> dict:
         """Simple keyword-based fallback when OpenAI is unavailable"""
@@ -144,35 +220,72 @@ class Classifier:
             "summary_en": candidate.title or "",
         }
 
+    @staticmethod
+    def _load_existing(ids: List[int], db: Session) -> Dict[int, Classification]:
+        """Stored classifications of `ids` by candidate id"""
+        existing: Dict[int, Classification] = {}
+        for i in range(0, len(ids), 400):
+            for classification in (
+                db.query(Classification)
+                .filter(Classification.candidate_id.in_(ids[i:i + 400]))
+                .all()
+            ):
+                existing.setdefault(classification.candidate_id, classification)
+        return existing
+
     async def classify(self, candidates: List[Candidate], db: Session) -> List[Classification]:
         """
         Classify HOT candidates.
         Uses OpenAI if available, falls back to keyword matching.
         Returns list of Classification records.
         """
-        classifications = []
+        candidates = list({candidate.id: candidate for candidate in candidates}.values())
+        if not candidates:
+            return []
 
+        # Skip already classified candidates — one IN query instead of one lookup each
+        existing = await db_executor.run(self._load_existing, [candidate.id for candidate in candidates], db)
+
+        pending = [candidate for candidate in candidates if candidate.id not in existing]
+        results: Dict[int, dict] = {}
+
+        # Resurfaced stories copy their earlier classification
+        cache = self.result_cache
+        if pending and not cache.is_loaded:
+            cache.warm(await db_executor.run(cache.recent, db))
+        for candidate in pending:
+            cached = cache.get(candidate.title)
+            if cached is not None:
+                results[candidate.id] = cached
+        reused_ids = set(results)
+        reused = len(reused_ids)
+
+        to_llm = [candidate for candidate in pending if candidate.id not in results]
+        if to_llm and self.is_configured():
+            size = max(1, self.BATCH_SIZE)
+            groups = [to_llm[i:i + size] for i in range(0, len(to_llm), size)]
+            for group_results in await bounded_gather(
+                (self._classify_group(group) for group in groups), self.CONCURRENCY
+            ):
+                results.update(group_results)
+            for candidate in to_llm:
+                if results.get(candidate.id):
+                    cache.put(candidate.title, results[candidate.id])
+
+        classifications = []
         for candidate in candidates:
-            # Skip already classified candidates
-            existing = (
-                db.query(Classification)
-                .filter(Classification.candidate_id == candidate.id)
-                .first()
-            )
-            if existing:
-                classifications.append(existing)
+            if candidate.id in existing:
+                classifications.append(existing[candidate.id])
                 continue
 
-            if self.is_configured():
-                prompt = self._build_user_prompt(candidate)
-                result = await self._classify_with_openai(prompt)
-            else:
-                result = {}
+            result = results.get(candidate.id) or {}
+            source = "cache" if candidate.id in reused_ids else "llm"
 
             # Fallback if LLM failed or not configured
             if not result:
                 print(f"[Classifier] Using fallback for candidate {candidate.id}")
                 result = self._fallback_classify(candidate)
+                source = "fallback"
 
             classification = Classification(
                 candidate_id=candidate.id,
@@ -184,6 +297,7 @@ class Classifier:
                 entities=json.dumps(result.get("entities", {}), ensure_ascii=False),
                 summary_ar=result.get("summary_ar"),
                 summary_en=result.get("summary_en"),
+                source=source,
                 classified_at=datetime.now(timezone.utc),
             )
             db.add(classification)
@@ -192,8 +306,11 @@ class Classifier:
             # Update candidate status to fully processed
             candidate.status = "hot"
 
-        if classifications:
-            db.commit()
+        if pending:
+            await db_executor.run(db.commit)
 
-        print(f"[Classifier] Classified {len(classifications)} candidates")
+        print(
+            f"[Classifier] Classified {len(classifications)} candidates "
+            f"({len(pending)} new — {reused} from cache; {len(existing)} already classified)"
+        )
         return classifications
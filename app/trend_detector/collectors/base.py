@@ -2,17 +2,22 @@
 Base Collector Interface
 All platform collectors inherit from this
 """
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Awaitable, Tuple
 from datetime import datetime
 
+from app.trend_detector.config import COLLECTOR_CONCURRENCY
+
 
 class BaseCollector(ABC):
     """Abstract base class for all trend signal collectors"""
 
     platform: str = "unknown"
 
-    @abstractmethod
+    MAX_CONCURRENT_REQUESTS = COLLECTOR_CONCURRENCY
+    SUBREQUEST_TIMEOUT = 60  # seconds per sub-request, on top of any client timeout
+
     async def collect(self) -> List[Dict[str, Any]]:
         """
         Collect raw signals from the platform.
@@ -36,12 +41,66 @@ class BaseCollector(ABC):
             "raw_data": dict,
         }
         """
+        signals = []
+        async for batch in self.collect_stream():
+            signals.extend(batch)
+        print(f"[{type(self).__name__}] Collected {len(signals)} signals")
+        return signals
+
+    @abstractmethod
+    def collect_stream(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Async generator of the cycle's signals (same shape as collect()) in micro-batches,
+        each yielded as soon as its sub-request (feed, region, query) completes.
+        """
         pass
 
     def is_configured(self) -> bool:
         """Check if required API keys are available"""
         return True
 
+    async def _fan_out_stream(
+        self, subrequests: List[Tuple[str, Awaitable[List[Any]]]]
+    ) -> AsyncIterator[Tuple[int, List[Any]]]:
+        """
+        Run a cycle's sub-requests (feeds, regions, queries) concurrently,
+        at most MAX_CONCURRENT_REQUESTS at a time, each under SUBREQUEST_TIMEOUT,
+        yielding (position in `subrequests`, result) as each one finishes.
+        A failed or timed-out sub-request yields an empty list instead of
+        failing the cycle.
+        """
+        semaphore = asyncio.Semaphore(max(1, self.MAX_CONCURRENT_REQUESTS))
+
+        async def _run(pos: int, label: str, aw: Awaitable[List[Any]]) -> Tuple[int, List[Any]]:
+            try:
+                async with semaphore:
+                    try:
+                        return pos, await asyncio.wait_for(aw, timeout=self.SUBREQUEST_TIMEOUT) or []
+                    except asyncio.TimeoutError:
+                        print(f"[{type(self).__name__}] {label} timed out after {self.SUBREQUEST_TIMEOUT}s")
+                    except Exception as e:
+                        print(f"[{type(self).__name__}] {label} failed: {e}")
+                    return pos, []
+            finally:
+                if asyncio.iscoroutine(aw):
+                    aw.close()  # no-op once awaited; releases sub-requests cancelled before they started
+
+        tasks = [asyncio.ensure_future(_run(pos, label, aw)) for pos, (label, aw) in enumerate(subrequests)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer stopped early (or was cancelled) → don't leave requests running
+            for task in tasks:
+                task.cancel()
+
+    async def _fan_out(self, subrequests: List[Tuple[str, Awaitable[List[Any]]]]) -> List[List[Any]]:
+        """_fan_out_stream collected into a list in the order of `subrequests`"""
+        results: List[List[Any]] = [[] for _ in subrequests]
+        async for pos, result in self._fan_out_stream(subrequests):
+            results[pos] = result
+        return results
+
     def _make_signal(
         self,
         source_id: str,
@@ -5,10 +5,11 @@ Targets: r/all rising, popular/hot
 """
 import aiohttp
 import base64
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator
 from datetime import datetime, timezone
 
 from app.trend_detector.collectors.base import BaseCollector
+from app.trend_detector.http_client import http_client
 from app.trend_detector.config import (
     REDDIT_CLIENT_ID,
     REDDIT_CLIENT_SECRET,
@@ -69,94 +70,95 @@ class RedditCollector(BaseCollector):
             self._token_expires_at = datetime.now(timezone.utc) + timedelta(seconds=result.get("expires_in", 3600) - 60)
             return self._access_token
 
-    async def collect(self) -> List[Dict[str, Any]]:
-        """Collect trending posts from Reddit"""
+    async def _fetch_feed(self, session: aiohttp.ClientSession, headers: dict, feed: str) -> List[Dict[str, Any]]:
+        """Fetch one listing feed → raw post children"""
+        url = f"{self.BASE_URL}{feed}?limit={self.LIMIT_PER_FEED}"
+        async with session.get(url, headers=headers) as resp:
+            if resp.status != 200:
+                print(f"[RedditCollector] Failed to fetch {feed}: {resp.status}")
+                return []
+            data = await resp.json()
+            return data.get("data", {}).get("children", [])
+
+    async def collect_stream(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Trending posts from Reddit, one micro-batch per feed"""
         if not self.is_configured():
             print("[RedditCollector] Not configured — skipping (add REDDIT_CLIENT_ID and REDDIT_CLIENT_SECRET to .env)")
-            return []
+            return
 
-        signals = []
         seen_ids = set()
 
-        async with aiohttp.ClientSession() as session:
-            token = await self._authenticate(session)
-
-            headers = {
-                "Authorization": f"Bearer {token}",
-                "User-Agent": REDDIT_USER_AGENT,
-            }
-
-            for feed in self.FEEDS:
-                try:
-                    url = f"{self.BASE_URL}{feed}?limit={self.LIMIT_PER_FEED}"
-                    async with session.get(url, headers=headers) as resp:
-                        if resp.status != 200:
-                            print(f"[RedditCollector] Failed to fetch {feed}: {resp.status}")
-                            continue
-
-                        data = await resp.json()
-                        posts = data.get("data", {}).get("children", [])
-
-                        for post in posts:
-                            post_data = post.get("data", {})
-                            post_id = post_data.get("id", "")
-
-                            # Skip duplicates across feeds
-                            if post_id in seen_ids:
-                                continue
-                            seen_ids.add(post_id)
-
-                            # Determine if post has media
-                            has_media = False
-                            media_url = None
-
-                            if post_data.get("is_video"):
-                                has_media = True
-                                media_url = post_data.get("url")
-                            elif post_data.get("post_hint") == "image":
-                                has_media = True
-                                media_url = post_data.get("url")
-                            elif post_data.get("thumbnail", "").startswith("http"):
-                                has_media = True
-                                media_url = post_data.get("thumbnail")
-
-                            # Parse published time
-                            created_utc = post_data.get("created_utc")
-                            published_at = None
-                            if created_utc:
-                                published_at = datetime.fromtimestamp(
-                                    created_utc, tz=timezone.utc
-                                )
-
-                            signal = self._make_signal(
-                                source_id=post_id,
-                                title=post_data.get("title", ""),
-                                content=post_data.get("selftext", ""),
-                                url=f"https://reddit.com{post_data.get('permalink', '')}",
-                                media_url=media_url,
-                                keywords=post_data.get("subreddit", ""),
-                                author=post_data.get("author", ""),
-                                published_at=published_at,
-                                views=post_data.get("view_count") or 0,
-                                likes=post_data.get("ups", 0),
-                                reshares=post_data.get("num_crossposts", 0),
-                                comments=post_data.get("num_comments", 0),
-                                has_media=has_media,
-                                raw_data={
-                                    "subreddit": post_data.get("subreddit"),
-                                    "subreddit_subscribers": post_data.get("subreddit_subscribers"),
-                                    "upvote_ratio": post_data.get("upvote_ratio"),
-                                    "domain": post_data.get("domain"),
-                                    "link_flair_text": post_data.get("link_flair_text"),
-                                    "over_18": post_data.get("over_18"),
-                                    "feed": feed,
-                                },
-                            )
-                            signals.append(signal)
-
-                except Exception as e:
-                    print(f"[RedditCollector] Error fetching {feed}: {e}")
-                    continue
-
-        print(f"[RedditCollector] Collected {len(signals)} signals")
-        return signals
+        session = http_client.session()
+        token = await self._authenticate(session)
+
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "User-Agent": REDDIT_USER_AGENT,
+        }
+
+        async for pos, posts in self._fan_out_stream([
+            (feed, self._fetch_feed(session, headers, feed)) for feed in self.FEEDS
+        ]):
+            feed = self.FEEDS[pos]
+            signals = []
+            try:
+                for post in posts:
+                    post_data = post.get("data", {})
+                    post_id = post_data.get("id", "")
+
+                    # Skip duplicates across feeds
+                    if post_id in seen_ids:
+                        continue
+                    seen_ids.add(post_id)
+
+                    # Determine if post has media
+                    has_media = False
+                    media_url = None
+
+                    if post_data.get("is_video"):
+                        has_media = True
+                        media_url = post_data.get("url")
+                    elif post_data.get("post_hint") == "image":
+                        has_media = True
+                        media_url = post_data.get("url")
+                    elif post_data.get("thumbnail", "").startswith("http"):
+                        has_media = True
+                        media_url = post_data.get("thumbnail")
+
+                    # Parse published time
+                    created_utc = post_data.get("created_utc")
+                    published_at = None
+                    if created_utc:
+                        published_at = datetime.fromtimestamp(
+                            created_utc, tz=timezone.utc
+                        )
+
+                    signal = self._make_signal(
+                        source_id=post_id,
+                        title=post_data.get("title", ""),
+                        content=post_data.get("selftext", ""),
+                        url=f"https://reddit.com{post_data.get('permalink', '')}",
+                        media_url=media_url,
+                        keywords=post_data.get("subreddit", ""),
+                        author=post_data.get("author", ""),
+                        published_at=published_at,
+                        views=post_data.get("view_count") or 0,
+                        likes=post_data.get("ups", 0),
+                        reshares=post_data.get("num_crossposts", 0),
+                        comments=post_data.get("num_comments", 0),
+                        has_media=has_media,
+                        raw_data={
+                            "subreddit": post_data.get("subreddit"),
+                            "subreddit_subscribers": post_data.get("subreddit_subscribers"),
+                            "upvote_ratio": post_data.get("upvote_ratio"),
+                            "domain": post_data.get("domain"),
+                            "link_flair_text": post_data.get("link_flair_text"),
+                            "over_18": post_data.get("over_18"),
+                            "feed": feed,
+                        },
+                    )
+                    signals.append(signal)
+            except Exception as e:
+                print(f"[RedditCollector] Error parsing {feed}: {e}")
+            if signals:
+                yield signals
@@ -3,10 +3,11 @@ TikTok Collector
 Collects trending content from TikTok via third-party API (RapidAPI or Apify).
 """
 import aiohttp
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator
 from datetime import datetime, timezone
 
 from app.trend_detector.collectors.base import BaseCollector
+from app.trend_detector.http_client import http_client
 from app.trend_detector.config import TIKTOK_API_KEY, TIKTOK_API_PROVIDER
 
 
@@ -19,18 +20,21 @@ class TikTokCollector(BaseCollector):
 
     LIMIT = 30
 
+    # Trending feed regions — fetched concurrently, merged by video id
+    REGIONS = ["SA"]
+
     def is_configured(self) -> bool:
         return bool(TIKTOK_API_KEY)
 
-    async def _collect_rapidapi(self, session: aiohttp.ClientSession) -> List[Dict[str, Any]]:
-        """Collect trending TikTok videos via RapidAPI"""
+    async def _collect_rapidapi(self, session: aiohttp.ClientSession, region: str = "SA") -> List[Dict[str, Any]]:
+        """Collect trending TikTok videos for one region via RapidAPI"""
         headers = {
             "X-RapidAPI-Key": TIKTOK_API_KEY,
             "X-RapidAPI-Host": self.RAPIDAPI_HOST,
         }
         params = {
             "count": self.LIMIT,
-            "region": "SA",  # Saudi Arabia
+            "region": region,
         }
 
         signals = []
@@ -108,18 +112,25 @@ class TikTokCollector(BaseCollector):
 
         return signals
 
-    async def collect(self) -> List[Dict[str, Any]]:
-        """Collect trending TikTok content"""
+    async def collect_stream(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Trending TikTok content, one micro-batch per region"""
         if not self.is_configured():
             print("[TikTokCollector] Not configured — skipping (add TIKTOK_API_KEY to .env)")
-            return []
-
-        async with aiohttp.ClientSession() as session:
-            if TIKTOK_API_PROVIDER == "rapidapi":
-                signals = await self._collect_rapidapi(session)
-            else:
-                print(f"[TikTokCollector] Unknown provider: {TIKTOK_API_PROVIDER}")
-                signals = []
-
-        print(f"[TikTokCollector] Collected {len(signals)} signals")
-        return signals
+            return
+
+        if TIKTOK_API_PROVIDER != "rapidapi":
+            print(f"[TikTokCollector] Unknown provider: {TIKTOK_API_PROVIDER}")
+            return
+
+        session = http_client.session()
+        seen_ids = set()
+        async for _, region_signals in self._fan_out_stream([
+            (f"region {region}", self._collect_rapidapi(session, region)) for region in self.REGIONS
+        ]):
+            batch = []
+            for signal in region_signals:
+                if signal["source_id"] not in seen_ids:
+                    seen_ids.add(signal["source_id"])
+                    batch.append(signal)
+            if batch:
+                yield batch
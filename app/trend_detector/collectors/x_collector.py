@@ -4,10 +4,11 @@ Collects trending/viral content from X using a custom API server.
 Endpoints: POST /api/search, GET /api/top_posts
 """
 import aiohttp
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator
 from datetime import datetime, timezone
 
 from app.trend_detector.collectors.base import BaseCollector
+from app.trend_detector.http_client import http_client
 from app.trend_detector.config import X_API_SERVER_URL
 
 
@@ -26,6 +27,7 @@ class XCollector(BaseCollector):
     TOP_POSTS_COUNTRIES = ["SAU", "ar"]
 
     REQUEST_TIMEOUT = 120  # seconds
+    SUBREQUEST_TIMEOUT = REQUEST_TIMEOUT + 10
 
     def is_configured(self) -> bool:
         return bool(X_API_SERVER_URL)
@@ -130,33 +132,29 @@ class XCollector(BaseCollector):
             },
         )
 
-    async def collect(self) -> List[Dict[str, Any]]:
-        """Collect trending tweets from X via custom API"""
+    async def collect_stream(self) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Trending tweets from X via custom API, one micro-batch per search / top-posts request"""
         if not self.is_configured():
             print("[XCollector] Not configured — skipping (add X_API_SERVER_URL to .env)")
-            return []
+            return
 
-        signals = []
         seen_ids = set()
 
-        async with aiohttp.ClientSession() as session:
-            # 1. Search queries
-            for query_config in self.SEARCH_QUERIES:
-                tweets = await self._search_tweets(session, query_config)
-                for tweet in tweets:
-                    tid = tweet.get("tweet_id", "")
-                    if tid and tid not in seen_ids:
-                        seen_ids.add(tid)
-                        signals.append(self._parse_tweet(tweet, f"search:{query_config['query']}"))
-
-            # 2. Creator Studio top posts
-            for country in self.TOP_POSTS_COUNTRIES:
-                tweets = await self._get_top_posts(session, country)
-                for tweet in tweets:
-                    tid = tweet.get("tweet_id", "")
-                    if tid and tid not in seen_ids:
-                        seen_ids.add(tid)
-                        signals.append(self._parse_tweet(tweet, f"top_posts:{country}"))
-
-        print(f"[XCollector] Collected {len(signals)} signals")
-        return signals
+        session = http_client.session()
+        # 1. Search queries + 2. Creator Studio top posts, all in flight together
+        subrequests = [
+            (f"search:{q['query']}", self._search_tweets(session, q)) for q in self.SEARCH_QUERIES
+        ] + [
+            (f"top_posts:{country}", self._get_top_posts(session, country)) for country in self.TOP_POSTS_COUNTRIES
+        ]
+
+        async for pos, tweets in self._fan_out_stream(subrequests):
+            source = subrequests[pos][0]
+            batch = []
+            for tweet in tweets:
+                tid = tweet.get("tweet_id", "")
+                if tid and tid not in seen_ids:
+                    seen_ids.add(tid)
+                    batch.append(self._parse_tweet(tweet, source))
+            if batch:
+                yield batch
@@ -0,0 +1,54 @@
+"""
+Concurrency helpers
+Bounded fan-out and per-host request budgets for pipeline stages that call external APIs.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Deque, Dict, Iterable, List, TypeVar
+from urllib.parse import urlsplit
+
+T = TypeVar("T")
+
+
+async def bounded_gather(aws: Iterable[Awaitable[T]], limit: int) -> List[T]:
+    """
+    Like asyncio.gather, but at most `limit` awaitables run at once.
+    Results keep the input order.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def _run(aw: Awaitable[T]) -> T:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(_run(aw) for aw in aws))
+
+
+class RateBudget:
+    """
+    Sliding-window request budget per host: at most `max_requests` requests
+    may start within any `per_seconds` window. Callers over budget wait.
+    """
+
+    def __init__(self, max_requests: int, per_seconds: float = 60.0):
+        self.max_requests = max(1, max_requests)
+        self.per_seconds = per_seconds
+        self._starts: Dict[str, Deque[float]] = {}
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return urlsplit(url).netloc or url
+
+    async def acquire(self, url: str):
+        """Wait until the host of `url` has budget left, then spend one request"""
+        starts = self._starts.setdefault(self._host(url), deque())
+        while True:
+            now = time.monotonic()
+            while starts and now - starts[0] >= self.per_seconds:
+                starts.popleft()
+            # No await between the check and the append, so this is race-free on one event loop
+            if len(starts) < self.max_requests:
+                starts.append(now)
+                return
+            await asyncio.sleep(self.per_seconds - (now - starts[0]))
@@ -26,6 +26,7 @@ GOOGLE_VISION_API_KEY = os.getenv("GOOGLE_VISION_API_KEY", "")
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4")
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")  # Any OpenAI-compatible endpoint
 
 
 # =============================================================================
@@ -38,12 +39,36 @@ COLLECTOR_INTERVALS = {
     "tiktok": 60,
 }
 
+# Parallel upstream requests per collector cycle (feeds / regions / queries)
+COLLECTOR_CONCURRENCY = int(os.getenv("COLLECTOR_CONCURRENCY", "4"))
+
+# Streaming pipeline (scheduler/streaming.py): stages overlap on micro-batches
+PIPELINE_BATCH_SIZE = 50        # Max signals per micro-batch handed to the next stage
+PIPELINE_QUEUE_SIZE = 4         # Micro-batches buffered between two stages before the upstream one waits
+DB_EXECUTOR_WORKERS = int(os.getenv("DB_EXECUTOR_WORKERS", "1"))  # Threads for blocking DB work (0 = inline on the event loop)
+
+# Pipeline metrics (app/trend_detector/metrics.py, GET /api/trends/pipeline/metrics)
+PIPELINE_METRICS_WINDOW = 100                                # Runs per platform kept for percentiles / histograms
+PIPELINE_METRICS_BUCKETS = (0.1, 0.5, 1, 5, 15, 60, 300)     # Histogram upper bounds in seconds (+ overflow)
+
+# Shared HTTP client (app/trend_detector/http_client.py)
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))                  # Open connections across all hosts
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "10")) # Keep ≥ VALIDATION/COLLECTOR concurrency
+HTTP_DNS_CACHE_TTL = 300        # seconds
+HTTP_KEEPALIVE_TIMEOUT = 60     # seconds an idle pooled connection is kept open
+
 # Watchlist re-check interval (minutes)
 WATCHLIST_CHECK_INTERVAL = 15
 
 # Max re-checks before EARLY signal expires
 WATCHLIST_MAX_CHECKS = 6
 
+# Re-check cycle time box (seconds) — entries not reached stay due for the next cycle
+WATCHLIST_RECHECK_TIME_BUDGET = 300
+
+# Re-check priority = score × 0.5 ^ (hours since the candidate last changed / half-life)
+WATCHLIST_PRIORITY_HALF_LIFE_HOURS = 6
+
 
 # =============================================================================
 # Scoring Weights
@@ -113,6 +138,28 @@ VALIDATION_THRESHOLDS = {
 }
 
 
+# =============================================================================
+# Media Analysis (Google Vision)
+# =============================================================================
+VISION_BATCH_SIZE = 16         # Images per images:annotate request (API maximum is 16)
+VISION_CONCURRENCY = 4         # annotate requests in flight at once
+VISION_CACHE_TTL = 6 * 3600    # seconds a result stays in the in-process tier (td_media_analysis keeps it for good)
+
+
+# =============================================================================
+# X Validation Throughput
+# =============================================================================
+MAX_VALIDATIONS_PER_BATCH = int(os.getenv("MAX_VALIDATIONS_PER_BATCH", "15"))   # Candidates validated per cycle
+VALIDATION_CONCURRENCY = int(os.getenv("VALIDATION_CONCURRENCY", "4"))          # Parallel searches (1 = sequential)
+X_API_REQUESTS_PER_MINUTE = int(os.getenv("X_API_REQUESTS_PER_MINUTE", "30"))   # Request budget for the X API server host
+
+# Search results cached by normalized query — must stay below WATCHLIST_CHECK_INTERVAL
+# so a watchlist re-check always sees fresh activity
+VALIDATION_CACHE_TTL = int(os.getenv("VALIDATION_CACHE_TTL", "600"))            # seconds
+VALIDATION_CACHE_MAX_ENTRIES = 2048
+VALIDATION_CACHE_REDIS = os.getenv("VALIDATION_CACHE_REDIS", "false").lower() == "true"
+
+
 # =============================================================================
 # Classifier Categories
 # =============================================================================
@@ -131,8 +178,71 @@ CLASSIFIER_CATEGORIES = [
 
 SENSITIVITY_LEVELS = ["low", "medium", "high", "critical"]
 
+# Throughput
+CLASSIFIER_CONCURRENCY = int(os.getenv("CLASSIFIER_CONCURRENCY", "4"))   # LLM requests in flight at once
+# Candidates packed into one prompt (1 = one request per candidate)
+CLASSIFIER_BATCH_SIZE = int(os.getenv("CLASSIFIER_BATCH_SIZE", "1"))
+
+# Resurfacing stories reuse an earlier classification instead of a new LLM call
+CLASSIFICATION_CACHE_TTL = int(os.getenv("CLASSIFICATION_CACHE_TTL", str(24 * 3600)))   # seconds
+CLASSIFICATION_CACHE_MAX_ENTRIES = 4096
+CLASSIFICATION_CACHE_SIMILARITY = 0.8   # Title-token Jaccard for a near-duplicate hit
+
 
 # =============================================================================
 # Deduplication
 # =============================================================================
-DEDUP_SIMILARITY_THRESHOLD = 0.75  # Cosine similarity threshold for merging
+DEDUP_SIMILARITY_THRESHOLD = 0.75  # Estimated Jaccard (MinHash/LSH) at which the "minhash" strategy merges
+
+# Fuzzy-match strategy used by the Deduplicator:
+#   "jaccard" — inverted token index + exact word-overlap ratio (threshold 0.6)
+#   "minhash" — MinHash signatures over Arabic-normalized word shingles, banded LSH
+#               (estimated Jaccard, threshold = DEDUP_SIMILARITY_THRESHOLD)
+#   "vector"  — hashed character n-gram TF-IDF, batch cosine in NumPy
+#               (threshold = DEDUP_VECTOR_THRESHOLD)
+DEDUP_STRATEGY = os.getenv("DEDUP_STRATEGY", "jaccard")
+
+DEDUP_MINHASH_PERMUTATIONS = 128   # Signature length (hash functions)
+DEDUP_MINHASH_SHINGLE_SIZE = 1     # Words per shingle — bigrams are too order-sensitive for rephrased titles
+
+DEDUP_VECTOR_DIM = 2048            # Hashed feature columns (float32 → 8KB per active candidate)
+DEDUP_VECTOR_NGRAM = 3             # Character n-gram size
+DEDUP_VECTOR_THRESHOLD = 0.4       # Cosine — best F1 on benchmarks/data/signal_corpus.jsonl
+
+
+# =============================================================================
+# Retention & Archive (app/trend_detector/retention/)
+# =============================================================================
+# Tier 1: raw_data payloads leave the DB after this many days
+#         (td_signals → archive files, td_x_validation → dropped)
+RETENTION_RAW_DATA_DAYS = int(os.getenv("RETENTION_RAW_DATA_DAYS", "7"))
+
+# Tier 2: signals older than this move to the archive — only once their candidate has
+#         also been quiet this long (candidates keep their totals; membership rows stay)
+RETENTION_SIGNAL_DAYS = int(os.getenv("RETENTION_SIGNAL_DAYS", "30"))
+
+# Date-partitioned JSONL.gz files: <ARCHIVE_DIR>/signals/YYYY/MM/DD.jsonl.gz
+ARCHIVE_DIR = os.getenv(
+    "TREND_ARCHIVE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "trend_archive"),
+)
+
+RETENTION_BATCH_SIZE = 2000         # Rows archived / stripped per transaction
+RETENTION_VACUUM_PAGES = 5000       # Free pages returned to the OS per run (PRAGMA incremental_vacuum)
+RETENTION_INTERVAL_HOURS = 24       # Scheduler job interval
+
+# =============================================================================
+# Language tagging (app/utils/text.detect_language → td_signals / td_candidates.lang)
+# =============================================================================
+LANG_BACKFILL_BATCH_SIZE = 2000     # Rows tagged per transaction by the backfill of pre-tagging rows
+
+# =============================================================================
+# Statistics (td_stats counters — app/trend_detector/stats.py)
+# =============================================================================
+STATS_HOURLY_KEEP_HOURS = 48        # Per-hour signal buckets kept for the "last 24h" window
+
+# =============================================================================
+# Listing pagination (app/trend_detector/pagination.py)
+# =============================================================================
+LISTING_TOTAL_CACHE_TTL = int(os.getenv("LISTING_TOTAL_CACHE_TTL", "60"))   # seconds a total=cached count is reused
+LISTING_TOTAL_CACHE_MAX_ENTRIES = 512   # Distinct endpoint + filter combinations kept
@@ -0,0 +1,59 @@
+"""
+DB Executor
+Runs the trend pipeline's synchronous SQLAlchemy work (normalize, dedup, score,
+verdict/classification writes, watchlist bookkeeping) on a dedicated thread pool
+so a pipeline run never blocks the event loop shared with FastAPI and /ws/chat.
+
+  - DB_EXECUTOR_WORKERS threads (default 1: SQLite has one writer anyway)
+  - the loop still runs DB work of its own (validator verdicts, watchlist checks), so
+    in-process state is not single-threaded: the dedup indexes are only read and
+    changed under candidate_index.index_lock (Candidate.status changes are queued and
+    applied by the next Deduplicator.process), and ClassificationCache is only
+    touched on the loop (its rows are queried here, then warmed on the loop)
+  - workers = 0 runs the work inline on the event loop (debugging, benchmarks)
+  - shut down by TrendDetectorScheduler.stop()
+
+A session handed to the executor must not be used on the loop at the same time;
+pipeline stages own one session each and await every call.
+"""
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from app.trend_detector.config import DB_EXECUTOR_WORKERS
+
+T = TypeVar("T")
+
+
+class DBExecutor:
+    """Lazily created thread pool for blocking DB calls"""
+
+    def __init__(self, workers: int = DB_EXECUTOR_WORKERS):
+        self.workers = workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="td-db")
+        return self._pool
+
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Run fn(*args, **kwargs) on the DB thread and await its result (in the caller's context)"""
+        if self.workers <= 0:
+            return fn(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()   # keeps the current metrics stage
+        return await loop.run_in_executor(self._get_pool(), functools.partial(context.run, fn, *args, **kwargs))
+
+    def shutdown(self):
+        """Finish queued work and stop the threads (safe to call more than once)"""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+            print("[DBExecutor] Shut down")
+
+
+# Process-wide singleton
+db_executor = DBExecutor()
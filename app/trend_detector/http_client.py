@@ -0,0 +1,115 @@
+"""
+Shared HTTP Client
+One process-wide aiohttp.ClientSession for every collector, validator, classifier
+and vision call, backed by a single pooled TCPConnector:
+  - keep-alive connection pool per upstream host (HTTP_POOL_LIMIT_PER_HOST)
+  - DNS results cached for HTTP_DNS_CACHE_TTL seconds
+  - closed by TrendDetectorScheduler.stop()
+
+Request / new-connection / reused-connection counts are tracked per host with an
+aiohttp TraceConfig and reported by stats(); requests and failures (exception or
+HTTP status >= 400) are also counted against the running pipeline stage (metrics).
+"""
+import asyncio
+from typing import Dict, Optional
+
+import aiohttp
+
+from app.trend_detector.metrics import record_call, record_error
+from app.trend_detector.config import (
+    HTTP_POOL_LIMIT,
+    HTTP_POOL_LIMIT_PER_HOST,
+    HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+)
+
+
+class HTTPClientRegistry:
+    """Lazily created shared ClientSession with connection reuse accounting"""
+
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._by_host: Dict[str, Dict[str, int]] = {}
+        self._dns = {"hits": 0, "misses": 0}
+
+    def _host_stats(self, host: str) -> Dict[str, int]:
+        return self._by_host.setdefault(host or "unknown", {"requests": 0, "connections_created": 0, "connections_reused": 0})
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            ctx.host = params.url.host
+            self._host_stats(ctx.host)["requests"] += 1
+            record_call()
+
+        async def on_request_end(session, ctx, params):
+            if params.response.status >= 400:
+                record_error()
+
+        async def on_request_exception(session, ctx, params):
+            record_error()
+
+        async def on_connection_create_end(session, ctx, params):
+            self._host_stats(getattr(ctx, "host", None))["connections_created"] += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            self._host_stats(getattr(ctx, "host", None))["connections_reused"] += 1
+
+        async def on_dns_cache_hit(session, ctx, params):
+            self._dns["hits"] += 1
+
+        async def on_dns_cache_miss(session, ctx, params):
+            self._dns["misses"] += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_end.append(on_request_end)
+        trace.on_request_exception.append(on_request_exception)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace
+
+    def session(self) -> aiohttp.ClientSession:
+        """
+        The shared session — must be called from inside the event loop.
+        Re-created if it was closed or belongs to a different (finished) loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=HTTP_POOL_LIMIT,
+                limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+                ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            )
+            self._session = aiohttp.ClientSession(connector=connector, trace_configs=[self._trace_config()])
+            self._loop = loop
+        return self._session
+
+    async def close(self):
+        """Close the pooled connections (safe to call more than once)"""
+        session, self._session, self._loop = self._session, None, None
+        if session is not None and not session.closed:
+            await session.close()
+            stats = self.stats()
+            print(f"[HTTPClient] Closed — {stats['connections_reused']} of {stats['requests']} requests reused a connection")
+
+    def stats(self) -> Dict:
+        totals = {"requests": 0, "connections_created": 0, "connections_reused": 0}
+        for host_stats in self._by_host.values():
+            for k in totals:
+                totals[k] += host_stats[k]
+        return {
+            **totals,
+            "reuse_ratio": round(totals["connections_reused"] / totals["requests"], 3) if totals["requests"] else 0.0,
+            "dns_cache_hits": self._dns["hits"],
+            "dns_cache_misses": self._dns["misses"],
+            "by_host": {host: dict(s) for host, s in self._by_host.items()},
+        }
+
+
+# Process-wide singleton
+http_client = HTTPClientRegistry()
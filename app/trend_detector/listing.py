@@ -0,0 +1,59 @@
+"""
+Candidate Listing Queries
+Set-based loading of what candidate listings show next to each candidate — its latest
+classification and latest X validation — so a page costs a constant number of queries
+(the page itself + one IN batch per related table) instead of one lookup per row.
+
+Shared by the trend API listing endpoints (search, candidates, hot) and TrendAgent.
+"""
+from typing import Dict, Iterable, List, NamedTuple, Optional, Type
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, defer
+
+from app.trend_detector.models import Candidate, Classification, XValidation
+
+
+# candidate ids per IN (...) lookup — keeps us under SQLite's bound-parameter limit
+IN_BATCH_SIZE = 400
+
+
+class CandidateRow(NamedTuple):
+    """A candidate with everything a listing serializes next to it"""
+    candidate: Candidate
+    classification: Optional[Classification]
+    validation: Optional[XValidation]
+
+
+def _latest_by_candidate(model: Type, candidate_ids: List[int], db: Session, *options) -> Dict[int, object]:
+    """Newest row of `model` per candidate — one query per IN batch"""
+    latest = {}
+    for i in range(0, len(candidate_ids), IN_BATCH_SIZE):
+        chunk = candidate_ids[i:i + IN_BATCH_SIZE]
+        newest_ids = (
+            select(func.max(model.id))
+            .where(model.candidate_id.in_(chunk))
+            .group_by(model.candidate_id)
+        )
+        for row in db.query(model).options(*options).filter(model.id.in_(newest_ids)).all():
+            latest[row.candidate_id] = row
+    return latest
+
+
+def latest_classifications(candidate_ids: Iterable[int], db: Session) -> Dict[int, Classification]:
+    return _latest_by_candidate(Classification, list(set(candidate_ids)), db)
+
+
+def latest_validations(candidate_ids: Iterable[int], db: Session) -> Dict[int, XValidation]:
+    # raw_data (full search results) is never shown in listings
+    return _latest_by_candidate(XValidation, list(set(candidate_ids)), db, defer(XValidation.raw_data))
+
+
+def with_related(candidates: List[Candidate], db: Session, validations: bool = True) -> List[CandidateRow]:
+    """Attach latest classification (and validation) to a page of candidates, order preserved"""
+    ids = [c.id for c in candidates]
+    if not ids:
+        return []
+    classifications = latest_classifications(ids, db)
+    validation_map = latest_validations(ids, db) if validations else {}
+    return [CandidateRow(c, classifications.get(c.id), validation_map.get(c.id)) for c in candidates]
@@ -2,12 +2,30 @@
 Vision Analyzer
 Analyzes media (images) using Google Cloud Vision API to extract text and labels.
 Runs as a pre-filter before normalization: signals with media get their media_text populated.
-"""
-import aiohttp
-import base64
-from typing import List, Dict, Any
 
-from app.trend_detector.config import GOOGLE_VISION_API_KEY
+Images of a cycle are de-duplicated by URL, looked up in the result cache
+(in-process TTLCache, then the td_media_analysis table), and only the misses are
+sent — VISION_BATCH_SIZE images per images:annotate call, VISION_CONCURRENCY
+calls at a time.
+"""
+import hashlib
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional
+
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.trend_detector.cache import TTLCache
+from app.trend_detector.concurrency import bounded_gather
+from app.trend_detector.db_executor import db_executor
+from app.trend_detector.config import (
+    GOOGLE_VISION_API_KEY,
+    VISION_BATCH_SIZE,
+    VISION_CONCURRENCY,
+    VISION_CACHE_TTL,
+)
+from app.trend_detector.http_client import http_client
+from app.trend_detector.models import MediaAnalysis
 
 
 class VisionAnalyzer:
@@ -15,95 +33,174 @@ class VisionAnalyzer:
 
     VISION_URL = "https://vision.googleapis.com/v1/images:annotate"
 
+    # (media_url → media_text) for every worker in this process; td_media_analysis persists it
+    result_cache = TTLCache("td:vision", ttl_seconds=VISION_CACHE_TTL, max_entries=8192)
+
     def is_configured(self) -> bool:
         return bool(GOOGLE_VISION_API_KEY)
 
-    async def analyze_image_url(self, image_url: str) -> str:
+    @staticmethod
+    def _url_hash(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _build_request(self, image_url: str) -> dict:
+        return {
+            "image": {"source": {"imageUri": image_url}},
+            "features": [
+                {"type": "TEXT_DETECTION", "maxResults": 5},
+                {"type": "LABEL_DETECTION", "maxResults": 10},
+            ],
+        }
+
+    def _parse_result(self, result: dict) -> Optional[str]:
+        """Extracted text + labels as a combined string, or None if Vision failed on this image"""
+        if result.get("error"):
+            return None
+
+        parts = []
+
+        # Extract text
+        text_annotations = result.get("textAnnotations", [])
+        if text_annotations:
+            full_text = text_annotations[0].get("description", "")
+            if full_text:
+                parts.append(full_text.strip())
+
+        # Extract labels
+        label_annotations = result.get("labelAnnotations", [])
+        labels = [
+            label.get("description", "")
+            for label in label_annotations
+            if label.get("score", 0) > 0.7
+        ]
+        if labels:
+            parts.append("Labels: " + ", ".join(labels))
+
+        return " | ".join(parts) if parts else ""
+
+    async def analyze_batch(self, image_urls: List[str]) -> Dict[str, Optional[str]]:
         """
-        Analyze an image by URL using Google Vision API.
-        Returns extracted text + labels as a combined string.
+        Analyze up to VISION_BATCH_SIZE images in one images:annotate call.
+        Returns {url: media_text}; None marks images that failed (not cached).
         """
-        if not self.is_configured() or not image_url:
-            return ""
+        if not self.is_configured() or not image_urls:
+            return {}
 
-        payload = {
-            "requests": [
-                {
-                    "image": {"source": {"imageUri": image_url}},
-                    "features": [
-                        {"type": "TEXT_DETECTION", "maxResults": 5},
-                        {"type": "LABEL_DETECTION", "maxResults": 10},
-                    ],
-                }
-            ]
-        }
+        payload = {"requests": [self._build_request(url) for url in image_urls]}
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.VISION_URL}?key={GOOGLE_VISION_API_KEY}",
-                    json=payload,
-                ) as resp:
-                    if resp.status != 200:
-                        print(f"[VisionAnalyzer] API error: {resp.status}")
-                        return ""
-
-                    data = await resp.json()
-                    responses = data.get("responses", [])
-                    if not responses:
-                        return ""
-
-                    result = responses[0]
-                    parts = []
-
-                    # Extract text
-                    text_annotations = result.get("textAnnotations", [])
-                    if text_annotations:
-                        full_text = text_annotations[0].get("description", "")
-                        if full_text:
-                            parts.append(full_text.strip())
-
-                    # Extract labels
-                    label_annotations = result.get("labelAnnotations", [])
-                    labels = [
-                        label.get("description", "")
-                        for label in label_annotations
-                        if label.get("score", 0) > 0.7
-                    ]
-                    if labels:
-                        parts.append("Labels: " + ", ".join(labels))
-
-                    return " | ".join(parts) if parts else ""
+            async with http_client.session().post(
+                f"{self.VISION_URL}?key={GOOGLE_VISION_API_KEY}",
+                json=payload,
+            ) as resp:
+                if resp.status != 200:
+                    print(f"[VisionAnalyzer] API error: {resp.status}")
+                    return {url: None for url in image_urls}
+
+                data = await resp.json()
+                responses = data.get("responses", [])
+                return {
+                    url: self._parse_result(responses[i]) if i < len(responses) else None
+                    for i, url in enumerate(image_urls)
+                }
 
         except Exception as e:
-            print(f"[VisionAnalyzer] Error analyzing image: {e}")
-            return ""
+            print(f"[VisionAnalyzer] Error analyzing images: {e}")
+            return {url: None for url in image_urls}
 
-    async def process_signals(self, raw_signals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    async def analyze_image_url(self, image_url: str) -> str:
+        """
+        Analyze an image by URL using Google Vision API.
+        Returns extracted text + labels as a combined string.
+        """
+        if not image_url:
+            return ""
+        results = await self.analyze_batch([image_url])
+        return results.get(image_url) or ""
+
+    def _load_cached(self, urls: List[str], db: Optional[Session]) -> Dict[str, str]:
+        """Cached results for `urls` — in-process tier first, then one IN query on td_media_analysis"""
+        found = {}
+        for url in urls:
+            text = self.result_cache.get(url)
+            if text is not None:
+                found[url] = text
+
+        missing = {self._url_hash(url): url for url in urls if url not in found}
+        if db is not None and missing:
+            hashes = list(missing)
+            for i in range(0, len(hashes), 400):
+                rows = (
+                    db.query(MediaAnalysis.url_hash, MediaAnalysis.media_text)
+                    .filter(MediaAnalysis.url_hash.in_(hashes[i:i + 400]))
+                    .all()
+                )
+                for url_hash, text in rows:
+                    url = missing[url_hash]
+                    found[url] = text
+                    self.result_cache.set(url, text)
+        return found
+
+    def _store(self, results: Dict[str, str], db: Optional[Session]):
+        for url, text in results.items():
+            self.result_cache.set(url, text)
+        if db is None or not results:
+            return
+        now = datetime.now(timezone.utc)
+        db.execute(
+            sqlite_insert(MediaAnalysis).on_conflict_do_nothing(),
+            [
+                {"url_hash": self._url_hash(url), "media_url": url[:2000], "media_text": text, "analyzed_at": now}
+                for url, text in results.items()
+            ],
+        )
+        db.commit()
+
+    async def process_signals(self, raw_signals: List[Dict[str, Any]], db: Optional[Session] = None) -> List[Dict[str, Any]]:
         """
         Process a list of raw signal dicts.
         For signals with has_media=True and a media_url, analyze the image
         and populate media_text field.
-        
-        Signals without media pass through unchanged.
+
+        Signals without media pass through unchanged. With a db session, results
+        are persisted in td_media_analysis and reused across cycles and restarts.
         """
         if not self.is_configured():
             # Pass through without modification
             return raw_signals
 
+        targets = [
+            signal for signal in raw_signals
+            if signal.get("has_media") and signal.get("media_url") and not signal.get("media_text")
+            # Only analyze image URLs (skip video URLs)
+            and self._is_image_url(signal["media_url"])
+        ]
+        if not targets:
+            return raw_signals
+
+        urls = list(dict.fromkeys(signal["media_url"] for signal in targets))
+        texts = await db_executor.run(self._load_cached, urls, db)
+        cache_hits = len(texts)
+
+        misses = [url for url in urls if url not in texts]
+        batches = [misses[i:i + VISION_BATCH_SIZE] for i in range(0, len(misses), VISION_BATCH_SIZE)]
+        fresh: Dict[str, str] = {}
+        for batch_result in await bounded_gather((self.analyze_batch(b) for b in batches), VISION_CONCURRENCY):
+            fresh.update({url: text for url, text in batch_result.items() if text is not None})
+        await db_executor.run(self._store, fresh, db)
+        texts.update(fresh)
+
         analyzed_count = 0
-        for signal in raw_signals:
-            if signal.get("has_media") and signal.get("media_url") and not signal.get("media_text"):
-                media_url = signal["media_url"]
-                # Only analyze image URLs (skip video URLs)
-                if self._is_image_url(media_url):
-                    text = await self.analyze_image_url(media_url)
-                    if text:
-                        signal["media_text"] = text
-                        analyzed_count += 1
-
-        if analyzed_count:
-            print(f"[VisionAnalyzer] Analyzed {analyzed_count} images from {len(raw_signals)} signals")
+        for signal in targets:
+            text = texts.get(signal["media_url"])
+            if text:
+                signal["media_text"] = text
+                analyzed_count += 1
+
+        print(
+            f"[VisionAnalyzer] {len(targets)} images ({len(urls)} unique) → {analyzed_count} with text; "
+            f"{cache_hits} cache hits, {len(batches)} API calls (saved {len(targets) - len(batches)})"
+        )
 
         return raw_signals
 
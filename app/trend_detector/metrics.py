@@ -0,0 +1,246 @@
+"""
+Pipeline Metrics
+In-process registry of per-stage measurements for every pipeline run
+(StreamingPipeline cycles and the watchlist re-check):
+  - per stage and run: busy seconds, items in/out, upstream HTTP calls, upstream
+    errors, cache hits/misses
+  - per platform: a rolling window of the last PIPELINE_METRICS_WINDOW runs →
+    duration percentiles and a histogram over PIPELINE_METRICS_BUCKETS, plus
+    totals since process start
+
+The stage being measured lives in a ContextVar, so the shared HTTP client
+(calls / errors) and TTLCache (hits / misses) attribute their counts to it
+without the pipeline components knowing about metrics. Tasks started inside a
+stage and db_executor calls inherit it.
+
+Every finished run is also persisted as a td_pipeline_runs row (save_run).
+"""
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.trend_detector.config import PIPELINE_METRICS_BUCKETS, PIPELINE_METRICS_WINDOW
+from app.trend_detector.models import PipelineRun
+
+
+# Stages in pipeline order (the watchlist re-check is its own stage)
+STAGES = ("collect", "vision", "normalize", "dedup", "score", "validate", "classify", "watchlist")
+
+COUNTERS = ("batches", "items_in", "items_out", "calls", "errors", "cache_hits", "cache_misses")
+
+
+class StageStats:
+    """Counters of one stage within one run"""
+
+    __slots__ = ("seconds",) + COUNTERS
+
+    def __init__(self):
+        self.seconds = 0.0
+        for name in COUNTERS:
+            setattr(self, name, 0)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"seconds": round(self.seconds, 4), **{name: getattr(self, name) for name in COUNTERS}}
+
+
+_current_stage: ContextVar[Optional[StageStats]] = ContextVar("td_pipeline_stage", default=None)
+
+
+def record_call():
+    """One upstream request started in the current stage"""
+    stats = _current_stage.get()
+    if stats is not None:
+        stats.calls += 1
+
+
+def record_error():
+    """One failed upstream request (exception or HTTP error status) in the current stage"""
+    stats = _current_stage.get()
+    if stats is not None:
+        stats.errors += 1
+
+
+def record_cache(hit: bool):
+    """One cache lookup in the current stage"""
+    stats = _current_stage.get()
+    if stats is not None:
+        if hit:
+            stats.cache_hits += 1
+        else:
+            stats.cache_misses += 1
+
+
+class RunRecorder:
+    """Stage counters of one run, filled through stage() blocks"""
+
+    def __init__(self, platform: str):
+        self.platform = platform
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self.stages: Dict[str, StageStats] = {}
+        self.error: Optional[str] = None
+
+    @contextmanager
+    def stage(self, name: str, items_in: int = 0) -> Iterator[StageStats]:
+        """Time one unit of work of stage `name`; counts recorded inside go to it"""
+        stats = self.stages.setdefault(name, StageStats())
+        stats.batches += 1
+        stats.items_in += items_in
+        token = _current_stage.set(stats)
+        start = time.perf_counter()
+        try:
+            yield stats
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            stats.seconds += time.perf_counter() - start
+            _current_stage.reset(token)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+    def stage_summary(self) -> Dict[str, Dict[str, Any]]:
+        return {name: self.stages[name].as_dict() for name in STAGES if name in self.stages}
+
+
+def _percentile(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+def _distribution(values: Deque[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "mean": round(sum(ordered) / len(ordered), 4) if ordered else 0.0,
+        "p50": round(_percentile(ordered, 0.5), 4),
+        "p95": round(_percentile(ordered, 0.95), 4),
+        "max": round(ordered[-1], 4) if ordered else 0.0,
+    }
+
+
+def _histogram(values: Deque[float]) -> Dict[str, int]:
+    buckets = {f"le_{bound:g}": 0 for bound in PIPELINE_METRICS_BUCKETS}
+    buckets["inf"] = 0
+    for value in values:
+        for bound in PIPELINE_METRICS_BUCKETS:
+            if value <= bound:
+                buckets[f"le_{bound:g}"] += 1
+                break
+        else:
+            buckets["inf"] += 1
+    return buckets
+
+
+class PipelineMetrics:
+    """Rolling per-platform, per-stage aggregates of finished runs"""
+
+    def __init__(self, window: int = PIPELINE_METRICS_WINDOW):
+        self.window = window
+        self._platforms: Dict[str, Dict[str, Any]] = {}
+
+    def start(self, platform: str) -> RunRecorder:
+        return RunRecorder(platform)
+
+    def _platform(self, platform: str) -> Dict[str, Any]:
+        entry = self._platforms.get(platform)
+        if entry is None:
+            entry = {
+                "runs": 0,
+                "failed_runs": 0,
+                "seconds_total": 0.0,
+                "last_run_at": None,
+                "durations": deque(maxlen=self.window),
+                "stages": {},
+            }
+            self._platforms[platform] = entry
+        return entry
+
+    def finish(self, run: RunRecorder, summary: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Fold a finished run into the aggregates; returns its td_pipeline_runs record"""
+        duration = run.elapsed
+        entry = self._platform(run.platform)
+        entry["runs"] += 1
+        entry["failed_runs"] += 1 if run.error else 0
+        entry["seconds_total"] += duration
+        entry["last_run_at"] = run.started_at.isoformat()
+        entry["durations"].append(duration)
+
+        for name, stats in run.stages.items():
+            stage = entry["stages"].setdefault(name, {
+                "runs": 0,
+                "seconds_total": 0.0,
+                "durations": deque(maxlen=self.window),
+                **{counter: 0 for counter in COUNTERS},
+            })
+            stage["runs"] += 1
+            stage["seconds_total"] += stats.seconds
+            stage["durations"].append(stats.seconds)
+            for counter in COUNTERS:
+                stage[counter] += getattr(stats, counter)
+
+        summary = summary or {}
+        return {
+            "platform": run.platform,
+            "started_at": run.started_at,
+            "duration_s": round(duration, 3),
+            "raw_signals": summary.get("raw_signals", 0),
+            "new_signals": summary.get("new_signals", 0),
+            "candidates": summary.get("candidates", 0),
+            "hot": summary.get("hot", 0),
+            "classified": summary.get("classified", 0),
+            "first_hot_after_s": summary.get("first_hot_after_s"),
+            "error": run.error,
+            "stages": run.stage_summary(),
+        }
+
+    def snapshot(self, platform: Optional[str] = None) -> Dict[str, Any]:
+        """Aggregates per platform (one platform if given) — durations over the rolling window"""
+        result = {}
+        for name, entry in self._platforms.items():
+            if platform and name != platform:
+                continue
+            stages = {}
+            for stage_name in STAGES:
+                stage = entry["stages"].get(stage_name)
+                if stage is None:
+                    continue
+                seconds = _distribution(stage["durations"])
+                lookups = stage["cache_hits"] + stage["cache_misses"]
+                stages[stage_name] = {
+                    "runs": stage["runs"],
+                    "seconds": {**seconds, "total": round(stage["seconds_total"], 3)},
+                    "histogram": _histogram(stage["durations"]),
+                    # Busy time as a share of total run time — where the cycle budget goes
+                    # (stages overlap, so shares can add up to more than 1)
+                    "share_of_run": round(stage["seconds_total"] / entry["seconds_total"], 3) if entry["seconds_total"] else 0.0,
+                    **{counter: stage[counter] for counter in COUNTERS},
+                    "cache_hit_rate": round(stage["cache_hits"] / lookups, 3) if lookups else 0.0,
+                }
+            result[name] = {
+                "runs": entry["runs"],
+                "failed_runs": entry["failed_runs"],
+                "last_run_at": entry["last_run_at"],
+                "duration_s": _distribution(entry["durations"]),
+                "histogram": _histogram(entry["durations"]),
+                "stages": stages,
+            }
+        return result
+
+    @staticmethod
+    def save_run(record: Dict[str, Any], db: Session):
+        """Persist one run record (blocking — call through db_executor)"""
+        db.add(PipelineRun(**record))
+        db.commit()
+
+    def reset(self):
+        self._platforms.clear()
+
+
+# Process-wide singleton
+pipeline_metrics = PipelineMetrics()
@@ -1,9 +1,10 @@
 """
 Trend Detector Database Models
-Tables: signals, candidates, x_validation, classifications, watchlist, scoring_config
+Tables: signals, candidates, candidate_signals, x_validation, classifications, watchlist, scoring_config,
+        media_analysis, pipeline_runs, stats
 """
 from sqlalchemy import (
-    Column, Integer, String, DateTime, Text, Boolean, Float, JSON
+    Column, Integer, String, DateTime, Text, Boolean, Float, JSON, Index, event, inspect
 )
 from datetime import datetime
 from app.db.database import Base
@@ -12,6 +13,13 @@ from app.db.database import Base
 class Signal(Base):
     """Raw signal collected from any platform before processing"""
     __tablename__ = "td_signals"
+    __table_args__ = (
+        # One row per platform post — backs the Normalizer's batched key lookup and upsert
+        Index("ux_td_signals_platform_source", "platform", "source_id", unique=True),
+        # Keyset pages of GET /signals (newest first, optionally per platform) are index seeks
+        Index("ix_td_signals_created_at", "created_at"),
+        Index("ix_td_signals_platform_created_at", "platform", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     platform = Column(String(50), nullable=False, index=True)       # reddit, x, google_trends, tiktok
@@ -30,6 +38,7 @@ class Signal(Base):
     comments = Column(Integer, default=0)
     raw_data = Column(JSON, nullable=True)                          # Full raw response from API
     has_media = Column(Boolean, default=False)
+    lang = Column(String(8), nullable=True)                         # ar, fa, other — tagged at ingest (app/utils/text.detect_language)
     is_processed = Column(Boolean, default=False, index=True)       # Whether it passed through normalizer
     created_at = Column(DateTime, default=datetime.utcnow)
 
@@ -40,6 +49,12 @@ class Signal(Base):
 class Candidate(Base):
     """Normalized, deduplicated signal ready for scoring and validation"""
     __tablename__ = "td_candidates"
+    __table_args__ = (
+        # "HOT in the last 24h" is an index range count instead of a scan of every HOT candidate
+        Index("ix_td_candidates_status_updated_at", "status", "updated_at"),
+        # sort_by=date keyset pages (score already has its own index)
+        Index("ix_td_candidates_created_at", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     fingerprint = Column(String(64), unique=True, index=True)       # SHA-256 hash for dedup
@@ -48,8 +63,7 @@ class Candidate(Base):
     keywords = Column(Text, nullable=True)                          # Comma-separated
     url = Column(String(2000), nullable=True)                       # Best/primary URL
     media_url = Column(String(2000), nullable=True)
-    platforms = Column(String(500), nullable=True)                  # Comma-separated platforms where seen
-    source_signal_ids = Column(String(500), nullable=True)          # Comma-separated Signal IDs merged into this
+    platforms = Column(String(500), nullable=True)                  # Comma-separated platforms where seen (denormalized from td_candidate_signals)
     first_seen_at = Column(DateTime, nullable=True)
     views_total = Column(Integer, default=0)
     likes_total = Column(Integer, default=0)
@@ -58,6 +72,10 @@ class Candidate(Base):
     platform_count = Column(Integer, default=1)                     # Number of platforms signal appears on
     score = Column(Float, default=0.0, index=True)                  # Score from scoring engine
     status = Column(String(50), default="pending", index=True)      # pending, validated, hot, early, not_yet, expired
+    lang = Column(String(8), nullable=True, index=True)             # Language of the signal it was created from (ar, fa, other)
+    metrics_version = Column(Integer, default=0, nullable=False)    # Bumped whenever a scoring input (totals, platform_count) changes
+    scored_version = Column(Integer, default=-1)                    # metrics_version the current score was computed from
+    validated_version = Column(Integer, default=-1)                 # metrics_version at the last validation verdict
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -65,6 +83,33 @@ class Candidate(Base):
         return f"<Candidate(id={self.id}, score={self.score}, status={self.status}, title={self.title[:50]})>"
 
 
+# Attributes the score is computed from — any change marks the candidate dirty
+CANDIDATE_METRIC_FIELDS = ("views_total", "likes_total", "reshares_total", "comments_total", "platform_count")
+
+
+def _bump_metrics_version(target: Candidate, value, oldvalue, initiator):
+    if value != oldvalue:
+        target.metrics_version = (target.metrics_version or 0) + 1
+
+
+for _field in CANDIDATE_METRIC_FIELDS:
+    event.listen(getattr(Candidate, _field), "set", _bump_metrics_version)
+
+
+class CandidateSignal(Base):
+    """Membership of a signal in the candidate it was merged into"""
+    __tablename__ = "td_candidate_signals"
+
+    candidate_id = Column(Integer, primary_key=True)                # Leading PK column → lookups by candidate are an index range scan
+    signal_id = Column(Integer, primary_key=True, unique=True, index=True)  # A signal is merged into exactly one candidate
+    platform = Column(String(50), nullable=True)                    # Copied from the signal, saves a join for platform breakdowns
+    archived_on = Column(String(10), nullable=True)                 # Archive partition (YYYY-MM-DD) once the signal left td_signals
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<CandidateSignal(candidate_id={self.candidate_id}, signal_id={self.signal_id})>"
+
+
 class XValidation(Base):
     """Results from X platform validation checks"""
     __tablename__ = "td_x_validation"
@@ -98,6 +143,7 @@ class Classification(Base):
     entities = Column(Text, nullable=True)                          # Names, places, teams (JSON string)
     summary_ar = Column(Text, nullable=True)                        # Arabic summary
     summary_en = Column(Text, nullable=True)                        # English summary
+    source = Column(String(20), nullable=True)                      # llm, cache (copied LLM result), fallback (keyword match)
     classified_at = Column(DateTime, default=datetime.utcnow)
 
     def __repr__(self):
@@ -135,3 +181,192 @@ class ScoringConfig(Base):
 
     def __repr__(self):
         return f"<ScoringConfig(metric={self.metric}, platform={self.platform}, weight={self.weight})>"
+
+
+class MediaAnalysis(Base):
+    """Google Vision result per media URL — re-seen media is never sent to the API again"""
+    __tablename__ = "td_media_analysis"
+
+    url_hash = Column(String(64), primary_key=True)                 # SHA-256 of media_url (URLs can exceed index limits)
+    media_url = Column(String(2000), nullable=False)
+    media_text = Column(Text, nullable=False, default="")           # Extracted text + labels ("" = nothing found)
+    analyzed_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f"<MediaAnalysis(url_hash={self.url_hash[:12]}, media_text={(self.media_text or '')[:30]})>"
+
+
+class PipelineRun(Base):
+    """One pipeline run (collector cycle or watchlist re-check) with per-stage metrics"""
+    __tablename__ = "td_pipeline_runs"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    platform = Column(String(50), nullable=False, index=True)      # reddit, x, google_trends, tiktok, watchlist
+    started_at = Column(DateTime, default=datetime.utcnow, index=True)
+    duration_s = Column(Float, default=0.0)
+    raw_signals = Column(Integer, default=0)
+    new_signals = Column(Integer, default=0)
+    candidates = Column(Integer, default=0)
+    hot = Column(Integer, default=0)
+    classified = Column(Integer, default=0)
+    first_hot_after_s = Column(Float, nullable=True)
+    error = Column(Text, nullable=True)                             # Set when the run failed
+    stages = Column(JSON, nullable=True)                            # stage → seconds, items, calls, errors, cache hits
+
+    def __repr__(self):
+        return f"<PipelineRun(id={self.id}, platform={self.platform}, duration_s={self.duration_s})>"
+
+
+class TrendStat(Base):
+    """One maintained counter (metric, key) → value — kept current by SQLite triggers, see below"""
+    __tablename__ = "td_stats"
+
+    metric = Column(String(50), primary_key=True)                   # signals, signals_hour, candidates, classifications, watchlist_active, validations
+    key = Column(String(200), primary_key=True, default="")         # platform / "YYYY-MM-DD HH" / status / category ("" for plain totals)
+    value = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TrendStat(metric={self.metric}, key={self.key}, value={self.value})>"
+
+
+# ─── td_stats maintenance ────────────────────────────────────────────────────
+# Triggers update the counters in the same transaction as every write path (ORM flushes,
+# bulk Core statements, retention deletes), so reading statistics never scans data tables.
+
+def _inc(metric: str, key: str) -> str:
+    return (
+        f"INSERT INTO td_stats (metric, key, value) VALUES ('{metric}', {key}, 1) "
+        f"ON CONFLICT(metric, key) DO UPDATE SET value = value + 1;"
+    )
+
+
+def _dec(metric: str, key: str) -> str:
+    return f"UPDATE td_stats SET value = value - 1 WHERE metric = '{metric}' AND key = {key};"
+
+
+def _hour(column: str) -> str:
+    """Hour bucket key of a stored DateTime ('YYYY-MM-DD HH:MM:SS...' → 'YYYY-MM-DD HH')"""
+    return f"substr(COALESCE({column}, datetime('now')), 1, 13)"
+
+
+# name → (event, WHEN condition, statements)
+TREND_STATS_TRIGGERS = {
+    "td_stats_signals_insert": ("AFTER INSERT ON td_signals", None, [
+        _inc("signals", "COALESCE(NEW.platform, '')"), _inc("signals_hour", _hour("NEW.created_at")),
+    ]),
+    "td_stats_signals_delete": ("AFTER DELETE ON td_signals", None, [
+        _dec("signals", "COALESCE(OLD.platform, '')"), _dec("signals_hour", _hour("OLD.created_at")),
+    ]),
+    "td_stats_candidates_insert": ("AFTER INSERT ON td_candidates", None, [
+        _inc("candidates", "COALESCE(NEW.status, '')"),
+    ]),
+    "td_stats_candidates_status": ("AFTER UPDATE OF status ON td_candidates", "OLD.status IS NOT NEW.status", [
+        _dec("candidates", "COALESCE(OLD.status, '')"), _inc("candidates", "COALESCE(NEW.status, '')"),
+    ]),
+    "td_stats_candidates_delete": ("AFTER DELETE ON td_candidates", None, [
+        _dec("candidates", "COALESCE(OLD.status, '')"),
+    ]),
+    "td_stats_classifications_insert": ("AFTER INSERT ON td_classifications", None, [
+        _inc("classifications", "COALESCE(NEW.category, '')"),
+    ]),
+    "td_stats_classifications_category": ("AFTER UPDATE OF category ON td_classifications", "OLD.category IS NOT NEW.category", [
+        _dec("classifications", "COALESCE(OLD.category, '')"), _inc("classifications", "COALESCE(NEW.category, '')"),
+    ]),
+    "td_stats_classifications_delete": ("AFTER DELETE ON td_classifications", None, [
+        _dec("classifications", "COALESCE(OLD.category, '')"),
+    ]),
+    "td_stats_watchlist_insert": ("AFTER INSERT ON td_watchlist", "NEW.is_active = 1", [
+        _inc("watchlist_active", "''"),
+    ]),
+    "td_stats_watchlist_active": ("AFTER UPDATE OF is_active ON td_watchlist", "OLD.is_active IS NOT NEW.is_active", [
+        "UPDATE td_stats SET value = value + (CASE WHEN NEW.is_active = 1 THEN 1 ELSE -1 END) "
+        "WHERE metric = 'watchlist_active' AND key = '';",
+    ]),
+    "td_stats_watchlist_delete": ("AFTER DELETE ON td_watchlist", "OLD.is_active = 1", [
+        _dec("watchlist_active", "''"),
+    ]),
+    "td_stats_validations_insert": ("AFTER INSERT ON td_x_validation", None, [
+        _inc("validations", "''"),
+    ]),
+    "td_stats_validations_delete": ("AFTER DELETE ON td_x_validation", None, [
+        _dec("validations", "''"),
+    ]),
+}
+
+# Full recount — only runs while td_stats is empty (fresh table next to existing data)
+TREND_STATS_REBUILD = [
+    "DELETE FROM td_stats",
+    "INSERT INTO td_stats SELECT 'signals', COALESCE(platform, ''), COUNT(*) FROM td_signals GROUP BY 2",
+    "INSERT INTO td_stats SELECT 'signals_hour', substr(created_at, 1, 13), COUNT(*) FROM td_signals "
+    "WHERE created_at >= datetime('now', '-2 days') GROUP BY 2",
+    "INSERT INTO td_stats SELECT 'candidates', COALESCE(status, ''), COUNT(*) FROM td_candidates GROUP BY 2",
+    "INSERT INTO td_stats SELECT 'classifications', COALESCE(category, ''), COUNT(*) FROM td_classifications GROUP BY 2",
+    "INSERT INTO td_stats SELECT 'watchlist_active', '', COUNT(*) FROM td_watchlist WHERE is_active = 1",
+    "INSERT INTO td_stats SELECT 'validations', '', COUNT(*) FROM td_x_validation",
+]
+
+TREND_STATS_TABLES = {"td_stats", "td_signals", "td_candidates", "td_classifications", "td_watchlist", "td_x_validation"}
+
+
+def _install_trend_stats(target, connection, **kw):
+    """After create_all: (re)create the counter triggers and seed td_stats if it is empty"""
+    if connection.dialect.name != "sqlite" or not TREND_STATS_TABLES <= set(inspect(connection).get_table_names()):
+        return
+    for name, (on, when, statements) in TREND_STATS_TRIGGERS.items():
+        condition = f" WHEN {when}" if when else ""
+        connection.exec_driver_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {name} {on} FOR EACH ROW{condition} BEGIN {' '.join(statements)} END"
+        )
+    if not connection.exec_driver_sql("SELECT COUNT(*) FROM td_stats").scalar():
+        for statement in TREND_STATS_REBUILD:
+            connection.exec_driver_sql(statement)
+
+
+event.listen(Base.metadata, "after_create", _install_trend_stats)
+
+
+# ─── td_candidates_fts (search index) ────────────────────────────────────────
+# FTS5 table over Arabic-normalized candidate text (see app/trend_detector/search.py).
+# Candidate text is only written through the ORM, so mapper events keep it in sync in
+# the same transaction; an empty index next to existing candidates is seeded on startup.
+
+CANDIDATE_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS td_candidates_fts "
+    "USING fts5(title, content, keywords, tokenize='unicode61 remove_diacritics 2')"
+)
+CANDIDATE_TEXT_FIELDS = ("title", "content", "keywords")
+
+
+def _install_candidate_search(target, connection, **kw):
+    """After create_all: create the FTS index and seed it if candidates exist but it is empty"""
+    if connection.dialect.name != "sqlite" or not inspect(connection).has_table("td_candidates"):
+        return
+    from app.trend_detector.search import TrendSearch
+    connection.exec_driver_sql(CANDIDATE_FTS_DDL)
+    index_empty = connection.exec_driver_sql("SELECT 1 FROM td_candidates_fts LIMIT 1").first() is None
+    if index_empty and connection.exec_driver_sql("SELECT 1 FROM td_candidates LIMIT 1").first() is not None:
+        print(f"[Search] Indexed {TrendSearch.rebuild(connection)} candidates into td_candidates_fts")
+
+
+def _index_candidate(mapper, connection, target: Candidate):
+    from app.trend_detector.search import index_row
+    connection.exec_driver_sql(
+        "INSERT OR REPLACE INTO td_candidates_fts (rowid, title, content, keywords) VALUES (?, ?, ?, ?)",
+        tuple(index_row(target.id, target.title, target.content, target.keywords).values()),
+    )
+
+
+def _reindex_candidate(mapper, connection, target: Candidate):
+    state = inspect(target)
+    if any(state.attrs[name].history.has_changes() for name in CANDIDATE_TEXT_FIELDS):
+        _index_candidate(mapper, connection, target)
+
+
+def _unindex_candidate(mapper, connection, target: Candidate):
+    connection.exec_driver_sql("DELETE FROM td_candidates_fts WHERE rowid = ?", (target.id,))
+
+
+event.listen(Base.metadata, "after_create", _install_candidate_search)
+event.listen(Candidate, "after_insert", _index_candidate)
+event.listen(Candidate, "after_update", _reindex_candidate)
+event.listen(Candidate, "after_delete", _unindex_candidate)
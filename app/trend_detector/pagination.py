@@ -0,0 +1,162 @@
+"""
+Listing Pagination
+Keyset (cursor) paging for the trend listing endpoints (signals, candidates, search).
+A page after a cursor is `WHERE (sort_value, id) < (last_value, last_id)
+ORDER BY sort_value DESC, id DESC LIMIT n + 1` — an index range seek that costs the
+same on page 1 and page 5000, where OFFSET walks and drops every earlier row. The extra
+row only tells whether there is a next page.
+
+  - cursors are opaque tokens (urlsafe base64 JSON: sort key + last row's value and id);
+    a cursor issued for another sort is rejected
+  - NULL sort values sort last (SQLite DESC) and are paged by id once the values run out
+  - totals are opt-in per request (ListingTotals): exact COUNT, a count cached for
+    LISTING_TOTAL_CACHE_TTL seconds per endpoint + filters, or none. Filter sets a td_stats
+    counter answers (see TrendStats.count) cost one lookup in every mode but none
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import DateTime, and_, tuple_
+from sqlalchemy.orm import Query, Session
+
+from app.trend_detector.cache import TTLCache
+from app.trend_detector.config import LISTING_TOTAL_CACHE_MAX_ENTRIES, LISTING_TOTAL_CACHE_TTL
+from app.trend_detector.stats import TrendStats
+
+
+TOTAL_EXACT = "exact"
+TOTAL_CACHED = "cached"
+TOTAL_NONE = "none"
+TOTAL_MODES = (TOTAL_EXACT, TOTAL_CACHED, TOTAL_NONE)
+
+
+class CursorError(ValueError):
+    """Malformed cursor, one issued for another sort, or a bad total mode"""
+
+
+class Page(NamedTuple):
+    items: List[Any]
+    next_cursor: Optional[str]
+
+
+class Keyset:
+    """
+    Ordering of one listing sort: `column` then `id_column` as tie-break, both in the same
+    direction. nullable=False for columns that never hold NULL (computed ranks).
+    """
+
+    def __init__(self, sort: str, column, id_column, descending: bool = True, nullable: bool = True):
+        self.sort = sort
+        self.column = column
+        self.id_column = id_column
+        self.descending = descending
+        self.nullable = nullable and descending
+        self.is_datetime = isinstance(getattr(column, "type", None), DateTime)
+
+    def order_by(self) -> list:
+        if self.descending:
+            return [self.column.desc(), self.id_column.desc()]
+        return [self.column.asc(), self.id_column.asc()]
+
+    # ─── Cursor tokens ────────────────────────────────────────────────────────
+
+    def encode(self, value: Any, row_id: int) -> str:
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        payload = json.dumps({"s": self.sort, "k": [value, row_id]}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode(self, cursor: str) -> Tuple[Any, int]:
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            value, row_id = payload["k"]
+            sort = payload["s"]
+        except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+            raise CursorError("Invalid cursor")
+        if sort != self.sort:
+            raise CursorError(f"Cursor was issued for sort_by={sort}, not {self.sort}")
+        if not isinstance(row_id, int) or (value is None and not self.nullable):
+            raise CursorError("Invalid cursor")
+        if value is not None and self.is_datetime:
+            try:
+                value = datetime.fromisoformat(value)
+            except (TypeError, ValueError):
+                raise CursorError("Invalid cursor")
+        elif value is not None and not isinstance(value, (int, float)):
+            raise CursorError("Invalid cursor")
+        return value, row_id
+
+    # ─── Pages ────────────────────────────────────────────────────────────────
+
+    def _after(self, value: Any, row_id: int):
+        """Rows past (value, row_id) — a row value, so SQLite seeks the sort column's index"""
+        if value is None:
+            return and_(self.column.is_(None), self.id_column < row_id)
+        position = tuple_(self.column, self.id_column)
+        return position < tuple_(value, row_id) if self.descending else position > tuple_(value, row_id)
+
+    def page(self, query: Query, limit: int, cursor: Optional[str] = None, offset: int = 0) -> Page:
+        """
+        One page of `query` (entity query, no ORDER BY/LIMIT yet) — after `cursor` when given,
+        else at `offset` — plus the cursor of the page after it (None on the last page)
+        """
+        query = query.add_columns(self.column)
+        ordered = query.order_by(*self.order_by())
+        if cursor is None:
+            rows = ordered.offset(offset).limit(limit + 1).all()
+        else:
+            value, row_id = self.decode(cursor)
+            rows = ordered.filter(self._after(value, row_id)).limit(limit + 1).all()
+            if value is not None and self.nullable and len(rows) <= limit:
+                # Values exhausted — go on into the NULL rows, which the row-value comparison never matches
+                rows += (
+                    query.filter(self.column.is_(None)).order_by(self.id_column.desc())
+                    .limit(limit + 1 - len(rows)).all()
+                )
+        if len(rows) <= limit:
+            return Page([row[0] for row in rows], None)
+        last = rows[limit - 1]
+        return Page([row[0] for row in rows[:limit]], self.encode(last[1], last[0].id))
+
+
+def total_mode(requested: Optional[str], cursor: Optional[str]) -> str:
+    """Requested total mode; by default offset pages count exactly and cursor pages don't count"""
+    if requested is None:
+        return TOTAL_NONE if cursor else TOTAL_EXACT
+    if requested not in TOTAL_MODES:
+        raise CursorError(f"total must be one of: {', '.join(TOTAL_MODES)}")
+    return requested
+
+
+class ListingTotals:
+    """Row totals for listing pages — exact, cached per endpoint + filters, or skipped"""
+
+    def __init__(self, ttl_seconds: int = LISTING_TOTAL_CACHE_TTL, max_entries: int = LISTING_TOTAL_CACHE_MAX_ENTRIES):
+        self.counts = TTLCache("td:listing_total", ttl_seconds=ttl_seconds, max_entries=max_entries)
+
+    def total(
+        self, db: Session, mode: str, query: Query, endpoint: str, filters: dict,
+        counter: Optional[Tuple[str, Optional[str]]] = None,
+    ) -> Optional[int]:
+        """
+        Total rows of `query` in `mode`. counter=(metric, key) names the td_stats counter that
+        equals this total (the filter set is one the counters are keyed by).
+        """
+        if mode == TOTAL_NONE:
+            return None
+        if counter is not None:
+            return TrendStats.count(db, *counter)
+        if mode == TOTAL_EXACT:
+            return query.order_by(None).count()
+        key = endpoint + ":" + json.dumps(filters, sort_keys=True, ensure_ascii=False, default=str)
+        count = self.counts.get(key)
+        if count is None:
+            count = query.order_by(None).count()
+            self.counts.set(key, count)
+        return count
+
+
+listing_totals = ListingTotals()
@@ -0,0 +1,200 @@
+"""
+Candidate Index
+Process-wide inverted index over active candidate titles (token → candidate ids),
+with the normalized token set of every candidate cached.
+
+Used by the Deduplicator to shortlist only candidates that can possibly reach the
+Jaccard threshold, instead of comparing every new signal with every active candidate.
+Built once per process from the DB, then kept up to date incrementally:
+  - Deduplicator adds candidates it creates
+  - Candidate.status changes (validator, watchlist expiry, ...) add/remove entries
+
+Indexes are only read and changed by the Deduplicator on the DB executor, under
+index_lock. Status changes happen elsewhere too (the validator sets verdicts on the
+event loop), so the listener only queues them; apply_pending_changes() replays the
+queue at the start of the next Deduplicator.process, before any matching.
+"""
+import math
+import threading
+from collections import deque
+from typing import Callable, Deque, Dict, FrozenSet, Hashable, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.trend_detector.models import Candidate
+
+
+# Candidate statuses that can still absorb new signals
+ACTIVE_STATUSES = ("pending", "validated", "early")
+
+# Every index that has been loaded — kept in sync by the Candidate.status listener below
+_loaded_indexes: List["CandidateIndex"] = []
+
+# Held by Deduplicator.process for a whole batch — one index user at a time, whatever
+# the number of DB executor threads
+index_lock = threading.Lock()
+
+# (candidate id, title, active) status changes not yet applied to the loaded indexes.
+# deque append/popleft are atomic, so any thread may queue while the DB thread drains.
+_pending_changes: Deque[Tuple[int, Optional[str], bool]] = deque()
+
+
+class CandidateIndex:
+    """Inverted token index with cached per-candidate token sets"""
+
+    # Tokens carried by more candidates than this are never probed one by one:
+    # unioning their postings would make matching cost grow linearly with the
+    # number of active candidates. Candidates reachable only through them are
+    # found by intersecting their postings instead (see matches).
+    MAX_PROBE_POSTINGS = 250
+
+    def __init__(self):
+        self._postings: Dict[str, Set[Hashable]] = {}
+        self._tokens: Dict[Hashable, FrozenSet[str]] = {}
+        self._tokenize: Callable[[str], FrozenSet[str]] = None
+        self.is_loaded = False
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def keys(self) -> List[Hashable]:
+        return list(self._tokens)
+
+    def clear(self):
+        self._postings.clear()
+        self._tokens.clear()
+
+    def load(self, db: Session, tokenize: Callable[[str], FrozenSet[str]]):
+        """Build the index from all active candidates (one query, once per process)"""
+        self.clear()
+        self._tokenize = tokenize
+        rows = (
+            db.query(Candidate.id, Candidate.title)
+            .filter(Candidate.status.in_(ACTIVE_STATUSES))
+            .all()
+        )
+        for cand_id, title in rows:
+            self.add(cand_id, tokenize(title))
+        self.is_loaded = True
+        if self not in _loaded_indexes:
+            _loaded_indexes.append(self)
+        print(f"[{type(self).__name__}] Loaded {len(rows)} active candidates")
+
+    def add(self, key: Hashable, tokens: Iterable[str]):
+        """Insert or replace a candidate's token set"""
+        if key in self._tokens:
+            self.remove(key)
+        tokens = frozenset(tokens)
+        self._tokens[key] = tokens
+        for tok in tokens:
+            self._postings.setdefault(tok, set()).add(key)
+
+    def add_title(self, key: Hashable, title: str):
+        """Insert a candidate by title using the tokenizer given at load time"""
+        if self._tokenize is not None:
+            self.add(key, self._tokenize(title))
+
+    def remove(self, key: Hashable):
+        """Drop a candidate (merged away, expired, validated out of the active set)"""
+        tokens = self._tokens.pop(key, None)
+        if not tokens:
+            return
+        for tok in tokens:
+            ids = self._postings.get(tok)
+            if ids is not None:
+                ids.discard(key)
+                if not ids:
+                    del self._postings[tok]
+
+    def rekey(self, old_key: Hashable, new_key: Hashable):
+        """Move an entry to a new key (temporary batch key → DB id after flush)"""
+        tokens = self._tokens.get(old_key)
+        if tokens is None:
+            return
+        self.remove(old_key)
+        self.add(new_key, tokens)
+
+    def matches(self, tokens: FrozenSet[str], threshold: float) -> List[Tuple[Hashable, float]]:
+        """
+        Candidates whose Jaccard similarity with `tokens` is >= threshold, best first.
+
+        Prefix filter: J(A, B) >= t implies |A ∩ B| >= ceil(t·|A|), so B must contain at
+        least one of any |A| - ceil(t·|A|) + 1 tokens of A. Probing only the rarest ones
+        keeps the shortlist small no matter how many candidates share common words.
+        Size filter: J(A, B) >= t also requires t·|A| <= |B| <= |A| / t.
+
+        When the prefix runs into common tokens (see MAX_PROBE_POSTINGS), only the rare
+        ones are probed: a match sharing none of them shares >= ceil(t·|A|) of the common
+        rest, and those are found by intersecting postings instead of unioning them. The
+        shortlist stays exact either way.
+        """
+        if not tokens or threshold <= 0:
+            return []
+
+        size = len(tokens)
+        overlap = math.ceil(threshold * size - 1e-9)   # |A ∩ B| needed (float-safe ceil)
+        prefix_len = size - overlap + 1
+        probe = sorted(tokens, key=lambda t: len(self._postings.get(t, ())))
+        rare = sum(1 for tok in probe if len(self._postings.get(tok, ())) <= self.MAX_PROBE_POSTINGS)
+
+        shortlist: Set[Hashable] = set()
+        for tok in probe[:min(rare, prefix_len)]:
+            shortlist.update(self._postings.get(tok, ()))
+
+        if rare < prefix_len:
+            shortlist |= self._sharing(None, probe[rare:], overlap)
+
+        min_size = threshold * size
+        max_size = size / threshold
+        results = []
+        for key in shortlist:
+            other = self._tokens[key]
+            if not (min_size <= len(other) <= max_size):
+                continue
+            inter = len(tokens & other)
+            score = inter / (size + len(other) - inter)
+            if score >= threshold:
+                results.append((key, score))
+
+        results.sort(key=lambda r: r[1], reverse=True)
+        return results
+
+    def _sharing(self, keys: Optional[Set[Hashable]], tokens: List[str], k: int) -> Set[Hashable]:
+        """Keys among `keys` (None: all) carrying at least k of `tokens` (all indexed)"""
+        if k == 0:
+            return keys
+        found: Set[Hashable] = set()
+        for i in range(len(tokens) - k + 1):
+            # Carriers of tokens[i] as the first of their k; set & iterates the smaller side
+            ids = self._postings[tokens[i]]
+            narrowed = ids if keys is None else keys & ids
+            if narrowed:
+                found |= self._sharing(narrowed, tokens[i + 1:], k - 1)
+        return found
+
+
+# Process-wide singleton shared by every pipeline run
+candidate_index = CandidateIndex()
+
+
+def apply_pending_changes() -> int:
+    """Replay queued status changes on every loaded index (call holding index_lock)"""
+    applied = 0
+    while _pending_changes:
+        cand_id, title, active = _pending_changes.popleft()
+        for index in _loaded_indexes:
+            if active:
+                index.add_title(cand_id, title)
+            else:
+                index.remove(cand_id)
+        applied += 1
+    return applied
+
+
+@event.listens_for(Candidate.status, "set")
+def _sync_index_on_status_change(target: Candidate, value, oldvalue, initiator):
+    """Queue candidates entering/leaving the active set for the loaded indexes"""
+    if not _loaded_indexes or target.id is None or value == oldvalue:
+        return
+    _pending_changes.append((target.id, target.title, value in ACTIVE_STATUSES))
@@ -2,79 +2,149 @@
 Deduplicator & Merger
 Takes unprocessed Signals, groups similar ones, and creates/updates Candidates.
 Uses title-based fingerprinting + keyword overlap for similarity.
+Fuzzy matches are shortlisted through a process-wide index chosen by DEDUP_STRATEGY:
+  - "jaccard": CandidateIndex (inverted Arabic-normalized tokens, exact word overlap)
+  - "minhash": MinHashIndex (MinHash signatures + banded LSH over Arabic-normalized shingles)
+  - "vector":  VectorIndex (character n-gram TF-IDF cosine, whole batch in one NumPy product)
 """
 import hashlib
-import re
-from typing import List
+from typing import Dict, List, Optional
 from datetime import datetime, timezone
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
-from app.trend_detector.models import Signal, Candidate
+from app.trend_detector.models import Signal, Candidate, CandidateSignal
+from app.trend_detector.config import DEDUP_STRATEGY, DEDUP_SIMILARITY_THRESHOLD, DEDUP_VECTOR_THRESHOLD
+from app.trend_detector.pipeline.candidate_index import (
+    candidate_index, ACTIVE_STATUSES, apply_pending_changes, index_lock,
+)
+from app.trend_detector.pipeline.minhash_lsh import minhash_index, shingles
+from app.trend_detector.pipeline.vector_similarity import vector_index
+from app.utils.text import fingerprint_text, tokenize
 
 
 class Deduplicator:
     """Deduplicate signals and merge into candidates"""
 
-    def _normalize_text(self, text: str) -> str:
-        """Normalize text for comparison: lowercase, strip punctuation/whitespace"""
-        if not text:
-            return ""
-        text = text.lower().strip()
-        text = re.sub(r'[^\w\s]', '', text)
-        text = re.sub(r'\s+', ' ', text)
-        return text
+    LOOKUP_BATCH_SIZE = 400  # fingerprints per IN (...) lookup
+    JACCARD_THRESHOLD = 0.6
+
+    def __init__(self, strategy: str = DEDUP_STRATEGY):
+        indexes = {"jaccard": candidate_index, "minhash": minhash_index, "vector": vector_index}
+        if strategy not in indexes:
+            print(f"[Deduplicator] Unknown strategy '{strategy}' — falling back to jaccard")
+            strategy = "jaccard"
+        self.strategy = strategy
+        self.index = indexes[strategy]
 
     def _fingerprint(self, title: str, keywords: str = "") -> str:
         """Create a SHA-256 fingerprint from normalized title + keywords"""
-        normalized = self._normalize_text(title)
+        normalized = fingerprint_text(title)
         if keywords:
-            normalized += " " + self._normalize_text(keywords)
+            normalized += " " + fingerprint_text(keywords)
         return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
 
     def _word_overlap_ratio(self, text_a: str, text_b: str) -> float:
         """Calculate word overlap ratio between two texts"""
-        words_a = set(self._normalize_text(text_a).split())
-        words_b = set(self._normalize_text(text_b).split())
+        words_a = set(tokenize(text_a))
+        words_b = set(tokenize(text_b))
         if not words_a or not words_b:
             return 0.0
         intersection = words_a & words_b
         union = words_a | words_b
         return len(intersection) / len(union) if union else 0.0
 
-    def process(self, signals: List[Signal], db: Session, similarity_threshold: float = 0.6) -> List[Candidate]:
+    def _tokens(self, text: str) -> frozenset:
+        """Arabic-normalized word set of a title (what Jaccard similarity is computed over)"""
+        return frozenset(tokenize(text))
+
+    def _features(self, text: str) -> frozenset:
+        """What the active strategy's index is built over"""
+        if self.strategy == "minhash":
+            return shingles(text)
+        if self.strategy == "vector":
+            return text or ""
+        return self._tokens(text)
+
+    def _fetch_by_fingerprint(self, fingerprints: set, db: Session) -> Dict[str, Candidate]:
+        """Resolve exact-fingerprint matches for the whole batch in IN (...) lookups"""
+        found = {}
+        fps = list(fingerprints)
+        for i in range(0, len(fps), self.LOOKUP_BATCH_SIZE):
+            chunk = fps[i:i + self.LOOKUP_BATCH_SIZE]
+            for c in db.query(Candidate).filter(Candidate.fingerprint.in_(chunk)).all():
+                found[c.fingerprint] = c
+        return found
+
+    def process(self, signals: List[Signal], db: Session, similarity_threshold: Optional[float] = None) -> List[Candidate]:
         """
         Process unprocessed signals into candidates.
         - Exact fingerprint match → merge into existing candidate
-        - High word overlap with existing candidate → merge
+        - Similar to an active candidate (shortlisted via the strategy's index) → merge
         - Otherwise → create new candidate
+
+        similarity_threshold defaults to 0.6 word overlap for "jaccard",
+        DEDUP_SIMILARITY_THRESHOLD for "minhash" and DEDUP_VECTOR_THRESHOLD for "vector".
         
         Returns list of new or updated Candidates.
         """
-        updated_candidates = []
-        existing_candidates = db.query(Candidate).filter(
-            Candidate.status.in_(["pending", "validated", "early"])
-        ).all()
+        if similarity_threshold is None:
+            similarity_threshold = {
+                "jaccard": self.JACCARD_THRESHOLD,
+                "minhash": DEDUP_SIMILARITY_THRESHOLD,
+                "vector": DEDUP_VECTOR_THRESHOLD,
+            }[self.strategy]
+
+        # The indexes are only touched here, one batch at a time; status changes made on
+        # other threads since the last batch are applied before matching
+        with index_lock:
+            if not self.index.is_loaded:
+                self.index.load(db, self._features)
+            apply_pending_changes()
+            return self._merge(signals, db, similarity_threshold)
+
+    def _merge(self, signals: List[Signal], db: Session, similarity_threshold: float) -> List[Candidate]:
+        """process() body — runs holding index_lock"""
+        index = self.index
+
+        pending = [s for s in signals if not s.is_processed]
+        fingerprints = {s.id: self._fingerprint(s.title, s.keywords) for s in pending}
+        by_fingerprint = self._fetch_by_fingerprint(set(fingerprints.values()), db) if pending else {}
+
+        # Vector strategy scores the whole batch against all active candidates in one pass
+        batch_matches = None
+        if self.strategy == "vector" and pending:
+            batch_matches = index.match_batch([self._features(s.title) for s in pending], similarity_threshold)
 
-        for signal in signals:
-            if signal.is_processed:
-                continue
+        updated_candidates = []
+        created: Dict[tuple, Candidate] = {}   # temporary index key → new candidate (no DB id yet)
 
-            fp = self._fingerprint(signal.title, signal.keywords)
+        for pos, signal in enumerate(pending):
+            fp = fingerprints[signal.id]
 
             # 1. Check exact fingerprint match
-            candidate = db.query(Candidate).filter(Candidate.fingerprint == fp).first()
+            candidate = by_fingerprint.get(fp)
 
-            # 2. If no exact match, check word overlap with recent candidates
+            # 2. If no exact match, check similarity with shortlisted active candidates
             if not candidate:
-                best_match = None
-                best_score = 0.0
-                for c in existing_candidates:
-                    score = self._word_overlap_ratio(signal.title, c.title)
-                    if score > best_score:
-                        best_score = score
-                        best_match = c
-                if best_match and best_score >= similarity_threshold:
-                    candidate = best_match
+                if batch_matches is not None:
+                    matches = batch_matches[pos]
+                else:
+                    matches = index.matches(self._features(signal.title), similarity_threshold)
+                for key, _score in matches:
+                    if isinstance(key, tuple) and key[0] == "batch":
+                        # Similar to an earlier signal of this batch → follow it into its candidate
+                        match = updated_candidates[key[1]]
+                    elif isinstance(key, tuple):
+                        match = created.get(key)
+                    else:
+                        match = db.get(Candidate, key)
+                    if match is not None and match.status in ACTIVE_STATUSES:
+                        candidate = match
+                        break
+                    # Stale entry (deleted or left the active set outside this process)
+                    if not (isinstance(key, tuple) and key[0] == "batch"):
+                        index.remove(key)
 
             if candidate:
                 # Merge into existing candidate
@@ -83,18 +153,12 @@ class Deduplicator:
                 candidate.reshares_total += signal.reshares
                 candidate.comments_total += signal.comments
 
-                # Update platforms list
-                current_platforms = set((candidate.platforms or "").split(","))
-                current_platforms.discard("")
-                current_platforms.add(signal.platform)
-                candidate.platforms = ",".join(current_platforms)
-                candidate.platform_count = len(current_platforms)
-
-                # Append signal ID
-                current_ids = set((candidate.source_signal_ids or "").split(","))
-                current_ids.discard("")
-                current_ids.add(str(signal.id))
-                candidate.source_signal_ids = ",".join(current_ids)
+                # Platforms list only changes when the signal comes from a new platform
+                current_platforms = [p for p in (candidate.platforms or "").split(",") if p]
+                if signal.platform not in current_platforms:
+                    current_platforms.append(signal.platform)
+                    candidate.platforms = ",".join(current_platforms)
+                    candidate.platform_count = len(current_platforms)
 
                 candidate.updated_at = datetime.now(timezone.utc)
             else:
@@ -107,7 +171,6 @@ class Deduplicator:
                     url=signal.url,
                     media_url=signal.media_url,
                     platforms=signal.platform,
-                    source_signal_ids=str(signal.id),
                     first_seen_at=signal.published_at or datetime.now(timezone.utc),
                     views_total=signal.views,
                     likes_total=signal.likes,
@@ -116,16 +179,30 @@ class Deduplicator:
                     platform_count=1,
                     score=0.0,
                     status="pending",
+                    lang=signal.lang,
                     created_at=datetime.now(timezone.utc),
                 )
                 db.add(candidate)
-                existing_candidates.append(candidate)
+                by_fingerprint[fp] = candidate
+                key = ("new", len(created))
+                created[key] = candidate
+                index.add(key, self._features(signal.title))
 
             # Mark signal as processed
             signal.is_processed = True
             updated_candidates.append(candidate)
 
         if updated_candidates:
+            # Flush first so new candidates get their ids while still loaded
+            db.flush()
+            for key, candidate in created.items():
+                index.rekey(key, candidate.id)
+            # Membership of every merged signal in one executemany INSERT
+            # (updated_candidates[i] is the candidate pending[i] went into)
+            db.execute(insert(CandidateSignal), [
+                {"candidate_id": candidate.id, "signal_id": signal.id, "platform": signal.platform}
+                for signal, candidate in zip(pending, updated_candidates)
+            ])
             db.commit()
 
         unique_candidates = {id(c): c for c in updated_candidates}
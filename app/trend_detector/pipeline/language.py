@@ -0,0 +1,80 @@
+"""
+Language Backfill
+Signals are tagged with `lang` by the Normalizer at ingest and candidates inherit the tag
+of the signal they were created from. Rows stored before that are tagged here in id batches:
+signals from their title / content (plus X's lang from raw_data while it is still there),
+candidates from their first signal while it is still in td_signals, else from their own text.
+Scheduled once on startup and triggerable from the admin API; once every row is tagged a
+run is one lookup per table.
+"""
+from collections import defaultdict
+from typing import Dict, List
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.trend_detector.config import LANG_BACKFILL_BATCH_SIZE
+from app.trend_detector.models import Candidate, CandidateSignal, Signal
+from app.utils.text import detect_language
+
+
+class LanguageBackfill:
+    """Tags td_signals / td_candidates rows that have no lang yet"""
+
+    def __init__(self, batch_size: int = LANG_BACKFILL_BATCH_SIZE):
+        self.batch_size = batch_size
+
+    def _tag(self, db: Session, model, rows: List) -> None:
+        """One UPDATE per language in the batch"""
+        by_lang: Dict[str, List[int]] = defaultdict(list)
+        for row in rows:
+            lang = getattr(row, "signal_lang", None)
+            if not lang:
+                raw_data = getattr(row, "raw_data", None)
+                hint = raw_data.get("lang") if isinstance(raw_data, dict) else None
+                lang = detect_language(row.title, row.content, hint=hint)
+            by_lang[lang].append(row.id)
+        for lang, ids in by_lang.items():
+            values = {"lang": lang}
+            if model is Candidate:
+                # Not an activity update — keep onupdate from touching updated_at
+                values["updated_at"] = Candidate.updated_at
+            db.execute(update(model).where(model.id.in_(ids)).values(**values))
+
+    def _backfill(self, db: Session, model, *columns) -> int:
+        tagged = 0
+        last_id = 0
+        while True:
+            rows = db.execute(
+                select(model.id, model.title, model.content, *columns)
+                .where(model.id > last_id, model.lang.is_(None))
+                .order_by(model.id)
+                .limit(self.batch_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            self._tag(db, model, rows)
+            db.commit()
+            tagged += len(rows)
+        return tagged
+
+    def run(self, db: Session) -> Dict[str, int]:
+        """Tag every untagged row (blocking — call through db_executor)"""
+        # Signals first, so candidates can inherit from their (now tagged) first signal
+        first_signal_lang = (
+            select(Signal.lang)
+            .join(CandidateSignal, CandidateSignal.signal_id == Signal.id)
+            .where(CandidateSignal.candidate_id == Candidate.id)
+            .order_by(CandidateSignal.signal_id)
+            .limit(1)
+            .scalar_subquery()
+            .label("signal_lang")
+        )
+        stats = {
+            "signals_tagged": self._backfill(db, Signal, Signal.raw_data),
+            "candidates_tagged": self._backfill(db, Candidate, first_signal_lang),
+        }
+        if stats["signals_tagged"] or stats["candidates_tagged"]:
+            print(f"[LanguageBackfill] Tagged {stats['signals_tagged']} signals, {stats['candidates_tagged']} candidates")
+        return stats
@@ -0,0 +1,155 @@
+"""
+MinHash / LSH index
+Near-duplicate candidate lookup in sub-linear time for the Deduplicator's "minhash" strategy.
+
+Each title is reduced to Arabic-normalized word shingles, hashed with mmh3 under
+DEDUP_MINHASH_PERMUTATIONS seeds into a MinHash signature, and bucketed by bands:
+two titles land in the same bucket of at least one band with high probability
+when their Jaccard similarity is above the configured threshold.
+
+Signatures live in one flat array('I') (permutations × slots), not in per-row
+Python sets; freed slots are reused.
+"""
+from array import array
+from typing import Dict, FrozenSet, Hashable, List, Set, Tuple
+
+import mmh3
+
+from app.trend_detector.config import (
+    DEDUP_SIMILARITY_THRESHOLD,
+    DEDUP_MINHASH_PERMUTATIONS,
+    DEDUP_MINHASH_SHINGLE_SIZE,
+)
+from app.trend_detector.pipeline.candidate_index import CandidateIndex
+from app.utils.text import tokenize
+
+
+def shingles(text: str, size: int = DEDUP_MINHASH_SHINGLE_SIZE) -> FrozenSet[str]:
+    """Word shingles of an Arabic-normalized title (whole title if shorter than one shingle)"""
+    words = tokenize(text)
+    if len(words) <= size:
+        return frozenset([" ".join(words)]) if words else frozenset()
+    return frozenset(" ".join(words[i:i + size]) for i in range(len(words) - size + 1))
+
+
+def optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    Pick (bands, rows) with bands × rows == num_perm whose S-curve midpoint
+    (1/b)^(1/r) sits closest to the similarity threshold.
+    """
+    best = (1, num_perm)
+    best_err = float("inf")
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        err = abs((1.0 / bands) ** (1.0 / rows) - threshold)
+        if err < best_err:
+            best, best_err = (bands, rows), err
+    return best
+
+
+class MinHashIndex(CandidateIndex):
+    """Banded LSH over MinHash signatures, with the same interface as CandidateIndex"""
+
+    def __init__(self, num_perm: int = DEDUP_MINHASH_PERMUTATIONS, threshold: float = DEDUP_SIMILARITY_THRESHOLD):
+        super().__init__()
+        self.num_perm = num_perm
+        self.threshold = threshold
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+        self._signatures = array("I")
+        self._slot_of: Dict[Hashable, int] = {}
+        self._free_slots: List[int] = []
+        self._buckets: List[Dict[bytes, Set[Hashable]]] = [{} for _ in range(self.bands)]
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def clear(self):
+        self._signatures = array("I")
+        self._slot_of.clear()
+        self._free_slots.clear()
+        for bucket in self._buckets:
+            bucket.clear()
+
+    def signature(self, features: FrozenSet[str]) -> array:
+        """MinHash signature: per seed, the minimum 32-bit mmh3 hash over all shingles"""
+        return array("I", (
+            min(mmh3.hash(sh, seed, signed=False) for sh in features)
+            for seed in range(self.num_perm)
+        ))
+
+    def _band_keys(self, sig: array) -> List[bytes]:
+        r = self.rows
+        return [sig[b * r:(b + 1) * r].tobytes() for b in range(self.bands)]
+
+    def _slot_signature(self, slot: int) -> array:
+        start = slot * self.num_perm
+        return self._signatures[start:start + self.num_perm]
+
+    def add(self, key: Hashable, features: FrozenSet[str]):
+        """Insert or replace a candidate's signature"""
+        if key in self._slot_of:
+            self.remove(key)
+        if not features:
+            return
+        self._store(key, self.signature(features))
+
+    def _store(self, key: Hashable, sig: array):
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            start = slot * self.num_perm
+            self._signatures[start:start + self.num_perm] = sig
+        else:
+            slot = len(self._signatures) // self.num_perm
+            self._signatures.extend(sig)
+        self._slot_of[key] = slot
+        for bucket, band_key in zip(self._buckets, self._band_keys(sig)):
+            bucket.setdefault(band_key, set()).add(key)
+
+    def remove(self, key: Hashable):
+        slot = self._slot_of.pop(key, None)
+        if slot is None:
+            return
+        for bucket, band_key in zip(self._buckets, self._band_keys(self._slot_signature(slot))):
+            keys = bucket.get(band_key)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del bucket[band_key]
+        self._free_slots.append(slot)
+
+    def rekey(self, old_key: Hashable, new_key: Hashable):
+        slot = self._slot_of.get(old_key)
+        if slot is None:
+            return
+        sig = self._slot_signature(slot)
+        self.remove(old_key)
+        self._store(new_key, sig)
+
+    def matches(self, features: FrozenSet[str], threshold: float) -> List[Tuple[Hashable, float]]:
+        """
+        Candidates sharing at least one LSH band bucket whose estimated Jaccard
+        (fraction of equal signature positions) is >= threshold, best first.
+        """
+        if not features:
+            return []
+        sig = self.signature(features)
+
+        shortlist: Set[Hashable] = set()
+        for bucket, band_key in zip(self._buckets, self._band_keys(sig)):
+            shortlist.update(bucket.get(band_key, ()))
+
+        results = []
+        for key in shortlist:
+            other = self._slot_signature(self._slot_of[key])
+            score = sum(1 for a, b in zip(sig, other) if a == b) / self.num_perm
+            if score >= threshold:
+                results.append((key, score))
+
+        results.sort(key=lambda r: r[1], reverse=True)
+        return results
+
+
+# Process-wide singleton used when DEDUP_STRATEGY == "minhash"
+minhash_index = MinHashIndex()
@@ -1,65 +1,208 @@
 """
 Normalizer
 Takes raw signal dicts from collectors and persists them as Signal rows in DB.
+
+Ingestion is set-based: existing (platform, source_id) keys are resolved in one
+batched lookup, new rows go in with a single multi-row INSERT ... ON CONFLICT,
+and signals that were already known get their engagement counters refreshed
+in one bulk UPDATE (propagated to the candidates they were merged into).
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from datetime import datetime, timezone
+from sqlalchemy import tuple_, update, bindparam
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
-from app.trend_detector.models import Signal
+from app.trend_detector.models import Signal, Candidate, CandidateSignal
+from app.utils.text import detect_language
+
+
+ENGAGEMENT_FIELDS = ("views", "likes", "reshares", "comments")
 
 
 class Normalizer:
     """Normalize raw collector output into Signal DB rows"""
 
+    # (platform, source_id) pairs per IN (...) lookup — keeps us under SQLite's bound-parameter limit
+    KEY_BATCH_SIZE = 400
+
+    def __init__(self):
+        # Candidates whose totals changed during the last process() call (fed back into scoring)
+        self.last_refreshed_candidate_ids: List[int] = []
+
+    def _build_row(self, raw: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+        """Map a raw collector dict onto td_signals columns (language tagged here, once)"""
+        raw_data = raw.get("raw_data")
+        hint = raw.get("lang") or (raw_data.get("lang") if isinstance(raw_data, dict) else None)
+        return {
+            "platform": raw.get("platform", "unknown"),
+            "source_id": raw.get("source_id", ""),
+            "title": (raw.get("title") or "")[:1000],
+            "content": raw.get("content"),
+            "url": raw.get("url"),
+            "media_url": raw.get("media_url"),
+            "media_text": raw.get("media_text"),
+            "keywords": raw.get("keywords"),
+            "author": raw.get("author"),
+            "published_at": raw.get("published_at"),
+            "views": raw.get("views", 0) or 0,
+            "likes": raw.get("likes", 0) or 0,
+            "reshares": raw.get("reshares", 0) or 0,
+            "comments": raw.get("comments", 0) or 0,
+            "has_media": raw.get("has_media", False),
+            "lang": detect_language(raw.get("title"), raw.get("content"), hint=hint),
+            "raw_data": raw_data,
+            "is_processed": False,
+            "created_at": now,
+        }
+
+    def _lookup_existing(self, keys: List[Tuple[str, str]], db: Session) -> Dict[Tuple[str, str], Any]:
+        """Resolve which (platform, source_id) keys are already stored — one query per key batch"""
+        existing = {}
+        for i in range(0, len(keys), self.KEY_BATCH_SIZE):
+            chunk = keys[i:i + self.KEY_BATCH_SIZE]
+            rows = (
+                db.query(
+                    Signal.id, Signal.platform, Signal.source_id, Signal.is_processed,
+                    Signal.views, Signal.likes, Signal.reshares, Signal.comments,
+                )
+                .filter(tuple_(Signal.platform, Signal.source_id).in_(chunk))
+                .all()
+            )
+            for row in rows:
+                existing[(row.platform, row.source_id)] = row
+        return existing
+
+    def _insert_new(self, rows: List[Dict[str, Any]], db: Session) -> List[int]:
+        """
+        Insert new signals with a single multi-row INSERT ... ON CONFLICT DO NOTHING.
+        RETURNING hands back the new ids, so no per-row refresh is needed.
+        The conflict clause only guards against a concurrent pipeline inserting the same key.
+        """
+        if not rows:
+            return []
+        stmt = sqlite_insert(Signal).on_conflict_do_nothing().returning(Signal.id)
+        return [row.id for row in db.execute(stmt, rows)]
+
+    def _load_signals(self, ids: List[int], db: Session) -> List[Signal]:
+        """Load freshly inserted signals in id batches (one SELECT per batch, not per row)"""
+        signals = []
+        for i in range(0, len(ids), self.KEY_BATCH_SIZE):
+            chunk = ids[i:i + self.KEY_BATCH_SIZE]
+            signals.extend(db.query(Signal).filter(Signal.id.in_(chunk)).order_by(Signal.id).all())
+        return signals
+
+    def _refresh_engagement(self, rows: List[Dict[str, Any]], existing: Dict[Tuple[str, str], Any], db: Session) -> List[int]:
+        """
+        Update engagement counters of already-known signals in one bulk UPDATE.
+        For signals already merged into a candidate, the delta is added to that
+        candidate's totals so re-collected viral posts move its score.
+        Returns the ids of candidates whose totals changed.
+        """
+        signal_updates = []
+        deltas: Dict[int, Dict[str, int]] = {}
+
+        for row in rows:
+            known = existing[(row["platform"], row["source_id"])]
+            diff = {f: row[f] - (getattr(known, f) or 0) for f in ENGAGEMENT_FIELDS}
+            if not any(diff.values()):
+                continue
+            signal_updates.append({"id": known.id, **{f: row[f] for f in ENGAGEMENT_FIELDS}})
+            if known.is_processed:
+                deltas[known.id] = diff
+
+        if not signal_updates:
+            return []
+
+        # ORM bulk UPDATE by primary key → single executemany
+        db.execute(update(Signal), signal_updates)
+
+        if not deltas:
+            return []
+
+        # Map signal ids → owning non-expired candidate through td_candidate_signals (indexed on signal_id)
+        owner: Dict[int, int] = {}
+        signal_ids = list(deltas.keys())
+        for i in range(0, len(signal_ids), self.KEY_BATCH_SIZE):
+            chunk = signal_ids[i:i + self.KEY_BATCH_SIZE]
+            rows = (
+                db.query(CandidateSignal.signal_id, CandidateSignal.candidate_id)
+                .join(Candidate, Candidate.id == CandidateSignal.candidate_id)
+                .filter(CandidateSignal.signal_id.in_(chunk), Candidate.status != "expired")
+                .all()
+            )
+            owner.update(rows)
+
+        candidate_deltas: Dict[int, Dict[str, int]] = {}
+        for signal_id, diff in deltas.items():
+            cand_id = owner.get(signal_id)
+            if cand_id is None:
+                continue
+            acc = candidate_deltas.setdefault(cand_id, {f: 0 for f in ENGAGEMENT_FIELDS})
+            for f in ENGAGEMENT_FIELDS:
+                acc[f] += diff[f]
+
+        # Signal deltas that cancel out leave the candidate untouched (and clean)
+        candidate_deltas = {cid: d for cid, d in candidate_deltas.items() if any(d.values())}
+        if not candidate_deltas:
+            return []
+
+        table = Candidate.__table__
+        now = datetime.now(timezone.utc)
+        stmt = (
+            table.update()
+            .where(table.c.id == bindparam("cand_id"))
+            .values(
+                views_total=table.c.views_total + bindparam("d_views"),
+                likes_total=table.c.likes_total + bindparam("d_likes"),
+                reshares_total=table.c.reshares_total + bindparam("d_reshares"),
+                comments_total=table.c.comments_total + bindparam("d_comments"),
+                # Core UPDATE bypasses the ORM listener that bumps this on attribute changes
+                metrics_version=table.c.metrics_version + 1,
+                updated_at=now,
+            )
+        )
+        db.execute(stmt, [
+            {"cand_id": cand_id, **{f"d_{f}": d[f] for f in ENGAGEMENT_FIELDS}}
+            for cand_id, d in candidate_deltas.items()
+        ])
+        return list(candidate_deltas.keys())
+
     def process(self, raw_signals: List[Dict[str, Any]], db: Session) -> List[Signal]:
         """
         Persist raw signals into the td_signals table.
-        Skips signals that already exist (by platform + source_id).
+        New signals are bulk-inserted; already-known ones (by platform + source_id)
+        get their engagement counters refreshed instead of being skipped.
         Returns list of newly created Signal objects.
         """
-        new_signals = []
+        self.last_refreshed_candidate_ids = []
+        now = datetime.now(timezone.utc)
 
+        # Collapse repeats within the batch — last occurrence carries the freshest counters
+        batch: Dict[Tuple[str, str], Dict[str, Any]] = {}
         for raw in raw_signals:
-            platform = raw.get("platform", "unknown")
-            source_id = raw.get("source_id", "")
-
-            # Skip if already ingested
-            existing = (
-                db.query(Signal)
-                .filter(Signal.platform == platform, Signal.source_id == source_id)
-                .first()
-            )
-            if existing:
-                continue
+            row = self._build_row(raw, now)
+            batch[(row["platform"], row["source_id"])] = row
 
-            signal = Signal(
-                platform=platform,
-                source_id=source_id,
-                title=(raw.get("title") or "")[:1000],
-                content=raw.get("content"),
-                url=raw.get("url"),
-                media_url=raw.get("media_url"),
-                media_text=raw.get("media_text"),
-                keywords=raw.get("keywords"),
-                author=raw.get("author"),
-                published_at=raw.get("published_at"),
-                views=raw.get("views", 0),
-                likes=raw.get("likes", 0),
-                reshares=raw.get("reshares", 0),
-                comments=raw.get("comments", 0),
-                has_media=raw.get("has_media", False),
-                raw_data=raw.get("raw_data"),
-                is_processed=False,
-                created_at=datetime.now(timezone.utc),
-            )
-            db.add(signal)
-            new_signals.append(signal)
+        if not batch:
+            print("[Normalizer] Ingested 0 new signals (skipped 0 duplicates)")
+            return []
+
+        existing = self._lookup_existing(list(batch.keys()), db)
+        new_rows = [row for key, row in batch.items() if key not in existing]
+        known_rows = [row for key, row in batch.items() if key in existing]
+
+        new_ids = self._insert_new(new_rows, db)
+        refreshed = self._refresh_engagement(known_rows, existing, db) if known_rows else []
 
-        if new_signals:
+        if new_ids or known_rows:
             db.commit()
-            for s in new_signals:
-                db.refresh(s)
 
-        print(f"[Normalizer] Ingested {len(new_signals)} new signals (skipped {len(raw_signals) - len(new_signals)} duplicates)")
+        new_signals = self._load_signals(new_ids, db)
+        self.last_refreshed_candidate_ids = refreshed
+        print(
+            f"[Normalizer] Ingested {len(new_signals)} new signals "
+            f"(skipped {len(raw_signals) - len(new_signals)} duplicates, "
+            f"refreshed engagement on {len(refreshed)} candidates)"
+        )
         return new_signals
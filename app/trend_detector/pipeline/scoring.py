@@ -1,81 +1,215 @@
 """
 Scoring Engine
 Calculates priority score for each candidate based on configurable weighted metrics.
+
+Weights and thresholds come from config.py, overridden by the active rows of
+td_scoring_config (editable via admin):
+  - platform NULL:  metric = weight name ("views", "cross_platform", ...), weight = points
+  - platform set:   metric = "<platform>:<metric>" (metric is unique), threshold = value to exceed;
+                    "<platform>:trending_source" marks a trending aggregator
+The effective settings are cached as a ScoringSnapshot tagged with the table's
+version (row count + last updated_at) and rebuilt only when that changes.
+
+A batch is scored as NumPy arrays: one (candidates × metrics) comparison against
+the thresholds of each candidate's primary platform, dotted with the weights.
+Candidates whose metrics_version still equals their scored_version are skipped
+unless the settings changed since the previous pass.
 """
-from typing import List
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
 
-from app.trend_detector.models import Candidate
+from app.trend_detector.models import Candidate, ScoringConfig
 from app.trend_detector.config import (
     SCORING_WEIGHTS,
     PLATFORM_THRESHOLDS,
 )
 
 
-class ScoringEngine:
-    """Calculate weighted score for candidates based on engagement metrics"""
-
-    def _get_thresholds(self, platform: str) -> dict:
-        """Get thresholds for a specific platform, fallback to reddit defaults"""
-        return PLATFORM_THRESHOLDS.get(platform, PLATFORM_THRESHOLDS.get("reddit", {}))
-
-    def _score_candidate(self, candidate: Candidate) -> float:
+# Engagement metrics compared against per-platform thresholds, in array column order
+METRICS = ("views", "likes", "reshares", "comments")
+
+# Platform whose thresholds apply to platforms without their own
+DEFAULT_PLATFORM = "reddit"
+
+
+class ScoringSnapshot:
+    """Effective weights/thresholds in array form for one td_scoring_config version"""
+
+    def __init__(self, weights: Dict[str, float], thresholds: Dict[str, dict], version: Tuple = ()):
+        self.version = version
+        self.weights = weights
+        self.thresholds = thresholds
+
+        self._platform_rows = {platform: i for i, platform in enumerate(thresholds)}
+        self._default_row = self._platform_rows.get(DEFAULT_PLATFORM, 0)
+        self._trending = {p for p, t in thresholds.items() if t.get("is_trending_source")}
+        self._parsed: Dict[str, Tuple[int, bool]] = {}   # platforms string → (threshold row, trending)
+
+        self.threshold_matrix = np.array(
+            [[float(t.get(m, 0)) for m in METRICS] for t in thresholds.values()] or [[0.0] * len(METRICS)]
+        )
+        self.metric_weights = np.array([float(weights.get(m, 0)) for m in METRICS])
+
+    @classmethod
+    def from_rows(cls, rows: List[ScoringConfig], version: Tuple = ()) -> "ScoringSnapshot":
+        """config.py defaults overlaid with active td_scoring_config rows"""
+        weights = {k: float(v) for k, v in SCORING_WEIGHTS.items()}
+        thresholds = {p: dict(t) for p, t in PLATFORM_THRESHOLDS.items()}
+        for row in rows:
+            if not row.is_active:
+                continue
+            if row.platform:
+                metric = row.metric.rsplit(":", 1)[-1]
+                platform_thresholds = thresholds.setdefault(row.platform, dict(thresholds.get(DEFAULT_PLATFORM, {})))
+                if metric == "trending_source":
+                    platform_thresholds["is_trending_source"] = True
+                else:
+                    platform_thresholds[metric] = float(row.threshold or 0)
+            else:
+                weights[row.metric] = float(row.weight or 0)
+        return cls(weights, thresholds, version)
+
+    def platform_features(self, platforms: Optional[str]) -> Tuple[int, bool]:
+        """(threshold row of the primary platform, seen on a trending source) — cached per string"""
+        features = self._parsed.get(platforms)
+        if features is None:
+            names = [p.strip() for p in (platforms or DEFAULT_PLATFORM).split(",") if p.strip()] or [DEFAULT_PLATFORM]
+            features = (
+                self._platform_rows.get(names[0], self._default_row),
+                any(name in self._trending for name in names),
+            )
+            self._parsed[platforms] = features
+        return features
+
+    def score_rows(self, rows: List[tuple]) -> np.ndarray:
         """
-        Calculate score for a single candidate.
-        Each metric that exceeds its platform threshold earns the configured weight points.
-        Cross-platform bonus if seen on 2+ platforms.
-        Trending source bonus for aggregator platforms (e.g. Google Trends).
+        Scores for (views, likes, reshares, comments, platform_count, platforms, media_url) tuples.
+        Each metric that exceeds its primary-platform threshold earns the metric's weight;
+        plus cross-platform (2+ platforms), trending-source and media bonuses.
         """
-        score = 0.0
-
-        # Get all platforms this candidate appeared on
-        platforms = [p.strip() for p in (candidate.platforms or "reddit").split(",") if p.strip()]
-        primary_platform = platforms[0]
-        thresholds = self._get_thresholds(primary_platform)
-
-        # Views
-        if candidate.views_total > thresholds.get("views", 0):
-            score += SCORING_WEIGHTS.get("views", 0)
-
-        # Likes
-        if candidate.likes_total > thresholds.get("likes", 0):
-            score += SCORING_WEIGHTS.get("likes", 0)
-
-        # Reshares
-        if candidate.reshares_total > thresholds.get("reshares", 0):
-            score += SCORING_WEIGHTS.get("reshares", 0)
-
-        # Comments
-        if candidate.comments_total > thresholds.get("comments", 0):
-            score += SCORING_WEIGHTS.get("comments", 0)
+        if not rows:
+            return np.zeros(0)
+        metrics = np.array([r[:4] for r in rows], dtype=np.float64)
+        np.nan_to_num(metrics, copy=False)   # NULL totals → 0
+        features = [self.platform_features(r[5]) for r in rows]
+        platform_rows = np.fromiter((f[0] for f in features), dtype=np.intp, count=len(rows))
+        trending = np.fromiter((f[1] for f in features), dtype=bool, count=len(rows))
+        cross_platform = np.fromiter(((r[4] or 0) >= 2 for r in rows), dtype=bool, count=len(rows))
+        has_media = np.fromiter((bool(r[6]) for r in rows), dtype=bool, count=len(rows))
+
+        scores = (metrics > self.threshold_matrix[platform_rows]) @ self.metric_weights
+        scores += cross_platform * self.weights.get("cross_platform", 0)
+        scores += trending * self.weights.get("trending_source", 0)
+        scores += has_media * self.weights.get("has_media", 0)
+        return scores
 
-        # Cross-platform bonus
-        if candidate.platform_count and candidate.platform_count >= 2:
-            score += SCORING_WEIGHTS.get("cross_platform", 0)
 
-        # Trending source bonus (Google Trends, etc.)
-        for plat in platforms:
-            plat_config = PLATFORM_THRESHOLDS.get(plat, {})
-            if plat_config.get("is_trending_source"):
-                score += SCORING_WEIGHTS.get("trending_source", 0)
-                break  # Only award once
-
-        # Media bonus
-        if candidate.media_url:
-            score += SCORING_WEIGHTS.get("has_media", 0)
-
-        return score
+class ScoringEngine:
+    """Calculate weighted score for candidates based on engagement metrics"""
 
-    def process(self, candidates: List[Candidate], db: Session) -> List[Candidate]:
+    RESCORE_BATCH_SIZE = 20_000   # candidates per keyset page in rescore_all
+
+    # Shared by every engine in the process (pipeline runs, watchlist, admin rescore)
+    _snapshot: Optional[ScoringSnapshot] = None
+    _processed_version: Optional[Tuple] = None   # settings version of the previous process() pass
+
+    @staticmethod
+    def _config_version(db: Session) -> Tuple:
+        count, last_update = db.query(func.count(ScoringConfig.id), func.max(ScoringConfig.updated_at)).one()
+        return (count, str(last_update))
+
+    def snapshot(self, db: Session) -> ScoringSnapshot:
+        """Effective settings — re-read from td_scoring_config only when its version changed"""
+        version = self._config_version(db)
+        snapshot = ScoringEngine._snapshot
+        if snapshot is None or snapshot.version != version:
+            rows = db.query(ScoringConfig).all()
+            snapshot = ScoringSnapshot.from_rows(rows, version)
+            ScoringEngine._snapshot = snapshot
+            print(f"[ScoringEngine] Loaded scoring config ({len(rows)} overrides)")
+        return snapshot
+
+    @staticmethod
+    def _metric_row(candidate: Candidate) -> tuple:
+        return (
+            candidate.views_total, candidate.likes_total, candidate.reshares_total, candidate.comments_total,
+            candidate.platform_count, candidate.platforms, candidate.media_url,
+        )
+
+    def process(self, candidates: List[Candidate], db: Session, commit: bool = True) -> List[Candidate]:
         """
-        Score all provided candidates and update their score in the DB.
+        Score the provided candidates whose metrics changed since they were last scored
+        and update their score in the DB (all of them after a settings change).
+        commit=False leaves the new scores pending for a caller that commits once per cycle.
         Returns candidates sorted by score descending.
         """
-        for candidate in candidates:
-            candidate.score = self._score_candidate(candidate)
-
-        db.commit()
+        snapshot = self.snapshot(db)
+        if snapshot.version != ScoringEngine._processed_version:
+            dirty = candidates
+        else:
+            dirty = [c for c in candidates if c.scored_version != c.metrics_version]
+        ScoringEngine._processed_version = snapshot.version
+
+        scores = snapshot.score_rows([self._metric_row(c) for c in dirty])
+        for candidate, score in zip(dirty, scores.tolist()):
+            if candidate.score != score:
+                candidate.score = score
+            candidate.scored_version = candidate.metrics_version
+
+        if commit and dirty:
+            db.commit()
 
         scored = sorted(candidates, key=lambda c: c.score, reverse=True)
-        print(f"[ScoringEngine] Scored {len(scored)} candidates — top score: {scored[0].score if scored else 0}")
+        print(
+            f"[ScoringEngine] Scored {len(dirty)} candidates, skipped {len(candidates) - len(dirty)} unchanged "
+            f"— top score: {scored[0].score if scored else 0}"
+        )
         return scored
+
+    def rescore_all(self, db: Session) -> Dict:
+        """
+        Re-score every stored candidate with the current settings (after an admin edit).
+        Reads plain column tuples in id-ordered pages and writes back only changed scores.
+        """
+        start = time.perf_counter()
+        snapshot = self.snapshot(db)
+        columns = (
+            Candidate.views_total, Candidate.likes_total, Candidate.reshares_total, Candidate.comments_total,
+            Candidate.platform_count, Candidate.platforms, Candidate.media_url,
+            Candidate.id, Candidate.score, Candidate.updated_at,
+        )
+
+        total = changed = 0
+        last_id = 0
+        while True:
+            rows = (
+                db.query(*columns)
+                .filter(Candidate.id > last_id)
+                .order_by(Candidate.id)
+                .limit(self.RESCORE_BATCH_SIZE)
+                .all()
+            )
+            if not rows:
+                break
+            last_id = rows[-1][7]
+            total += len(rows)
+
+            scores = snapshot.score_rows(rows).tolist()
+            updates = [
+                # updated_at passed through: a re-weighting is not activity on the candidate
+                {"id": row[7], "score": score, "updated_at": row[9]}
+                for row, score in zip(rows, scores)
+                if row[8] != score
+            ]
+            if updates:
+                db.execute(update(Candidate), updates)
+                changed += len(updates)
+
+        db.commit()
+        seconds = round(time.perf_counter() - start, 3)
+        print(f"[ScoringEngine] Re-scored {total} candidates in {seconds}s — {changed} changed")
+        return {"candidates": total, "changed": changed, "seconds": seconds}
@@ -3,9 +3,17 @@ X Validation
 Checks candidates against X/Twitter to measure real-time traction.
 Uses custom X API server (POST /api/search) for validation searches.
 Assigns verdict: HOT / EARLY / NOT_YET
+
+Searches for a batch run concurrently (VALIDATION_CONCURRENCY at a time, within the
+X_API_REQUESTS_PER_MINUTE budget); XValidation rows and watchlist entries are
+written afterwards and committed once for the whole batch, on the DB executor thread.
+
+Search results are cached by normalized query (TTLCache, optional Redis tier), and
+identical queries in flight at the same time share one request.
 """
+import asyncio
 import aiohttp
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timezone, timedelta
 from sqlalchemy.orm import Session
 
@@ -15,23 +23,77 @@ from app.trend_detector.config import (
     VALIDATION_THRESHOLDS,
     WATCHLIST_MAX_CHECKS,
     WATCHLIST_CHECK_INTERVAL,
+    MAX_VALIDATIONS_PER_BATCH,
+    VALIDATION_CONCURRENCY,
+    X_API_REQUESTS_PER_MINUTE,
+    VALIDATION_CACHE_TTL,
+    VALIDATION_CACHE_MAX_ENTRIES,
+    VALIDATION_CACHE_REDIS,
 )
+from app.trend_detector.cache import TTLCache
+from app.trend_detector.concurrency import RateBudget, bounded_gather
+from app.trend_detector.db_executor import db_executor
+from app.trend_detector.http_client import http_client
+from app.utils.text import normalize_arabic
+
+
+# Tweet fields _analyze_results reads — all that is kept in the search cache
+TWEET_FIELDS = ("screen_name", "favorite_count", "retweet_count", "reply_count", "created_at")
 
 
 class XValidator:
     """Validate candidates by checking activity on X via custom API"""
 
     REQUEST_TIMEOUT = 60   # seconds per search request
-    MAX_VALIDATIONS_PER_BATCH = 15  # Max candidates to validate per cycle
+    MAX_VALIDATIONS_PER_BATCH = MAX_VALIDATIONS_PER_BATCH  # Max candidates to validate per cycle
+    CONCURRENCY = VALIDATION_CONCURRENCY
+
+    # Shared by every XValidator (pipeline run + watchlist re-check hit the same server)
+    rate_budget = RateBudget(X_API_REQUESTS_PER_MINUTE)
+    search_cache = TTLCache(
+        "td:x_search",
+        # Capped below the watchlist interval so a re-check never reuses the previous check's results
+        ttl_seconds=min(VALIDATION_CACHE_TTL, WATCHLIST_CHECK_INTERVAL * 60 - 60),
+        max_entries=VALIDATION_CACHE_MAX_ENTRIES,
+        use_redis=VALIDATION_CACHE_REDIS,
+    )
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}   # normalized query → search in progress
 
     def is_configured(self) -> bool:
         return bool(X_API_SERVER_URL)
 
-    async def _search_x(self, query: str, session: aiohttp.ClientSession) -> List[dict]:
-        """Search recent tweets on X via custom API POST /api/search"""
+    async def _search_cached(self, query: str, session: aiohttp.ClientSession) -> List[dict]:
+        """_search_x behind the TTL cache; concurrent identical queries wait on one request"""
+        key = normalize_arabic(query)
+        cached = self.search_cache.get(key)
+        if cached is not None:
+            return cached
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(query, key, session))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t: self._inflight.pop(key, None))
+        tweets = await asyncio.shield(task)
+        return tweets if tweets is not None else []
+
+    async def _fetch(self, query: str, key: str, session: aiohttp.ClientSession) -> Optional[List[dict]]:
+        tweets = await self._search_x(query, session)
+        if tweets is None:
+            return None  # failed searches are not cached
+        tweets = [{f: t.get(f) for f in TWEET_FIELDS} for t in tweets]
+        self.search_cache.set(key, tweets)
+        return tweets
+
+    async def _search_x(self, query: str, session: aiohttp.ClientSession) -> Optional[List[dict]]:
+        """Search recent tweets on X via custom API POST /api/search (None if the request failed)"""
+        url = f"{X_API_SERVER_URL}/api/search"
+        await self.rate_budget.acquire(url)
         try:
             async with session.post(
-                f"{X_API_SERVER_URL}/api/search",
+                url,
                 json={
                     "query": query,
                     "type": "Latest",
@@ -41,18 +103,18 @@ class XValidator:
             ) as resp:
                 if resp.status != 200:
                     print(f"[XValidator] Search API error: {resp.status}")
-                    return []
+                    return None
 
                 data = await resp.json()
                 if data.get("error"):
                     print(f"[XValidator] Search error: {data['error']}")
-                    return []
+                    return None
 
                 return data.get("tweets", [])
 
         except Exception as e:
             print(f"[XValidator] Search request error: {e}")
-            return []
+            return None
 
     def _build_search_query(self, candidate: Candidate) -> str:
         """Build an X search query from candidate title (unique per candidate)"""
@@ -167,30 +229,53 @@ class XValidator:
 
         return "NOT_YET"
 
-    async def validate(self, candidates: List[Candidate], db: Session) -> List[Candidate]:
+    async def validate(
+        self,
+        candidates: List[Candidate],
+        db: Session,
+        commit: bool = True,
+        skip_unchanged: bool = False,
+        max_validations: Optional[int] = None,
+    ) -> Tuple[List[Candidate], int]:
         """
         Validate a list of candidates against X.
         - HOT → status = 'hot', proceed to classifier
         - EARLY → add to watchlist
         - NOT_YET → status = 'not_yet', loop back for re-scoring later
         
-        Returns only HOT candidates.
+        commit=False leaves the writes pending for a caller that commits once per cycle.
+        skip_unchanged=True drops candidates whose metrics have not changed since their
+        last verdict (the watchlist re-checks on a timer and keeps the default).
+        max_validations caps the X searches of this call (default MAX_VALIDATIONS_PER_BATCH);
+        the streaming pipeline passes what is left of the cycle's budget.
+        Returns (HOT candidates, X searches spent by this call) — the count is per call
+        because collector pipelines and the watchlist share this validator concurrently.
         """
+        if skip_unchanged:
+            changed = [c for c in candidates if c.validated_version != c.metrics_version]
+            if len(changed) < len(candidates):
+                print(f"[XValidator] Skipping {len(candidates) - len(changed)} candidates unchanged since their last verdict")
+            candidates = changed
+            if not candidates:
+                return [], 0
+
         if not self.is_configured():
             print("[XValidator] Not configured — using score-only fallback")
             hot_candidates = []
+            early_candidates = []
             for candidate in candidates:
+                candidate.validated_version = candidate.metrics_version
                 if candidate.score >= VALIDATION_THRESHOLDS["hot"]["min_score"]:
                     candidate.status = "hot"
                     hot_candidates.append(candidate)
                 elif candidate.score >= VALIDATION_THRESHOLDS["early"]["min_score"]:
                     candidate.status = "early"
-                    self._add_to_watchlist(candidate, db)
+                    early_candidates.append(candidate)
                 else:
                     candidate.status = "not_yet"
-            db.commit()
+            await db_executor.run(self._write, early_candidates, db, commit)
             print(f"[XValidator] Score-only: {len(hot_candidates)} HOT, {len(candidates) - len(hot_candidates)} deferred")
-            return hot_candidates
+            return hot_candidates, 0
 
         hot_candidates = []
 
@@ -203,64 +288,94 @@ class XValidator:
         for c in candidates:
             if c.score < early_min:
                 c.status = "not_yet"
+                c.validated_version = c.metrics_version
 
         # Limit batch size to avoid long-running validation cycles
-        to_validate = worth_validating[:self.MAX_VALIDATIONS_PER_BATCH]
+        limit = self.MAX_VALIDATIONS_PER_BATCH if max_validations is None else max(0, max_validations)
+        to_validate = worth_validating[:limit]
         if skip_count > 0 or len(worth_validating) > len(to_validate):
             print(f"[XValidator] Validating {len(to_validate)} of {len(candidates)} candidates (skipped {skip_count} low-score, deferred {max(0, len(worth_validating) - len(to_validate))} overflow)")
 
-        async with aiohttp.ClientSession() as session:
-            for candidate in to_validate:
-                query = self._build_search_query(candidate)
-                tweets = await self._search_x(query, session)
-                metrics = self._analyze_results(tweets)
-                verdict = self._decide_verdict(metrics, candidate.score)
-
-                # Save validation record
-                validation = XValidation(
-                    candidate_id=candidate.id,
-                    search_query=query,
-                    post_count=metrics["post_count"],
-                    unique_authors=metrics["unique_authors"],
-                    total_engagement=metrics["total_engagement"],
-                    post_density_per_hour=metrics["post_density_per_hour"],
-                    verdict=verdict,
-                    raw_data={
-                        "tweet_count_raw": len(tweets),
-                        "query_used": query,
-                    },
-                    checked_at=datetime.now(timezone.utc),
-                )
-                db.add(validation)
-
-                # Update candidate status
-                candidate.status = verdict.lower()
-
-                if verdict == "HOT":
-                    hot_candidates.append(candidate)
-                elif verdict == "EARLY":
-                    self._add_to_watchlist(candidate, db)
-
-        db.commit()
-        print(f"[XValidator] Validated {len(candidates)} → {len(hot_candidates)} HOT")
-        return hot_candidates
-
-    def _add_to_watchlist(self, candidate: Candidate, db: Session):
-        """Add an EARLY candidate to the watchlist for re-checking"""
-        existing = (
-            db.query(Watchlist)
-            .filter(Watchlist.candidate_id == candidate.id, Watchlist.is_active == True)
-            .first()
+        session = http_client.session()
+        results = await bounded_gather(
+            (self._check(candidate, session) for candidate in to_validate),
+            self.CONCURRENCY,
         )
-        if existing:
-            return
 
-        watchlist_entry = Watchlist(
-            candidate_id=candidate.id,
-            check_count=0,
-            max_checks=WATCHLIST_MAX_CHECKS,
-            next_check_at=datetime.now(timezone.utc) + timedelta(minutes=WATCHLIST_CHECK_INTERVAL),
-            is_active=True,
-            created_at=datetime.now(timezone.utc),
+        # All DB writes happen after the searches, in input order, with one commit on the DB thread
+        early_candidates = []
+        for candidate, (query, tweet_count, metrics, verdict) in zip(to_validate, results):
+            # Save validation record
+            validation = XValidation(
+                candidate_id=candidate.id,
+                search_query=query,
+                post_count=metrics["post_count"],
+                unique_authors=metrics["unique_authors"],
+                total_engagement=metrics["total_engagement"],
+                post_density_per_hour=metrics["post_density_per_hour"],
+                verdict=verdict,
+                raw_data={
+                    "tweet_count_raw": tweet_count,
+                    "query_used": query,
+                },
+                checked_at=datetime.now(timezone.utc),
+            )
+            db.add(validation)
+
+            # Update candidate status
+            candidate.status = verdict.lower()
+            candidate.validated_version = candidate.metrics_version
+
+            if verdict == "HOT":
+                hot_candidates.append(candidate)
+            elif verdict == "EARLY":
+                early_candidates.append(candidate)
+
+        await db_executor.run(self._write, early_candidates, db, commit)
+        cache = self.search_cache.stats()
+        print(
+            f"[XValidator] Validated {len(candidates)} → {len(hot_candidates)} HOT "
+            f"(search cache: {cache['hits'] + cache['redis_hits']} hits / {cache['misses']} misses)"
         )
-        db.add(watchlist_entry)
+        return hot_candidates, len(to_validate)
+
+    async def _check(self, candidate: Candidate, session: aiohttp.ClientSession) -> Tuple[str, int, dict, str]:
+        """Search + analyze one candidate without touching the DB → (query, tweet count, metrics, verdict)"""
+        query = self._build_search_query(candidate)
+        tweets = await self._search_cached(query, session)
+        metrics = self._analyze_results(tweets)
+        return query, len(tweets), metrics, self._decide_verdict(metrics, candidate.score)
+
+    def _write(self, early_candidates: List[Candidate], db: Session, commit: bool):
+        """Blocking part of validate(): watchlist lookup/inserts and the commit"""
+        self._add_to_watchlist(early_candidates, db)
+        if commit:
+            db.commit()
+
+    def _add_to_watchlist(self, candidates: List[Candidate], db: Session):
+        """Add EARLY candidates to the watchlist for re-checking (one lookup for the whole batch)"""
+        if not candidates:
+            return
+        already_watched = {
+            cand_id for (cand_id,) in
+            db.query(Watchlist.candidate_id)
+            .filter(
+                Watchlist.candidate_id.in_([c.id for c in candidates]),
+                Watchlist.is_active == True,
+            )
+            .all()
+        }
+
+        now = datetime.now(timezone.utc)
+        for candidate in candidates:
+            if candidate.id in already_watched:
+                continue
+            already_watched.add(candidate.id)
+            db.add(Watchlist(
+                candidate_id=candidate.id,
+                check_count=0,
+                max_checks=WATCHLIST_MAX_CHECKS,
+                next_check_at=now + timedelta(minutes=WATCHLIST_CHECK_INTERVAL),
+                is_active=True,
+                created_at=now,
+            ))
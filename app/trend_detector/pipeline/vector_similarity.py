@@ -0,0 +1,184 @@
+"""
+Vector Similarity Engine
+Character n-gram TF-IDF cosine similarity for the Deduplicator's "vector" strategy.
+
+Titles are Arabic-normalized, split into padded character n-grams and hashed
+(mmh3, signed feature hashing) into a fixed DEDUP_VECTOR_DIM-wide float32 vector
+with sublinear term frequency. Active candidates live as rows of one NumPy matrix;
+IDF is derived from the rows' document frequencies at query time, so a whole
+collection cycle is scored against every active candidate with a single
+(signals × dim) @ (dim × candidates) product instead of a Python loop.
+
+Character n-grams survive what word matching does not: clitics and prefixes
+(ال / و / ب), plural and feminine suffixes, hashtags glued to words.
+"""
+import math
+from typing import Dict, Hashable, List, Tuple
+
+import mmh3
+import numpy as np
+
+from app.trend_detector.config import (
+    DEDUP_VECTOR_DIM,
+    DEDUP_VECTOR_NGRAM,
+)
+from app.trend_detector.pipeline.candidate_index import CandidateIndex
+from app.utils.text import tokenize
+
+
+def char_ngrams(text: str, n: int = DEDUP_VECTOR_NGRAM) -> Dict[str, int]:
+    """Counts of space-padded character n-grams per word of the normalized text"""
+    counts: Dict[str, int] = {}
+    for word in tokenize(text):
+        padded = f" {word} "
+        if len(padded) <= n:
+            counts[padded] = counts.get(padded, 0) + 1
+            continue
+        for i in range(len(padded) - n + 1):
+            gram = padded[i:i + n]
+            counts[gram] = counts.get(gram, 0) + 1
+    return counts
+
+
+class VectorIndex(CandidateIndex):
+    """Dense hashed TF matrix over active candidates, cosine-scored in batches"""
+
+    def __init__(self, dim: int = DEDUP_VECTOR_DIM, ngram: int = DEDUP_VECTOR_NGRAM):
+        super().__init__()
+        self.dim = dim
+        self.ngram = ngram
+        self._matrix = np.zeros((0, dim), dtype=np.float32)   # one sublinear-TF row per slot
+        self._df = np.zeros(dim, dtype=np.float32)            # active rows with a non-zero in each column
+        self._slot_of: Dict[Hashable, int] = {}
+        self._key_of: Dict[int, Hashable] = {}
+        self._free_slots: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def clear(self):
+        self._matrix = np.zeros((0, self.dim), dtype=np.float32)
+        self._df[:] = 0
+        self._slot_of.clear()
+        self._key_of.clear()
+        self._free_slots.clear()
+
+    # ── Vectorization ──────────────────────────────────────────
+
+    def vectorize(self, texts: List[str]) -> np.ndarray:
+        """Signed feature-hashed sublinear TF vectors, one row per text"""
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts = char_ngrams(text, self.ngram)
+            if not counts:
+                continue
+            cols = np.empty(len(counts), dtype=np.int64)
+            vals = np.empty(len(counts), dtype=np.float32)
+            for i, (gram, count) in enumerate(counts.items()):
+                h = mmh3.hash(gram, signed=False)
+                cols[i] = h % self.dim
+                sign = -1.0 if h >> 31 else 1.0
+                vals[i] = sign * (1.0 + math.log(count))
+            np.add.at(out[row], cols, vals)
+        return out
+
+    def _idf(self) -> np.ndarray:
+        n = len(self._slot_of)
+        return (np.log((1.0 + n) / (1.0 + self._df)) + 1.0).astype(np.float32)
+
+    @staticmethod
+    def _normalize_rows(m: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(m, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return m / norms
+
+    # ── Index maintenance (same interface as CandidateIndex) ───
+
+    def add(self, key: Hashable, features: str):
+        """Insert or replace a candidate; features is its title"""
+        if key in self._slot_of:
+            self.remove(key)
+        self._store(key, self.vectorize([features])[0])
+
+    def _store(self, key: Hashable, row: np.ndarray):
+        if not row.any():
+            return
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            slot = len(self._slot_of)
+            if slot >= self._matrix.shape[0]:
+                grown = np.zeros((max(64, self._matrix.shape[0] * 2), self.dim), dtype=np.float32)
+                grown[:self._matrix.shape[0]] = self._matrix
+                self._matrix = grown
+        self._matrix[slot] = row
+        self._df += row != 0
+        self._slot_of[key] = slot
+        self._key_of[slot] = key
+
+    def remove(self, key: Hashable):
+        slot = self._slot_of.pop(key, None)
+        if slot is None:
+            return
+        self._df -= self._matrix[slot] != 0
+        self._matrix[slot] = 0
+        del self._key_of[slot]
+        self._free_slots.append(slot)
+
+    def rekey(self, old_key: Hashable, new_key: Hashable):
+        slot = self._slot_of.pop(old_key, None)
+        if slot is None:
+            return
+        self._slot_of[new_key] = slot
+        self._key_of[slot] = new_key
+
+    # ── Matching ───────────────────────────────────────────────
+
+    def similarity_matrix(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Cosine similarities of a batch of texts in one vectorized pass:
+          - against every active candidate row  → (batch × slots)
+          - against each other                  → (batch × batch)
+        """
+        idf = self._idf()
+        batch = self._normalize_rows(self.vectorize(texts) * idf)
+        if not self._key_of:
+            return np.zeros((len(texts), 0), dtype=np.float32), batch @ batch.T
+
+        # cos(b, c) = (b·idf) · (c·idf) / |c·idf| — fold both idf factors into the small
+        # batch side and get candidate norms without materializing an idf-scaled copy
+        used = self._matrix[:max(self._key_of) + 1]
+        norms = np.sqrt(np.einsum("ij,ij,j->i", used, used, idf * idf))
+        norms[norms == 0] = 1.0
+        return (batch * idf) @ used.T / norms, batch @ batch.T
+
+    def match_batch(self, texts: List[str], threshold: float) -> List[List[Tuple[Hashable, float]]]:
+        """
+        For each text, candidates with cosine >= threshold (best first), plus earlier
+        texts of the same batch as ("batch", j) keys — the Deduplicator resolves those
+        to whichever candidate signal j ended up in.
+        """
+        if not texts:
+            return []
+        to_candidates, to_batch = self.similarity_matrix(texts)
+        results = []
+        for i in range(len(texts)):
+            matches = [
+                (self._key_of[slot], float(to_candidates[i, slot]))
+                for slot in np.flatnonzero(to_candidates[i] >= threshold)
+                if slot in self._key_of
+            ]
+            matches.extend(
+                (("batch", int(j)), float(to_batch[i, j]))
+                for j in np.flatnonzero(to_batch[i, :i] >= threshold)
+            )
+            matches.sort(key=lambda m: m[1], reverse=True)
+            results.append(matches)
+        return results
+
+    def matches(self, features: str, threshold: float) -> List[Tuple[Hashable, float]]:
+        return self.match_batch([features], threshold)[0]
+
+
+# Process-wide singleton used when DEDUP_STRATEGY == "vector"
+vector_index = VectorIndex()
@@ -0,0 +1,120 @@
+"""
+Signal Archive
+Date-partitioned, gzip-compressed JSON Lines files for signal data that left td_signals:
+
+    <ARCHIVE_DIR>/signals/YYYY/MM/DD.jsonl.gz      (partition = UTC day of the signal's created_at)
+
+Each line is one record keyed by signal id:
+  - {"id", "raw_data"}             tier 1 — payload moved out, the row stays in the DB
+  - {"id", <every other column>}   tier 2 — the whole row moved out
+
+Records are appended as new gzip members, so a partition grows across runs without
+being rewritten. Readers merge the records of an id in file order; an id archived
+twice (crash between the file write and the DB delete) just overwrites itself.
+Archived signals are read back as transient Signal objects (never added to a session).
+"""
+import glob
+import gzip
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.trend_detector.config import ARCHIVE_DIR
+from app.trend_detector.models import CandidateSignal, Signal
+
+
+DATETIME_FIELDS = ("published_at", "created_at")
+
+
+class SignalArchive:
+    """Append-only JSONL.gz partitions of archived signals"""
+
+    def __init__(self, root: str = ARCHIVE_DIR):
+        self.root = os.path.join(root, "signals")
+
+    @staticmethod
+    def partition_of(created_at: Optional[datetime]) -> str:
+        """Partition key (YYYY-MM-DD) of a signal — undated signals go to 1970-01-01"""
+        return (created_at or datetime(1970, 1, 1)).strftime("%Y-%m-%d")
+
+    def path(self, partition: str) -> str:
+        year, month, day = partition.split("-")
+        return os.path.join(self.root, year, month, f"{day}.jsonl.gz")
+
+    def partitions(self) -> List[str]:
+        """Every partition on disk, oldest first"""
+        pattern = os.path.join(self.root, "*", "*", "*.jsonl.gz")
+        found = []
+        for path in glob.glob(pattern):
+            month_dir, name = os.path.split(path)
+            year_dir, month = os.path.split(month_dir)
+            found.append(f"{os.path.basename(year_dir)}-{month}-{name[:-len('.jsonl.gz')]}")
+        return sorted(found)
+
+    def append(self, records: Dict[str, List[dict]]) -> int:
+        """
+        Append records grouped by partition; returns the number written.
+        Files are fsynced before returning so the caller can delete the DB rows.
+        """
+        written = 0
+        for partition, rows in records.items():
+            if not rows:
+                continue
+            path = self.path(partition)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "ab") as raw, gzip.GzipFile(fileobj=raw, mode="ab") as gz:
+                for row in rows:
+                    gz.write(json.dumps(row, ensure_ascii=False, default=str).encode("utf-8"))
+                    gz.write(b"\n")
+                gz.close()
+                raw.flush()
+                os.fsync(raw.fileno())
+            written += len(rows)
+        return written
+
+    def iter_partition(self, partition: str) -> Iterator[dict]:
+        """Raw records of one partition in file order (nothing if it does not exist)"""
+        path = self.path(partition)
+        if not os.path.exists(path):
+            return
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def read(self, ids: Iterable[int], partitions: Iterable[str]) -> Dict[int, dict]:
+        """Merged records for `ids`, looked up only in the given partitions"""
+        wanted = set(ids)
+        merged: Dict[int, dict] = {}
+        for partition in sorted(set(partitions)):
+            for record in self.iter_partition(partition):
+                if record.get("id") in wanted:
+                    merged.setdefault(record["id"], {}).update(record)
+        return merged
+
+    @staticmethod
+    def to_signal(record: dict) -> Signal:
+        """Transient Signal built from a merged archive record"""
+        fields = {k: v for k, v in record.items() if hasattr(Signal, k)}
+        for name in DATETIME_FIELDS:
+            if isinstance(fields.get(name), str):
+                fields[name] = datetime.fromisoformat(fields[name])
+        return Signal(**fields)
+
+    def candidate_signals(self, candidate_id: int, db: Session) -> List[Signal]:
+        """Archived source signals of a candidate (reads only the partitions they live in)"""
+        rows = (
+            db.query(CandidateSignal.signal_id, CandidateSignal.archived_on)
+            .filter(
+                CandidateSignal.candidate_id == candidate_id,
+                CandidateSignal.archived_on.isnot(None),
+            )
+            .all()
+        )
+        if not rows:
+            return []
+        records = self.read([signal_id for signal_id, _ in rows], [partition for _, partition in rows])
+        return [self.to_signal(records[signal_id]) for signal_id, _ in rows if signal_id in records]
@@ -0,0 +1,189 @@
+"""
+Retention Manager
+Keeps td_signals small enough that the API and TrendAgent queries stay fast:
+
+  Tier 1 (RETENTION_RAW_DATA_DAYS) — raw_data payloads leave the DB:
+      td_signals.raw_data       → archive ({"id", "raw_data"} records), column set to NULL
+      td_x_validation.raw_data  → dropped (verdicts and counts stay)
+  Tier 2 (RETENTION_SIGNAL_DAYS) — whole signal rows leave the DB once the candidate
+      they were merged into has also been quiet that long (or was never merged):
+      td_signals row → archive, td_candidate_signals.archived_on = partition, row deleted.
+      Candidates keep their totals / platform counts, so scores and listings are unchanged.
+
+Every batch is written and fsynced to the archive before its DB transaction commits.
+Expired td_stats hour buckets are pruned in the same pass.
+Freed pages are handed back with PRAGMA incremental_vacuum (the first run switches the
+database to auto_vacuum=INCREMENTAL, which needs one full VACUUM).
+
+The horizon must stay above how long a platform can resurface a post: an archived post
+that is collected again is ingested as a new signal.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+from sqlalchemy import delete, null, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.trend_detector.config import (
+    RETENTION_BATCH_SIZE,
+    RETENTION_RAW_DATA_DAYS,
+    RETENTION_SIGNAL_DAYS,
+    RETENTION_VACUUM_PAGES,
+)
+from app.trend_detector.models import Candidate, CandidateSignal, Signal, XValidation
+from app.trend_detector.retention.archive import SignalArchive
+from app.trend_detector.stats import TrendStats
+
+
+# SQLite auto_vacuum modes
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+def _json_value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+class RetentionManager:
+    """Moves aged signal data out of the DB into the signal archive"""
+
+    def __init__(
+        self,
+        archive: SignalArchive = None,
+        raw_data_days: int = RETENTION_RAW_DATA_DAYS,
+        signal_days: int = RETENTION_SIGNAL_DAYS,
+        batch_size: int = RETENTION_BATCH_SIZE,
+    ):
+        self.archive = archive or SignalArchive()
+        self.raw_data_days = raw_data_days
+        self.signal_days = signal_days
+        self.batch_size = batch_size
+
+    def _strip_raw_data(self, db: Session, cutoff: datetime) -> int:
+        """Tier 1 for td_signals — archive raw payloads, then NULL the column"""
+        stripped = 0
+        last_id = 0
+        while True:
+            rows = db.execute(
+                select(Signal.id, Signal.created_at, Signal.raw_data)
+                .where(Signal.id > last_id, Signal.created_at < cutoff, Signal.raw_data.isnot(None))
+                .order_by(Signal.id)
+                .limit(self.batch_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            records: Dict[str, List[dict]] = defaultdict(list)
+            for row in rows:
+                if row.raw_data:   # JSON null / empty payloads are just cleared
+                    records[self.archive.partition_of(row.created_at)].append({"id": row.id, "raw_data": row.raw_data})
+            self.archive.append(records)
+
+            db.execute(update(Signal).where(Signal.id.in_([row.id for row in rows])).values(raw_data=null()))
+            db.commit()
+            stripped += len(rows)
+        return stripped
+
+    def _drop_validation_raw_data(self, db: Session, cutoff: datetime) -> int:
+        """Tier 1 for td_x_validation — search payloads are only needed while the verdict is fresh"""
+        dropped = 0
+        while True:
+            ids = db.execute(
+                select(XValidation.id)
+                .where(XValidation.checked_at < cutoff, XValidation.raw_data.isnot(None))
+                .limit(self.batch_size)
+            ).scalars().all()
+            if not ids:
+                break
+            db.execute(update(XValidation).where(XValidation.id.in_(ids)).values(raw_data=null()))
+            db.commit()
+            dropped += len(ids)
+        return dropped
+
+    def _archive_signals(self, db: Session, cutoff: datetime) -> int:
+        """Tier 2 — archive whole rows of aged signals whose candidate went quiet, then delete them"""
+        archived = 0
+        last_id = 0
+        while True:
+            rows = db.execute(
+                select(*Signal.__table__.columns)   # plain rows — nothing enters the session's identity map
+                .outerjoin(CandidateSignal, CandidateSignal.signal_id == Signal.id)
+                .outerjoin(Candidate, Candidate.id == CandidateSignal.candidate_id)
+                .where(
+                    Signal.id > last_id,
+                    Signal.created_at < cutoff,
+                    or_(Candidate.id.is_(None), Candidate.updated_at.is_(None), Candidate.updated_at < cutoff),
+                )
+                .order_by(Signal.id)
+                .limit(self.batch_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            records: Dict[str, List[dict]] = defaultdict(list)
+            for signal in rows:
+                record = {name: _json_value(value) for name, value in signal._mapping.items()}
+                if record["raw_data"] is None:
+                    del record["raw_data"]   # payload already archived by tier 1 — keep it on merge
+                records[self.archive.partition_of(signal.created_at)].append(record)
+            self.archive.append(records)
+
+            for partition, partition_records in records.items():
+                db.execute(
+                    update(CandidateSignal)
+                    .where(CandidateSignal.signal_id.in_([r["id"] for r in partition_records]))
+                    .values(archived_on=partition)
+                )
+            db.execute(delete(Signal).where(Signal.id.in_([signal.id for signal in rows])))
+            db.commit()
+            archived += len(rows)
+        return archived
+
+    def _vacuum(self, db: Session) -> Dict[str, int]:
+        """Return free pages to the OS without rewriting the whole file"""
+        bind = db.get_bind()
+        if bind.dialect.name != "sqlite":
+            return {}
+        db.commit()   # VACUUM cannot run while this session holds a transaction
+        with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() != AUTO_VACUUM_INCREMENTAL:
+                print("[Retention] Switching database to auto_vacuum=INCREMENTAL (one-time VACUUM)")
+                conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.exec_driver_sql("VACUUM")
+            page_size = conn.exec_driver_sql("PRAGMA page_size").scalar()
+            free_before = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+            # The pragma frees one page per statement step; executescript (sqlite3_exec) runs it
+            # to completion where a regular execute stops after the first step
+            conn.connection.driver_connection.executescript(f"PRAGMA incremental_vacuum({int(RETENTION_VACUUM_PAGES)});")
+            free_after = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+        return {
+            "pages_freed": free_before - free_after,
+            "bytes_freed": (free_before - free_after) * page_size,
+            "free_pages_left": free_after,
+        }
+
+    def run(self, db: Session) -> Dict[str, Any]:
+        """
+        One retention pass (blocking — call through db_executor).
+        Returns counts per tier and what the vacuum released.
+        """
+        now = datetime.now(timezone.utc)
+        raw_cutoff = now - timedelta(days=self.raw_data_days)
+        signal_cutoff = now - timedelta(days=self.signal_days)
+
+        stats = {
+            "raw_data_stripped": self._strip_raw_data(db, raw_cutoff),
+            "validation_raw_data_dropped": self._drop_validation_raw_data(db, raw_cutoff),
+            "signals_archived": self._archive_signals(db, signal_cutoff),
+            "stats_hour_buckets_pruned": TrendStats.prune_hourly(db),
+        }
+        stats["vacuum"] = self._vacuum(db)
+        stats["timestamp"] = now.isoformat()
+        print(
+            f"[Retention] Stripped {stats['raw_data_stripped']} raw payloads, "
+            f"archived {stats['signals_archived']} signals, "
+            f"freed {stats['vacuum'].get('pages_freed', 0)} pages"
+        )
+        return stats
@@ -1,11 +1,12 @@
 """
 Trend Detector Scheduler
 Orchestrates the full pipeline: Collect → Normalize → Dedup → Score → Validate → Classify
-Uses APScheduler for periodic background tasks.
+Uses APScheduler for periodic background tasks (collectors, watchlist re-check, retention)
+and a one-shot language backfill on start.
 """
 import asyncio
 from datetime import datetime, timezone, timedelta
-from typing import List
+from typing import List, Optional, Tuple
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
@@ -17,6 +18,9 @@ from app.trend_detector.config import (
     COLLECTOR_INTERVALS,
     WATCHLIST_CHECK_INTERVAL,
     WATCHLIST_MAX_CHECKS,
+    WATCHLIST_RECHECK_TIME_BUDGET,
+    WATCHLIST_PRIORITY_HALF_LIFE_HOURS,
+    RETENTION_INTERVAL_HOURS,
 )
 
 from app.trend_detector.collectors.reddit import RedditCollector
@@ -26,9 +30,15 @@ from app.trend_detector.collectors.tiktok import TikTokCollector
 from app.trend_detector.media.vision_analyzer import VisionAnalyzer
 from app.trend_detector.pipeline.normalizer import Normalizer
 from app.trend_detector.pipeline.deduplicator import Deduplicator
+from app.trend_detector.pipeline.language import LanguageBackfill
 from app.trend_detector.pipeline.scoring import ScoringEngine
 from app.trend_detector.pipeline.validator import XValidator
 from app.trend_detector.classifier.classifier import Classifier
+from app.trend_detector.db_executor import db_executor
+from app.trend_detector.http_client import http_client
+from app.trend_detector.metrics import pipeline_metrics
+from app.trend_detector.retention.retention import RetentionManager
+from app.trend_detector.scheduler.streaming import StreamingPipeline
 
 
 class TrendDetectorScheduler:
@@ -45,6 +55,21 @@ class TrendDetectorScheduler:
         # Media analyzer
         self.vision_analyzer = VisionAnalyzer()
 
+        self.pipeline = StreamingPipeline(
+            self.vision_analyzer,
+            self.normalizer,
+            self.deduplicator,
+            self.scoring_engine,
+            self.validator,
+            self.classifier,
+        )
+
+        # Signal archive / raw_data retention
+        self.retention = RetentionManager()
+
+        # lang tags for rows stored before ingest-time tagging
+        self.lang_backfill = LanguageBackfill()
+
         # Collectors
         self.reddit_collector = RedditCollector()
         self.google_trends_collector = GoogleTrendsCollector()
@@ -95,60 +120,66 @@ class TrendDetectorScheduler:
         )
         print(f"[TrendScheduler] Watchlist re-check scheduled every {WATCHLIST_CHECK_INTERVAL}min")
 
+        # Retention job — archives aged signals, drops old raw payloads, vacuums
+        self.scheduler.add_job(
+            self._run_retention,
+            trigger=IntervalTrigger(hours=RETENTION_INTERVAL_HOURS),
+            id="retention",
+            name="Signal Retention & Archive",
+            replace_existing=True,
+        )
+        print(f"[TrendScheduler] Retention scheduled every {RETENTION_INTERVAL_HOURS}h")
+
+        # Language backfill — once, shortly after start (a no-op once every row is tagged)
+        self.scheduler.add_job(
+            self._run_lang_backfill,
+            trigger="date",
+            run_date=datetime.now(timezone.utc) + timedelta(seconds=5),
+            id="lang_backfill",
+            name="Language Backfill",
+            replace_existing=True,
+        )
+
         self.scheduler.start()
         self._is_running = True
         print("[TrendScheduler] Started successfully")
 
     def stop(self):
-        """Stop the scheduler"""
+        """Stop the scheduler and release the shared HTTP connection pool and DB threads"""
         if self._is_running:
             self.scheduler.shutdown(wait=False)
             self._is_running = False
             print("[TrendScheduler] Stopped")
 
+        try:
+            asyncio.get_running_loop().create_task(http_client.close())
+        except RuntimeError:
+            pass  # No running loop → the session died with its loop
+        db_executor.shutdown()
+
     async def _run_collector_pipeline(self, collector):
         """
         Full pipeline for a single collector:
         Collect → Normalize → Dedup → Score → Validate → Classify
+        Stages overlap on micro-batches (see StreamingPipeline).
         """
-        db: Session = SessionLocal()
         try:
             collector_name = collector.platform.upper()
             print(f"\n{'='*60}")
             print(f"[TrendScheduler] Running {collector_name} pipeline — {datetime.now(timezone.utc).isoformat()}")
             print(f"{'='*60}")
 
-            # 1. Collect raw signals
-            raw_signals = await collector.collect()
-            if not raw_signals:
-                print(f"[TrendScheduler] No new signals from {collector_name}")
-                return
-
-            # 1.5 Media analysis for signals with media
-            raw_signals = await self.vision_analyzer.process_signals(raw_signals)
-
-            # 2. Normalize and persist signals
-            new_signals = self.normalizer.process(raw_signals, db)
-            if not new_signals:
-                print(f"[TrendScheduler] All signals were duplicates")
-                return
+            summary = await self.pipeline.run(collector)
 
-            # 3. Dedup and merge into candidates
-            candidates = self.deduplicator.process(new_signals, db)
-            if not candidates:
+            if not summary["raw_signals"]:
+                print(f"[TrendScheduler] No new signals from {collector_name}")
+            elif not summary["candidates"]:
                 print(f"[TrendScheduler] No new candidates after dedup")
-                return
-
-            # 4. Score candidates
-            scored = self.scoring_engine.process(candidates, db)
-
-            # 5. Validate against X
-            hot_candidates = await self.validator.validate(scored, db)
-
-            # 6. Classify HOT candidates
-            if hot_candidates:
-                await self.classifier.classify(hot_candidates, db)
-                print(f"[TrendScheduler] Pipeline complete — {len(hot_candidates)} HOT trends detected")
+            elif summary["hot"]:
+                print(
+                    f"[TrendScheduler] Pipeline complete — {summary['hot']} HOT trends detected "
+                    f"(first after {summary['first_hot_after_s']}s)"
+                )
             else:
                 print(f"[TrendScheduler] Pipeline complete — no HOT trends this cycle")
 
@@ -156,78 +187,176 @@ class TrendDetectorScheduler:
             print(f"[TrendScheduler] Pipeline error: {e}")
             import traceback
             traceback.print_exc()
-        finally:
-            db.close()
 
-    async def _recheck_watchlist(self):
+    def _watchlist_priority(self, candidate: Candidate, now: datetime) -> float:
+        """score × recency — recency halves every WATCHLIST_PRIORITY_HALF_LIFE_HOURS since the candidate last changed"""
+        last_change = candidate.updated_at or candidate.created_at or now
+        if last_change.tzinfo is None:
+            last_change = last_change.replace(tzinfo=timezone.utc)
+        age_hours = max(0.0, (now - last_change).total_seconds() / 3600)
+        return (candidate.score or 0.0) * 0.5 ** (age_hours / WATCHLIST_PRIORITY_HALF_LIFE_HOURS)
+
+    def _load_due_watchlist(self, db: Session, now: datetime) -> Optional[List[Tuple[Watchlist, Candidate]]]:
         """
-        Re-check EARLY signals on the watchlist.
-        - If graduated to HOT → classify
-        - If max checks reached → expire
-        - Otherwise → update next_check_at with increasing interval
+        Blocking part of the re-check: load due entries with their candidates, expire the
+        used-up ones, re-score the rest in one pass. Returns (entry, candidate) pairs in
+        priority order, or None when nothing is due.
         """
-        db: Session = SessionLocal()
-        try:
-            now = datetime.now(timezone.utc)
-            due_entries = (
-                db.query(Watchlist)
-                .filter(
-                    Watchlist.is_active == True,
-                    Watchlist.next_check_at <= now,
-                )
-                .all()
+        due = (
+            db.query(Watchlist, Candidate)
+            .outerjoin(Candidate, Candidate.id == Watchlist.candidate_id)
+            .filter(
+                Watchlist.is_active == True,
+                Watchlist.next_check_at <= now,
             )
+            .all()
+        )
 
-            if not due_entries:
-                return
-
-            print(f"[TrendScheduler] Re-checking {len(due_entries)} watchlist entries")
+        if not due:
+            return None
 
-            for entry in due_entries:
-                candidate = (
-                    db.query(Candidate)
-                    .filter(Candidate.id == entry.candidate_id)
-                    .first()
-                )
+        print(f"[TrendScheduler] Re-checking {len(due)} watchlist entries")
 
-                if not candidate:
-                    entry.is_active = False
-                    continue
+        to_check = []
+        for entry, candidate in due:
+            if not candidate:
+                entry.is_active = False
+                continue
 
+            # Last check used up → expire without spending a search on it
+            if entry.check_count + 1 >= entry.max_checks:
                 entry.check_count += 1
                 entry.last_checked_at = now
+                entry.is_active = False
+                candidate.status = "expired"
+                print(f"[Watchlist] Candidate {candidate.id} expired after {entry.check_count} checks")
+                continue
 
-                # Max checks reached → expire
-                if entry.check_count >= entry.max_checks:
-                    entry.is_active = False
-                    candidate.status = "expired"
-                    print(f"[Watchlist] Candidate {candidate.id} expired after {entry.check_count} checks")
-                    continue
+            to_check.append((entry, candidate))
 
-                # Re-score the candidate
-                self.scoring_engine.process([candidate], db)
+        # Re-score every remaining candidate in one pass, then order by priority
+        self.scoring_engine.process([c for _, c in to_check], db, commit=False)
+        to_check.sort(key=lambda ec: self._watchlist_priority(ec[1], now), reverse=True)
+        return to_check
 
-                # Re-validate
-                hot = await self.validator.validate([candidate], db)
-
-                if hot:
-                    # Graduated to HOT
-                    entry.is_active = False
-                    await self.classifier.classify(hot, db)
-                    print(f"[Watchlist] Candidate {candidate.id} graduated to HOT!")
-                else:
-                    # Increasing interval: 15min * (check_count + 1)
-                    interval_minutes = WATCHLIST_CHECK_INTERVAL * (entry.check_count + 1)
-                    entry.next_check_at = now + timedelta(minutes=interval_minutes)
+    async def _recheck_watchlist(self):
+        """
+        Re-check EARLY signals on the watchlist.
+        - If graduated to HOT → classify
+        - If max checks reached → expire
+        - Otherwise → update next_check_at with increasing interval
 
-            db.commit()
+        Due entries and their candidates are loaded in one join and re-scored in one pass;
+        validation then runs in priority order (score × recency), one concurrent validator
+        batch at a time, until WATCHLIST_RECHECK_TIME_BUDGET runs out. Entries not reached
+        stay due for the next cycle. All writes are committed once at the end.
+        Queries and the commit run on the DB executor thread. Cycles with due entries are
+        recorded in pipeline_metrics / td_pipeline_runs under platform "watchlist".
+        """
+        db: Session = SessionLocal()
+        db.expire_on_commit = False   # graduated candidates are read on the loop after the commit
+        run = pipeline_metrics.start("watchlist")
+        summary = {"candidates": 0, "hot": 0, "classified": 0}
+        to_check = None
+        try:
+            now = datetime.now(timezone.utc)
+            with run.stage("watchlist") as stage:
+                to_check = await db_executor.run(self._load_due_watchlist, db, now)
+                stage.items_out += len(to_check or [])
+            if to_check is None:
+                return
+            summary["candidates"] = len(to_check)
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + WATCHLIST_RECHECK_TIME_BUDGET
+            batch_size = self.validator.MAX_VALIDATIONS_PER_BATCH
+            graduated = []
+            checked = 0
+
+            for i in range(0, len(to_check), batch_size):
+                if loop.time() >= deadline:
+                    break
+                batch = to_check[i:i + batch_size]
+                with run.stage("validate", len(batch)) as stage:
+                    hot, _ = await self.validator.validate([c for _, c in batch], db, commit=False)
+                    stage.items_out += len(hot)
+                hot_ids = {c.id for c in hot}
+
+                for entry, candidate in batch:
+                    entry.check_count += 1
+                    entry.last_checked_at = now
+                    if candidate.id in hot_ids:
+                        # Graduated to HOT
+                        entry.is_active = False
+                        graduated.append(candidate)
+                        print(f"[Watchlist] Candidate {candidate.id} graduated to HOT!")
+                    else:
+                        # Increasing interval: 15min * (check_count + 1)
+                        interval_minutes = WATCHLIST_CHECK_INTERVAL * (entry.check_count + 1)
+                        entry.next_check_at = now + timedelta(minutes=interval_minutes)
+                checked += len(batch)
+
+            if checked < len(to_check):
+                print(f"[Watchlist] Time budget reached — {len(to_check) - checked} entries deferred to next cycle")
+
+            with run.stage("watchlist"):
+                await db_executor.run(db.commit)
+            summary["hot"] = len(graduated)
+
+            if graduated:
+                with run.stage("classify", len(graduated)) as stage:
+                    classified = await self.classifier.classify(graduated, db)
+                    stage.items_out += len(classified)
+                summary["classified"] = len(classified)
 
         except Exception as e:
+            run.error = f"{type(e).__name__}: {e}"
             print(f"[TrendScheduler] Watchlist error: {e}")
             import traceback
             traceback.print_exc()
         finally:
             db.close()
+            if to_check is not None or run.error:
+                # Own session: a failed cycle's pending writes must not be committed with the record
+                metrics_db: Session = SessionLocal()
+                try:
+                    await db_executor.run(pipeline_metrics.save_run, pipeline_metrics.finish(run, summary), metrics_db)
+                except Exception as e:
+                    print(f"[TrendScheduler] Could not save watchlist run metrics: {e}")
+                finally:
+                    metrics_db.close()
+
+    async def run_retention_once(self) -> dict:
+        """One retention pass on the DB executor thread (scheduled job / admin API trigger)"""
+        db: Session = SessionLocal()
+        try:
+            return await db_executor.run(self.retention.run, db)
+        finally:
+            db.close()
+
+    async def _run_retention(self):
+        try:
+            await self.run_retention_once()
+        except Exception as e:
+            print(f"[TrendScheduler] Retention error: {e}")
+            import traceback
+            traceback.print_exc()
+
+    async def run_lang_backfill_once(self) -> dict:
+        """Tag untagged signals / candidates on the DB executor thread (startup job / admin API trigger)"""
+        db: Session = SessionLocal()
+        try:
+            return await db_executor.run(self.lang_backfill.run, db)
+        finally:
+            db.close()
+
+    async def _run_lang_backfill(self):
+        try:
+            await self.run_lang_backfill_once()
+        except Exception as e:
+            print(f"[TrendScheduler] Language backfill error: {e}")
+            import traceback
+            traceback.print_exc()
 
     async def run_pipeline_once(self, platform: str = "reddit"):
         """
@@ -248,28 +377,7 @@ class TrendDetectorScheduler:
         if not collector.is_configured():
             return {"error": f"Platform '{platform}' not configured — add API keys to .env"}
 
-        db: Session = SessionLocal()
-        try:
-            raw_signals = await collector.collect()
-            raw_signals = await self.vision_analyzer.process_signals(raw_signals)
-            new_signals = self.normalizer.process(raw_signals, db)
-            candidates = self.deduplicator.process(new_signals, db)
-            scored = self.scoring_engine.process(candidates, db) if candidates else []
-            hot = await self.validator.validate(scored, db) if scored else []
-            classified = await self.classifier.classify(hot, db) if hot else []
-
-            return {
-                "platform": platform,
-                "raw_signals": len(raw_signals),
-                "new_signals": len(new_signals),
-                "candidates": len(candidates),
-                "scored": len(scored),
-                "hot": len(hot),
-                "classified": len(classified),
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-            }
-        finally:
-            db.close()
+        return await self.pipeline.run(collector)
 
 
 # Singleton instance
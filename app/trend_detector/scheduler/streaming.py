@@ -0,0 +1,252 @@
+"""
+Streaming Pipeline
+One collector cycle as overlapping stages joined by bounded asyncio queues:
+
+    collect ─▶ vision ─▶ ingest (normalize → dedup → score) ─▶ validate ─▶ classify
+
+Each stage handles a micro-batch as soon as the previous one hands it over, so
+the first feed/region/query can be validated (and classified) while later ones
+are still downloading. Queues hold at most PIPELINE_QUEUE_SIZE micro-batches;
+a full queue makes the upstream stage wait (backpressure).
+
+Every DB stage has its own session; candidates travel between stages as ids.
+Blocking SQLAlchemy work runs on the DB executor thread (db_executor.py), so the
+event loop shared with FastAPI and /ws/chat only orchestrates. Stage sessions keep
+objects loaded after commit (expire_on_commit=False) so reading a candidate on
+the loop never triggers a lazy SELECT there.
+The X search budget (MAX_VALIDATIONS_PER_BATCH) is spent once per cycle, across
+micro-batches, in arrival order.
+
+Each stage's busy time, items, upstream calls, errors and cache lookups are
+recorded in pipeline_metrics (metrics.py) — ingest as normalize / dedup / score —
+and the run is persisted to td_pipeline_runs.
+"""
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal
+from app.trend_detector.config import PIPELINE_BATCH_SIZE, PIPELINE_QUEUE_SIZE
+from app.trend_detector.db_executor import db_executor
+from app.trend_detector.metrics import RunRecorder, pipeline_metrics
+from app.trend_detector.models import Candidate
+
+
+_DONE = object()   # end-of-stream marker passed down the queues
+
+# Statuses whose candidates are re-scored when re-collected signals change their totals
+REFRESHABLE_STATUSES = ("pending", "validated", "early", "not_yet")
+
+
+class StreamingPipeline:
+    """Runs one collector cycle through queue-connected pipeline stages"""
+
+    def __init__(
+        self,
+        vision_analyzer,
+        normalizer,
+        deduplicator,
+        scoring_engine,
+        validator,
+        classifier,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int = PIPELINE_BATCH_SIZE,
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+    ):
+        self.vision_analyzer = vision_analyzer
+        self.normalizer = normalizer
+        self.deduplicator = deduplicator
+        self.scoring_engine = scoring_engine
+        self.validator = validator
+        self.classifier = classifier
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+
+    async def run(self, collector) -> Dict[str, Any]:
+        """
+        Run one cycle of `collector` through every stage.
+        Returns the cycle summary (same keys as run_pipeline_once, plus per-stage metrics).
+        """
+        started = time.monotonic()
+        run = pipeline_metrics.start(collector.platform)
+        stats: Dict[str, Any] = {
+            "platform": collector.platform,
+            "raw_signals": 0,
+            "new_signals": 0,
+            "candidates": set(),
+            "scored": set(),
+            "hot": 0,
+            "classified": 0,
+            "first_hot_after_s": None,
+        }
+        raw_q: asyncio.Queue = asyncio.Queue(self.queue_size)
+        media_q: asyncio.Queue = asyncio.Queue(self.queue_size)
+        validate_q: asyncio.Queue = asyncio.Queue(self.queue_size)
+        classify_q: asyncio.Queue = asyncio.Queue(self.queue_size)
+
+        tasks = [
+            asyncio.create_task(self._collect_stage(collector, raw_q, stats, run)),
+            asyncio.create_task(self._vision_stage(raw_q, media_q, run)),
+            asyncio.create_task(self._ingest_stage(media_q, validate_q, stats, run)),
+            asyncio.create_task(self._validate_stage(validate_q, classify_q, stats, started, run)),
+            asyncio.create_task(self._classify_stage(classify_q, stats, run)),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except Exception as e:
+            run.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            # A failed stage stops the whole cycle instead of leaving the others blocked on queues
+            for task in tasks:
+                task.cancel()
+            stats["candidates"] = len(stats["candidates"])
+            stats["scored"] = len(stats["scored"])
+            await self._save_run(pipeline_metrics.finish(run, stats))
+
+        stats["timestamp"] = datetime.now(timezone.utc).isoformat()
+        stats["duration_s"] = round(time.monotonic() - started, 2)
+        stats["stages"] = run.stage_summary()
+        return stats
+
+    async def _save_run(self, record: Dict[str, Any]):
+        """Persist the run record — a failure here never fails the cycle"""
+        db = self.session_factory()
+        try:
+            await db_executor.run(pipeline_metrics.save_run, record, db)
+        except Exception as e:
+            print(f"[StreamingPipeline] Could not save run metrics: {e}")
+        finally:
+            db.close()
+
+    def _session(self) -> Session:
+        db = self.session_factory()
+        db.expire_on_commit = False
+        return db
+
+    async def _collect_stage(self, collector, out: asyncio.Queue, stats: Dict, run: RunRecorder):
+        stream = collector.collect_stream().__aiter__()
+        while True:
+            # Timed per batch so waiting on a full queue is not counted as collection
+            with run.stage("collect") as stage:
+                batch = await anext(stream, None)
+            if batch is None:
+                break
+            stage.items_out += len(batch)
+            stats["raw_signals"] += len(batch)
+            for i in range(0, len(batch), self.batch_size):
+                await out.put(batch[i:i + self.batch_size])
+        print(f"[{type(collector).__name__}] Collected {stats['raw_signals']} signals")
+        await out.put(_DONE)
+
+    async def _vision_stage(self, inp: asyncio.Queue, out: asyncio.Queue, run: RunRecorder):
+        db = self._session()
+        try:
+            while (batch := await inp.get()) is not _DONE:
+                with run.stage("vision", len(batch)) as stage:
+                    batch = await self.vision_analyzer.process_signals(batch, db)
+                    stage.items_out += len(batch)
+                await out.put(batch)
+        finally:
+            db.close()
+        await out.put(_DONE)
+
+    async def _ingest_stage(self, inp: asyncio.Queue, out: asyncio.Queue, stats: Dict, run: RunRecorder):
+        db = self._session()
+        try:
+            while (batch := await inp.get()) is not _DONE:
+                new_count, candidate_ids, scored_ids = await db_executor.run(self._ingest, batch, db, run)
+                stats["new_signals"] += new_count
+                if not scored_ids:
+                    continue
+                stats["candidates"].update(candidate_ids)
+                stats["scored"].update(scored_ids)
+                await out.put(scored_ids)
+        finally:
+            db.close()
+        await out.put(_DONE)
+
+    def _ingest(self, batch: List[Dict], db: Session, run: RunRecorder) -> Tuple[int, List[int], List[int]]:
+        """Blocking ingest of one micro-batch → (new signals, candidate ids, scored ids best first)"""
+        # Normalize and persist (known signals get fresh engagement counters)
+        with run.stage("normalize", len(batch)) as stage:
+            new_signals = self.normalizer.process(batch, db)
+            refreshed_ids = self.normalizer.last_refreshed_candidate_ids
+            stage.items_out += len(new_signals)
+        if not new_signals and not refreshed_ids:
+            return len(new_signals), [], []
+
+        # Dedup and merge into candidates, then score
+        with run.stage("dedup", len(new_signals)) as stage:
+            candidates = self.deduplicator.process(new_signals, db)
+            candidates = self._with_refreshed_candidates(candidates, refreshed_ids, db)
+            stage.items_out += len(candidates)
+        if not candidates:
+            return len(new_signals), [], []
+        with run.stage("score", len(candidates)) as stage:
+            scored = self.scoring_engine.process(candidates, db)
+            stage.items_out += len(scored)
+        return len(new_signals), [c.id for c in candidates], [c.id for c in scored]
+
+    async def _validate_stage(self, inp: asyncio.Queue, out: asyncio.Queue, stats: Dict, started: float, run: RunRecorder):
+        db = self._session()
+        budget = self.validator.MAX_VALIDATIONS_PER_BATCH
+        try:
+            while (ids := await inp.get()) is not _DONE:
+                with run.stage("validate", len(ids)) as stage:
+                    candidates = await db_executor.run(self._load, ids, db)
+                    # Candidates with unchanged metrics keep their last verdict
+                    hot, spent = await self.validator.validate(candidates, db, skip_unchanged=True, max_validations=budget)
+                    budget -= spent
+                    stage.items_out += len(hot)
+                if hot:
+                    stats["hot"] += len(hot)
+                    if stats["first_hot_after_s"] is None:
+                        stats["first_hot_after_s"] = round(time.monotonic() - started, 2)
+                    await out.put([c.id for c in hot])
+        finally:
+            db.close()
+        await out.put(_DONE)
+
+    async def _classify_stage(self, inp: asyncio.Queue, stats: Dict, run: RunRecorder):
+        db = self._session()
+        try:
+            while (ids := await inp.get()) is not _DONE:
+                with run.stage("classify", len(ids)) as stage:
+                    candidates = await db_executor.run(self._load, ids, db)
+                    classified = await self.classifier.classify(candidates, db)
+                    stage.items_out += len(classified)
+                stats["classified"] += len(classified)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _load(ids: List[int], db: Session) -> List[Candidate]:
+        """Candidates by id in this stage's session, best score first (current row values)"""
+        if not ids:
+            return []
+        candidates = db.query(Candidate).filter(Candidate.id.in_(ids)).populate_existing().all()
+        return sorted(candidates, key=lambda c: c.score or 0.0, reverse=True)
+
+    @staticmethod
+    def _with_refreshed_candidates(candidates: List[Candidate], refreshed_ids: List[int], db: Session) -> List[Candidate]:
+        """Append candidates whose totals were refreshed by re-collected signals so they get re-scored"""
+        if not refreshed_ids:
+            return candidates
+        seen: Set[int] = {c.id for c in candidates}
+        missing = [cid for cid in refreshed_ids if cid not in seen]
+        if not missing:
+            return candidates
+        refreshed = (
+            db.query(Candidate)
+            .filter(
+                Candidate.id.in_(missing),
+                Candidate.status.in_(REFRESHABLE_STATUSES),
+            )
+            .all()
+        )
+        return candidates + refreshed
@@ -0,0 +1,109 @@
+"""
+Trend Search
+SQLite FTS5 index over candidate title / content / keywords (td_candidates_fts,
+rowid = candidate id) behind GET /api/trends/search and TrendAgent's search and
+trend-detail lookups — no leading-wildcard ILIKE scans.
+
+  - Text is Arabic-normalized in Python before it reaches FTS5 (the built-in unicode61
+    tokenizer folds neither tashkeel / tatweel nor alef, yaa and taa-marbuta variants);
+    words with an attached definite article (ال، وال، بال، ...) are indexed both ways,
+    the bare form right after the original so word distances stay small
+  - queries go through the same normalization; every term is a prefix query, phrases
+    become NEAR groups
+  - bm25 ranking weights title over keywords over content
+  - kept in sync by ORM events on Candidate and seeded on startup (models.py)
+"""
+from typing import List, Optional
+
+from sqlalchemy import column, func, literal_column, select, table, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import Select
+
+from app.utils.text import strip_article, tokenize
+
+
+FTS_TABLE = "td_candidates_fts"
+BM25_WEIGHTS = (3.0, 1.0, 2.0)           # title, content, keywords
+
+MIN_TERM_LENGTH = 2                      # shorter prefixes match most of the index
+
+_fts = table(FTS_TABLE, column("rowid"))
+_fts_match = literal_column(FTS_TABLE)
+
+
+def index_text(text_value: Optional[str]) -> str:
+    """Normalized text stored in the index — each article-prefixed word followed by its bare form"""
+    tokens = []
+    for word in tokenize(text_value or ""):
+        tokens.append(word)
+        bare = strip_article(word)
+        if bare != word:
+            tokens.append(bare)
+    return " ".join(tokens)
+
+
+def index_row(candidate_id: int, title: str, content: str, keywords: str) -> dict:
+    return {"rowid": candidate_id, "title": index_text(title), "content": index_text(content), "keywords": index_text(keywords)}
+
+
+def _terms(query: str) -> List[str]:
+    terms = [strip_article(w) for w in tokenize(query)]
+    return [t for t in terms if len(t) >= MIN_TERM_LENGTH]
+
+
+def match_expression(query: str, phrase: bool = False, columns: Optional[List[str]] = None) -> Optional[str]:
+    """
+    FTS5 MATCH expression for user text (None when nothing searchable is left).
+    Every term must match as a prefix; phrase=True also requires them next to each other
+    (NEAR, allowing for the bare forms indexed between words). columns limits the match
+    to those index columns.
+    """
+    terms = _terms(query)
+    if not terms:
+        return None
+    expression = " ".join(f'"{t}"*' for t in terms)
+    if phrase and len(terms) > 1:
+        expression = f"NEAR({expression}, {len(terms)})"
+    if columns:
+        expression = "{" + " ".join(columns) + "} : (" + expression + ")"
+    return expression
+
+
+class TrendSearch:
+    """Queries against td_candidates_fts"""
+
+    @staticmethod
+    def ranked(expression: str) -> Select:
+        """(candidate_id, rank) of every match — lower rank = more relevant (bm25)"""
+        return (
+            select(
+                _fts.c.rowid.label("candidate_id"),
+                func.bm25(_fts_match, *BM25_WEIGHTS).label("rank"),
+            )
+            .select_from(_fts)
+            .where(_fts_match.op("MATCH")(expression))
+        )
+
+    @staticmethod
+    def matching_ids(expression: str) -> Select:
+        """Candidate ids matching the expression (for IN filters)"""
+        return select(_fts.c.rowid).select_from(_fts).where(_fts_match.op("MATCH")(expression))
+
+    @staticmethod
+    def rebuild(connection: Connection, batch_size: int = 2000) -> int:
+        """Re-index every candidate (startup seeding of an empty index / repair)"""
+        connection.exec_driver_sql(f"DELETE FROM {FTS_TABLE}")
+        insert = text(f"INSERT INTO {FTS_TABLE} (rowid, title, content, keywords) VALUES (:rowid, :title, :content, :keywords)")
+        indexed = 0
+        last_id = 0
+        while True:
+            rows = connection.exec_driver_sql(
+                "SELECT id, title, content, keywords FROM td_candidates WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, batch_size),
+            ).all()
+            if not rows:
+                break
+            connection.execute(insert, [index_row(*row) for row in rows])
+            last_id = rows[-1][0]
+            indexed += len(rows)
+        return indexed
@@ -0,0 +1,73 @@
+"""
+Trend Statistics
+Reads the counters SQLite triggers maintain in td_stats (see models.py) — one small
+query however large the data tables grow:
+  - signals per platform, candidates per status, classifications per category
+  - active watchlist entries, X validations
+  - signals per hour bucket → "signals in the last 24h" (hour granularity)
+
+Used by GET /api/trends/stats, /categories, the listing totals and TrendAgent.
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from app.trend_detector.config import STATS_HOURLY_KEEP_HOURS
+from app.trend_detector.models import TrendStat
+
+
+def _hour_key(moment: datetime) -> str:
+    """Same bucket key the triggers derive from created_at"""
+    return moment.strftime("%Y-%m-%d %H")
+
+
+class TrendStats:
+    """Snapshot of the maintained trend detector counters"""
+
+    @staticmethod
+    def snapshot(db: Session) -> Dict[str, Any]:
+        cutoff = _hour_key(datetime.now(timezone.utc) - timedelta(hours=24))
+        rows = (
+            db.query(TrendStat.metric, TrendStat.key, TrendStat.value)
+            .filter(or_(TrendStat.metric != "signals_hour", TrendStat.key >= cutoff))
+            .all()
+        )
+        counters: Dict[str, Dict[str, int]] = defaultdict(dict)
+        for metric, key, value in rows:
+            if value:
+                counters[metric][key] = value
+
+        return {
+            "total_signals": sum(counters["signals"].values()),
+            "total_candidates": sum(counters["candidates"].values()),
+            "total_classifications": sum(counters["classifications"].values()),
+            "total_validations": counters["validations"].get("", 0),
+            "watchlist_active": counters["watchlist_active"].get("", 0),
+            "signals_24h": sum(counters["signals_hour"].values()),
+            "by_platform": counters["signals"],
+            "by_status": counters["candidates"],
+            "by_category": counters["classifications"],
+        }
+
+    @staticmethod
+    def count(db: Session, metric: str, key: Optional[str] = None) -> int:
+        """One counter (e.g. signals of a platform, candidates in a status), or the metric's sum when key is None"""
+        query = db.query(func.coalesce(func.sum(TrendStat.value), 0)).filter(TrendStat.metric == metric)
+        if key is not None:
+            query = query.filter(TrendStat.key == key)
+        return query.scalar()
+
+    @staticmethod
+    def prune_hourly(db: Session) -> int:
+        """Drop signal hour buckets older than STATS_HOURLY_KEEP_HOURS (run by the retention job)"""
+        cutoff = _hour_key(datetime.now(timezone.utc) - timedelta(hours=STATS_HOURLY_KEEP_HOURS))
+        removed = (
+            db.query(TrendStat)
+            .filter(TrendStat.metric == "signals_hour", TrendStat.key < cutoff)
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        return removed
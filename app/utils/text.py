@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Arabic Text Normalization
+One place for the text folding used by dedup, trend search indexing, intent detection
+and the trend agent. Everything is a single str.translate pass over precompiled tables
+(no regex chains), and the hot entry points are LRU-cached — the same titles are
+normalized over and over by dedup, classification and search.
+
+  fold_arabic(text)        lowercase, drop tashkeel/tatweel, أ/إ/آ/ٱ → ا، ى/ئ → ي، ؤ → و، ة → ه
+                           (punctuation and spacing untouched; lowercase=False for regex sources)
+  normalize_arabic(text)   fold_arabic + punctuation removed + whitespace collapsed
+  tokenize(text)           words of normalize_arabic(text)
+  fingerprint_text(text)   dedup fingerprint normalization (no folding — see docstring)
+  detect_language(...)     script-based ar / fa / other tag (stored on signals and candidates)
+"""
+
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+
+CACHE_SIZE = 16384
+
+TASHKEEL = frozenset(
+    [*range(0x0610, 0x061B), *range(0x064B, 0x0660), 0x0670, *range(0x06D6, 0x06EE), 0x0640]  # harakat + tatweel
+)
+ARABIC_FOLD = {
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ى": "ي", "ئ": "ي", "ؤ": "و", "ة": "ه",
+}
+ARTICLES = ("وال", "بال", "كال", "فال", "لل", "ال")   # longest first
+FARSI_CHARS = frozenset("گچپژک")                      # letters Arabic doesn't use
+ARABIC_LETTERS = frozenset(chr(code) for code in [*range(0x0621, 0x064B), *range(0x0671, 0x06D4)])
+
+LANG_ARABIC = "ar"
+LANG_FARSI = "fa"
+LANG_OTHER = "other"
+
+
+class _TranslationTable(dict):
+    """
+    str.translate table: ASCII and the Arabic block are filled up front, any other code
+    point is classified on first sight and remembered (translate looks keys up through
+    __getitem__, so __missing__ fills the table).
+    """
+
+    def __init__(self, fold: bool, strip_punctuation: bool):
+        super().__init__()
+        self.fold = fold
+        self.strip_punctuation = strip_punctuation
+        for code in [*range(0x80), *range(0x0600, 0x0700)]:
+            self[code] = self._translate(code)
+
+    def _translate(self, code: int) -> Optional[str]:
+        char = chr(code)
+        if self.fold:
+            if code in TASHKEEL:
+                return None
+            if char in ARABIC_FOLD:
+                return ARABIC_FOLD[char]
+        # [^\w\s] in re terms
+        if self.strip_punctuation and not (char.isalnum() or char == "_" or char.isspace()):
+            return None
+        return char
+
+    def __missing__(self, code: int) -> Optional[str]:
+        self[code] = value = self._translate(code)
+        return value
+
+
+_FOLD = _TranslationTable(fold=True, strip_punctuation=False)
+_NORMALIZE = _TranslationTable(fold=True, strip_punctuation=True)
+_STRIP_PUNCTUATION = _TranslationTable(fold=False, strip_punctuation=True)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def fold_arabic(text: str, lowercase: bool = True) -> str:
+    """
+    Orthographic folding only — keeps punctuation and spacing. Pass lowercase=False for
+    regex sources (lowercasing would turn \\S into \\s).
+    """
+    if not text:
+        return ""
+    return (text.lower() if lowercase else text).translate(_FOLD)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_arabic(text: str) -> str:
+    """Lowercase, strip tashkeel/tatweel/punctuation and fold alef/yaa/taa-marbuta variants"""
+    if not text:
+        return ""
+    return " ".join(text.lower().translate(_NORMALIZE).split())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def tokenize(text: str) -> Tuple[str, ...]:
+    """Words of the normalized text (a tuple — the result is shared through the cache)"""
+    return tuple(normalize_arabic(text).split())
+
+
+def strip_article(word: str) -> str:
+    """Drop an attached definite article (ال، وال، بال، ...) when a real word remains"""
+    for article in ARTICLES:
+        if word.startswith(article) and len(word) - len(article) >= 2:
+            return word[len(article):]
+    return word
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def fingerprint_text(text: str) -> str:
+    """
+    Dedup fingerprint normalization: lowercase, trimmed, punctuation removed, whitespace
+    runs collapsed to one space. No folding, and a space left at either edge by removed
+    punctuation stays — td_candidates.fingerprint hashes of this exact output are
+    already stored, so new signals must keep producing them.
+    """
+    if not text:
+        return ""
+    text = text.lower().strip().translate(_STRIP_PUNCTUATION)
+    words = text.split()
+    if not words:
+        return " " if text else ""
+    return ("" if not text[0].isspace() else " ") + " ".join(words) + ("" if not text[-1].isspace() else " ")
+
+
+def collapse_whitespace(text: str) -> str:
+    """Whitespace runs → one space, trimmed"""
+    return " ".join(text.split()) if text else ""
+
+
+def contains_farsi(text: str) -> bool:
+    """True when the text uses Farsi-only letters (گ چ پ ژ ک)"""
+    return bool(text) and not FARSI_CHARS.isdisjoint(text)
+
+
+def detect_language(*texts: Optional[str], hint: Optional[str] = None) -> str:
+    """
+    Language tag from the script of the given texts: "fa" when any of them uses Farsi-only
+    letters (or the platform already tagged the post "fa"), "ar" when any has Arabic
+    letters, "other" for everything else (Latin, emoji-only, empty)
+    """
+    if hint == LANG_FARSI or any(contains_farsi(text) for text in texts):
+        return LANG_FARSI
+    if any(text and not ARABIC_LETTERS.isdisjoint(text) for text in texts):
+        return LANG_ARABIC
+    return LANG_OTHER
+
+
+def cache_info() -> Dict[str, object]:
+    """LRU statistics of the cached entry points"""
+    return {fn.__name__: fn.cache_info()._asdict() for fn in (fold_arabic, normalize_arabic, tokenize, fingerprint_text)}
@@ -0,0 +1,81 @@
+"""
+Regression test: SQL statements per page of the trend listing endpoints and
+TrendAgent's list helper must not grow with the page size (no per-row
+classification / candidate lookups). Same seed and listings as
+app/trend_detector/benchmarks/listing_queries.py.
+"""
+import asyncio
+import importlib
+import os
+
+import pytest
+from cryptography.fernet import Fernet
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+
+PAGE_SIZES = (10, 100)
+
+# Statements per page at every page size
+EXPECTED = {
+    "GET /search": 4,
+    "GET /candidates": 4,
+    "GET /hot": 3,
+    "GET /watchlist": 1,
+    "TrendAgent._get_top_arabic": 3,
+}
+
+
+@pytest.fixture(scope="module")
+def listing_queries():
+    """The benchmark module — importing the routes needs the two secrets app.auth.security reads at import"""
+    with pytest.MonkeyPatch.context() as mp:
+        if len(os.environ.get("JWT_SECRET_KEY", "")) < 32:
+            mp.setenv("JWT_SECRET_KEY", "test-" + "x" * 40)
+        if not os.environ.get("ENCRYPTION_KEY"):
+            mp.setenv("ENCRYPTION_KEY", Fernet.generate_key().decode())
+        yield importlib.import_module("app.trend_detector.benchmarks.listing_queries")
+
+
+@pytest.fixture(scope="module")
+def statement_counts(listing_queries):
+    """listing name → statements per page, one entry per PAGE_SIZES"""
+    from app.trend_detector.models import Base, Watchlist
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    listing_queries._seed(db)
+
+    statements = {"n": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(*args, **kwargs):
+        statements["n"] += 1
+
+    counts = {}
+    for limit in PAGE_SIZES:
+        # Watchlist size follows the page size: keep `limit` entries active
+        for i, entry in enumerate(db.query(Watchlist).order_by(Watchlist.id).all()):
+            entry.is_active = i < limit
+        db.commit()
+
+        for name, page in listing_queries._listings(db, limit).items():
+            db.expire_all()
+            statements["n"] = 0
+            asyncio.run(page())
+            counts.setdefault(name, []).append(statements["n"])
+
+    yield counts
+    db.close()
+    engine.dispose()
+
+
+@pytest.mark.parametrize("name", sorted(EXPECTED))
+def test_statements_per_page_do_not_grow(statement_counts, name):
+    assert statement_counts[name] == [EXPECTED[name]] * len(PAGE_SIZES)
+
+
+def test_every_listing_is_covered(statement_counts):
+    assert set(statement_counts) == set(EXPECTED)